@@ -1,38 +1,66 @@
 import requests
-from bs4 import BeautifulSoup
-import os
 import json
 import re
-import random
-import os
+import argparse
+import time
+from collections import deque
 from typing import Dict, List, Any, Optional
 
+from result_store import open_result_store, close_result_stores, save_person_json
+from checkpoint import Checkpoint, obituary_id, MATCHED, NO_MATCH, ERROR
+from obituary_columns import open_columns
+from obituary_index import open_index
+from http_cache import HttpCache, CachingSession, CacheMiss
+from http_client import get_client, close_clients, format_timings, DEFAULT_MAX_RATE
+from retry_policy import RetryPolicy, HostUnavailable
+from page_archive import get_archive, close_archives
+from query_planner import PendingRecord, PlannerStats, coalesce_queries
+from negative_cache import NegativeCache
+from person_parser import parse_person_page, set_default_backend, available_backends
+from name_matcher import NameMatcher, CONFIDENT_SCORE, CLUSTRMAPS_BASE_URL, select_match
+import instrumentation
+from instrumentation import SEARCH, MATCH, PAGE_FETCH, PARSE, PERSIST, timed
+
+# Candidate queries (relatives, then the deceased) tried per obituary
+DEFAULT_MAX_QUERIES = 3
+
+# Times a query is parked for an unhealthy host before it counts as an error
+MAX_PARKS = 3
+
 def load_processed_data(output_file: str) -> Dict[str, Any]:
     """
     Load previously processed data or create an empty dictionary.
     
+    State is rebuilt from the JSON snapshot plus any records appended to the
+    side-car ``.jsonl`` log since the last compaction, or read from SQLite
+    when ``output_file`` ends in ``.db``/``.sqlite``.
+    
     Args:
         output_file (str): Path to the output JSON file
     
     Returns:
         Dict[str, Any]: Existing processed data or an empty dictionary
     """
-    if os.path.exists(output_file):
-        with open(output_file, 'r') as f:
-            return json.load(f)
-    return {}
+    return open_result_store(output_file).load()
 
-def save_processed_data(output_file: str, processed_data: Dict[str, Any]) -> None:
+def save_processed_data(output_file: str, processed_data: Dict[str, Any], key: Optional[str] = None) -> None:
     """
-    Save processed data to a JSON file.
+    Save processed data to the result store.
+    
+    When ``key`` is given only that record is appended to the log; otherwise
+    the whole dictionary is written out as the merged JSON snapshot.
     
     Args:
         output_file (str): Path to the output JSON file
         processed_data (Dict[str, Any]): Data to be saved
+        key (str, optional): Deceased name of the record that changed
     """
-    #os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, 'w') as f:
-        json.dump(processed_data, f, indent=2)
+    store = open_result_store(output_file)
+    with timed(PERSIST):
+        if key is not None:
+            store.put(key, processed_data[key])
+        else:
+            store.write_all(processed_data)
 
 def process_clustrmaps_result(result: Dict[str, Any], deceased_name: str) -> Dict[str, Any]:
     """
@@ -72,18 +100,44 @@ def process_clustrmaps_result(result: Dict[str, Any], deceased_name: str) -> Dic
     return processed_data
 
 
-def search_clustrmaps(first_name, middle_name=None, last_name=None):
+def search_clustrmaps(first_name, middle_name=None, last_name=None, store=None, deceased_id=None, cache=None,
+                      negative_cache=None, broad_query=False, min_score=CONFIDENT_SCORE, archive=None,
+                      deceased=None, birth_year=0):
     """
     Search Clustrmaps with flexible name matching
     
+    By default one query is sent per name variation until a variation
+    returns any match. With ``broad_query`` the broadest query is sent once
+    and every variant is scored locally against its results; a single
+    follow-up query only goes out when the best score stays below
+    ``min_score``.
+    
     Args:
         first_name (str): First name
         middle_name (str, optional): Middle name
         last_name (str, optional): Last name
+        store (optional): Result store the scraped person page is saved to
+        deceased_id (str, optional): Obituary ID the search is made for
+        cache (HttpCache, optional): On-disk cache for search and person page responses
+        negative_cache (NegativeCache, optional): Queries known to return no match
+        broad_query (bool): Use the single broad query mode
+        min_score (int): Local score that makes a follow-up query unnecessary
+        archive (PageArchive, optional): Archive the raw search responses and
+            person page are kept in
+        deceased (list, optional): (obituary ID, name) of every obituary the
+            search is made for, recorded with the archived pages
+        birth_year (int, optional): Birth year of the searched person; results
+            whose age fits it win ties
     
     Returns:
-        dict or None: Scraped person data
+        Tuple[dict or None, float]: Scraped person data and the match score
+        of the chosen result, (None, 0) when nothing matched
     """
+    # Known misses are skipped without any network I/O until they expire
+    if negative_cache is not None and negative_cache.is_known_miss(first_name, last_name, middle_name):
+        print(f"Skipping known miss: {first_name} {last_name}")
+        return None, 0
+    
     # Construct full name variations for matching
     full_name_variations = []
     if middle_name:
@@ -104,7 +158,7 @@ def search_clustrmaps(first_name, middle_name=None, last_name=None):
         ])
     
     # URL for the API endpoint
-    url = 'https://clustrmaps.com/search/live'
+    url = f'{CLUSTRMAPS_BASE_URL}/search/live'
     
     # Headers based on the provided request headers
     headers = {
@@ -124,58 +178,135 @@ def search_clustrmaps(first_name, middle_name=None, last_name=None):
         'x-requested-with': 'XMLHttpRequest'
     }
     
-    # Create a session to maintain cookies
-    session = requests.Session()
+    # Shared pooled client: connections and cookies are kept across searches
+    session = get_client()
+    if cache is not None:
+        session = CachingSession(session, cache)
     
-    try:
-        # Try each name variation
-        for name_variant in full_name_variations:
+    # Broad mode: the widest query first, then at most one follow-up
+    queries = full_name_variations
+    if broad_query:
+        queries = broad_query_plan(first_name, middle_name, last_name or '')
+    matcher = NameMatcher(first_name, last_name or '', full_name_variations, birth_year)
+    
+    recorded = []
+    
+    def responses():
+        # Try each name variation, only as far as the matcher asks for
+        for name_variant in queries:
             # Payload with the query
             payload = {'q': name_variant}
             
-            # Send POST request
-            response = session.post(url, headers=headers, data=payload)
-            response.raise_for_status()
+            # Send POST request and parse the JSON response
+            with timed(SEARCH):
+                response = session.post(url, headers=headers, data=payload)
+                response.raise_for_status()
+                results = response.json()
+            recorded.append((name_variant, response))
             
-            # Parse JSON response
-            results = response.json()
+            yield name_variant, results
+    
+    try:
+        best_match, best_score, query_count, _ = select_match(matcher, responses(), broad_query, min_score)
+        
+        # Keep the raw responses with their queries and the chosen link, for rematch
+        if archive is not None and not all(getattr(response, 'from_cache', False) for _, response in recorded):
+            archive_search(archive, url, recorded, first_name, middle_name, last_name, full_name_variations,
+                           queries, broad_query, min_score, best_match, deceased or [(deceased_id, None)],
+                           birth_year)
+        
+        # If a match is found, scrape the person's page
+        if best_match:
+            print(f"Matched result: {best_match} after {query_count} queries")
             
-            # Use improved matching logic
-            best_match = improved_matching_logic(
-                results, 
-                first_name, 
-                last_name or '', 
-                full_name_variations
-            )
+            # Scrape the person's detailed page
+            person_data = scrape_person_page(session, best_match['link'], headers, store=store, deceased_id=deceased_id,
+                                             archive=archive, deceased=deceased)
             
-            # If a match is found, scrape the person's page
-            if best_match:
-                print(f"Matched result: {best_match}")
-                
-                # Scrape the person's detailed page
-                person_data = scrape_person_page(session, best_match['link'], headers)
-                
-                return person_data
+            return person_data, (best_score if person_data else 0)
         
         # If no matching results found
         print(f"No match found for names: {full_name_variations}")
-        return None
+        if negative_cache is not None:
+            negative_cache.record_miss(first_name, last_name, middle_name)
+        return None, 0
     
     except requests.RequestException as e:
+        # Re-raised so the caller can record the attempt as an error, not a miss
         print(f"Request Error occurred: {e}")
-        return None
+        raise
     except Exception as e:
         print(f"Unexpected Error occurred: {e}")
-        return None
-    finally:
-        session.close()
+        return None, 0
         
         
         
+def archive_search(archive, url, recorded, first_name, middle_name, last_name, name_variants, queries,
+                   broad_query, min_score, best_match, deceased, birth_year=0):
+    """
+    Store the raw responses of one search in the page archive.
+    
+    The body is a JSON document with every query sent and its raw response;
+    the index line carries what ``rematch`` needs to replay the decision:
+    the searched name, the planned queries, the mode and the chosen link.
+    
+    Args:
+        archive (PageArchive): Page archive
+        url (str): Search endpoint
+        recorded (list): (query, response) pairs in the order they were sent
+        first_name (str): First name searched for
+        middle_name (str, optional): Middle name
+        last_name (str, optional): Last name
+        name_variants (list): Name variants the results were matched against
+        queries (list): Every query the search could have sent
+        broad_query (bool): Whether the single broad query mode was used
+        min_score (int): Score that ends a broad search
+        best_match (dict, optional): Chosen result
+        deceased (list): (obituary ID, name) of every obituary the search was made for
+        birth_year (int): Birth year the results were matched with, 0 if none
+    """
+    body = json.dumps({'responses': [{'query': query, 'status': response.status_code, 'body': response.text}
+                                     for query, response in recorded]}, ensure_ascii=False)
+    archive.put(url, body, 200, kind='search', first_name=first_name, middle_name=middle_name,
+                last_name=last_name, variants=list(name_variants), queries=list(queries),
+                broad_query=broad_query, min_score=min_score, birth_year=birth_year,
+                link=best_match['link'] if best_match else None,
+                deceased=[list(pair) for pair in deceased])
+
+
+def broad_query_plan(first_name, middle_name, last_name):
+    """
+    Queries for the single broad query mode.
+    
+    The plain first and last name returns the widest set of people. The
+    follow-up narrows to the full middle name when there is one, and
+    otherwise widens to the last initial to catch misspelled last names.
+    Reversed order is never queried: its results overlap and reversed names
+    are scored locally anyway.
+    
+    Args:
+        first_name (str): First name
+        middle_name (str, optional): Middle name
+        last_name (str): Last name
+    
+    Returns:
+        list: Primary query followed by the follow-up query, if it differs
+    """
+    if middle_name:
+        follow_up = f"{first_name} {middle_name} {last_name}"
+    else:
+        follow_up = f"{first_name} {last_name[0]}" if last_name else first_name
+    primary = f"{first_name} {last_name}"
+    return [primary] if follow_up == primary else [primary, follow_up]
+
+
 def improved_matching_logic(results, first_name, last_name, name_variants):
     """
     Improved matching logic for ClusterMaps search results.
     
+    Scores every person result against the name variants with a
+    ``NameMatcher`` and returns the highest scoring one (earliest on ties).
+    
     Args:
         results (dict): Search results dictionary
         first_name (str): First name to match
@@ -185,177 +316,69 @@ def improved_matching_logic(results, first_name, last_name, name_variants):
     Returns:
         dict or None: Best matching result or None if no match found
     """
-    def name_similarity_score(result_name, target_name_parts):
-        """
-        Calculate similarity score between result name and target name.
-        
-        Args:
-            result_name (str): Name from search result
-            target_name_parts (list): List of name parts to match
-        
-        Returns:
-            float: Similarity score (higher is better)
-        """
-        if not result_name:
-            return 0
-        
-        # Convert to lowercase for case-insensitive matching
-        result_words = result_name.lower().split()
-        target_words = [part.lower() for part in target_name_parts]
-        
-        # Calculate word overlap
-        word_overlap = len(set(result_words) & set(target_words))
-        
-        # Bonus for full name match
-        full_name_match = int(all(word in result_words for word in target_words))
-        
-        # Penalty for extra words
-        extra_words_penalty = len(result_words) - len(target_words)
-        
-        return word_overlap + full_name_match * 2 - max(0, extra_words_penalty)
-
-    def is_valid_person_result(result):
-        """
-        Check if the result is a valid person result.
-        
-        Args:
-            result (dict): Individual search result
-        
-        Returns:
-            bool: True if valid, False otherwise
-        """
-        # Ensure it's a person type result with a link
-        return (
-            result.get('t') == 'p' and 
-            result.get('link', '').startswith('https://clustrmaps.com/person/')
-        )
-
-    # Combine name variants for broader matching
-    name_search_variants = [
-        [first_name, last_name],  # Standard order
-        [last_name, first_name],  # Reversed order
-        [name_variants[0]] if name_variants else []  # Additional name variant if available
-    ]
-
-    # Collect potential matches
-    potential_matches = []
-
-    # Iterate through search results
-    for result in results.get('result', []):
-        # Skip non-person results
-        if not is_valid_person_result(result):
-            continue
-
-        # Check each name variant for matching
-        for name_parts in name_search_variants:
-            similarity_score = name_similarity_score(result.get('name', ''), name_parts)
-            
-            # Only consider results with a meaningful similarity score
-            if similarity_score > 0:
-                potential_matches.append({
-                    'result': result,
-                    'score': similarity_score
-                })
-
-    # If no potential matches found, return None
-    if not potential_matches:
-        return None
-
-    # Sort matches by similarity score in descending order
-    potential_matches.sort(key=lambda x: x['score'], reverse=True)
-
-    # Return the top match's result
-    return potential_matches[0]['result']
+    with timed(MATCH):
+        return NameMatcher(first_name, last_name, name_variants).best(results)
 
 
 
-def scrape_person_page(session, link, headers):
+def scrape_person_page(session, link, headers, store=None, deceased_id=None, archive=None, deceased=None):
+    """
+    Fetch a ClustrMaps person page and extract the person's details.
+    
+    Freshly fetched pages are also kept in the page archive, so ``reparse``
+    can apply a fixed extractor to them later without refetching.
+    
+    Args:
+        session (requests.Session): Session used for the request
+        link (str): Person page URL
+        headers (dict): Request headers
+        store (optional): Result store to save the page to; defaults to a
+            JSON file in new_scraped_data/
+        deceased_id (str, optional): Obituary ID the page was matched for
+        archive (PageArchive, optional): Archive the raw page is kept in
+        deceased (list, optional): (obituary ID, name) of every obituary the
+            page was matched for
+    
+    Returns:
+        dict or None: Extracted person data
+    """
     try:
-        # Send GET request to person's page
-        person_response = session.get(link, headers=headers, timeout=10)
-        person_response.raise_for_status()
-        
-        # Parse person's page
-        person_soup = BeautifulSoup(person_response.text, 'html.parser')
-        #print(f"Person Soup is {person_soup}")
-        
-        # Initialize person data dictionary
-        person_data = {
-            'full_name': '',
-            'age': '',
-            'location': '',
-            'email': '',
-            'phone_number': '',
-            'associated_persons': []
-        }
-        
-        # Extract name and location
-        name_elem = person_soup.find('h1', class_='person-name')
-        addon_elem = person_soup.find('div', class_='person-addon')
-        
-        if name_elem:
-            person_data['full_name'] = name_elem.get_text(strip=True)
-        
-        if addon_elem:
-            addon_text = addon_elem.get_text(strip=True)
-            person_data['location'] = addon_text.split(',')[-1].strip()
-            
-            # Try to extract age
-            if 'age' in addon_text:
-                person_data['age'] = addon_text.split('age')[1].split(',')[0].strip()
-        
-        # Extract phone number
-        phone_elem = person_soup.find('span', itemprop='telephone')
-        if phone_elem:
-            person_data['phone_number'] = phone_elem.get_text(strip=True)
-        
-        # Extract email
-        email_elem = person_soup.find('span', itemprop='email')
-        if email_elem:
-            person_data['email'] = email_elem.get_text(strip=True)
-        
-        # Extract associated persons
-        associated_persons = person_soup.find_all('div', class_='card-body', itemprop='relatedTo')
-        for assoc_person in associated_persons:
-            assoc_data = {}
-            
-            # Name
-            name_elem = assoc_person.find('span', itemprop='name')
-            if name_elem:
-                assoc_data['name'] = name_elem.get_text(strip=True)
-            
-            # Age
-            age_elem = assoc_person.find('div', text=lambda t: t and 'Age' in t)
-            if age_elem:
-                assoc_data['age'] = age_elem.get_text(strip=True).replace('Age', '').strip()
-            
-            # Phone
-            phone_elem = assoc_person.find('span', itemprop='telephone')
-            if phone_elem:
-                assoc_data['phone'] = phone_elem.get_text(strip=True)
-            
-            person_data['associated_persons'].append(assoc_data)
+        # Pages already stored (matched earlier for another obituary) are not fetched again
+        stored = store.get_person(link) if store is not None else None
+        if stored is not None:
+            print(f"Already stored: {link}")
+            return stored
         
-        # Save to JSON file
-        output_dir = 'new_scraped_data'
-        os.makedirs(output_dir, exist_ok=True)
+        # Send GET request to person's page
+        with timed(PAGE_FETCH):
+            person_response = session.get(link, headers=headers, timeout=10)
+            person_response.raise_for_status()
         
-        # Use first and last name from the full name for filename
-        name_parts = person_data['full_name'].split()
-        first_name = name_parts[0]
-        last_name = name_parts[-1]
+        # Keep the raw page (written in the background); cached pages are already there
+        if archive is not None and not getattr(person_response, 'from_cache', False):
+            archive.put(link, person_response.text, person_response.status_code, kind='person',
+                        deceased=[list(pair) for pair in deceased or [(deceased_id, None)]])
         
-        output_file = os.path.join(output_dir, f'{first_name}_{last_name}_clustrmaps_data.json')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(person_data, f, indent=4)
+        # Parse person's page (backend chosen in person_parser)
+        with timed(PARSE):
+            person_data = parse_person_page(person_response.text)
         
-        print(f"Data saved to {output_file}")
+        # Save to the result store, or one JSON file per person
+        with timed(PERSIST):
+            if store is not None:
+                store.save_person(link, person_data, deceased_id=deceased_id)
+            else:
+                output_file = save_person_json(person_data)
+        if store is not None:
+            print(f"Data saved for {link}")
+        else:
+            print(f"Data saved to {output_file}")
         
         return person_data
     
     except requests.RequestException as e:
         print(f"Error scraping {link}: {e}")
-        return None
+        raise
     except Exception as e:
         print(f"Unexpected error: {e}")
         return None
@@ -378,62 +401,307 @@ def get_initial(name):
 
 
 
-def main():
-    # Input and output file paths
-    input_file = "ancestry_obituaries2.json"
-    output_file = "processed_obituaries.json"
+def process_batch(batch, store, checkpoint, cache=None, negative_cache=None, broad_query=False,
+                  min_score=CONFIDENT_SCORE, max_queries=DEFAULT_MAX_QUERIES, stats=None, archive=None):
+    """
+    Look up a batch of obituaries, running each unique query only once and
+    fanning its result out to every obituary that asked for it.
     
-    # Load existing processed data
-    processed_data = load_processed_data(output_file)
+    Each obituary tries its ranked candidate queries one round at a time and
+    stops at its first match scoring ``min_score``, so later rounds only
+    search for the records still unresolved. A weaker match is kept and
+    stored only if none of the remaining queries finds a better one.
+    Queries for a host whose circuit breaker is open are parked and retried
+    once it reopens, after the rest of the round.
     
-    # Load deceased persons data
-    with open(input_file, "r") as file:
-        deceased_list = json.load(file)
+    Args:
+        batch (list): PendingRecord entries to process
+        store: Result store for matches
+        checkpoint (Checkpoint): Per-record progress log
+        cache (HttpCache, optional): HTTP response cache
+        negative_cache (NegativeCache, optional): Persisted no-match queries
+        broad_query (bool): Use the single broad query mode of search_clustrmaps
+        min_score (int): Match score that settles an obituary (and ends a broad search)
+        max_queries (int): Candidate queries tried per obituary
+        stats (PlannerStats, optional): Lookup accounting
+        archive (PageArchive, optional): Archive for raw person pages
+    """
+    if stats is None:
+        stats = PlannerStats()
     
-    # Track progress to allow resuming
-    start_index = len(processed_data)
+    # Best match below min_score per obituary ID: (score, result)
+    weak_matches = {}
     
-    # Process each deceased person
-    for i, person in enumerate(deceased_list[start_index:], start=start_index):
-        name_parts = person["Name"].split()
-        relatives = person["Relatives"]
-        
-        # Determine first and last name for search
-        if relatives:
-            first_name = random.choice(relatives)
-            last_name = name_parts[-1]
-        else:
-            first_name = name_parts[0]
-            last_name = name_parts[-1]
+    def finish(records, result):
+        # Write only the new records; the store compacts periodically
+        with timed(PERSIST):
+            for record in records:
+                store.put(record.person["Name"], result, deceased_id=record.record_id)
+            # Durable before the checkpoint marks the records done
+            store.flush()
+        for record in records:
+            checkpoint.record(record.record_id, MATCHED, index=record.index, name=record.person["Name"])
+            stats.matched += 1
+    
+    pending = batch
+    round_number = 0
+    while pending:
+        plan, exhausted = coalesce_queries(pending, round_number, max_queries)
+        print(f"Round {round_number + 1}: {len(pending)} records need {len(plan)} unique queries")
         
-        print(f"Accessing {first_name} - {last_name}")
+        # Out of queries: the best weak match wins, if there was one
+        for record in exhausted:
+            weak = weak_matches.pop(record.record_id, None)
+            if weak is not None:
+                finish([record], weak[1])
+                continue
+            # Records without a name can never match; the rest found nobody
+            extra = {"error": "no name to search for"} if round_number == 0 else {"queries": round_number}
+            checkpoint.record(record.record_id, NO_MATCH, index=record.index, name=record.person.get("Name"), **extra)
+            stats.unmatched += 1
         
-        try:
-            # Perform ClusterMaps search
-            result = search_clustrmaps(first_name, last_name=last_name)
+        unresolved = []
+        queue = deque(plan)
+        # (monotonic time the host reopens, query) for work waiting on an unhealthy host
+        parked = []
+        parks = {}
+        while queue or parked:
+            if not queue:
+                # Only parked work is left: wait once for the earliest host to reopen
+                parked.sort(key=lambda item: item[0])
+                delay = parked[0][0] - time.monotonic()
+                if delay > 0:
+                    print(f"Parked {len(parked)} queries, resuming in {delay:.1f}s")
+                    time.sleep(delay)
+                queue.extend(query for _, query in parked)
+                parked = []
+            
+            query = queue.popleft()
+            first_name, last_name = query.first_name, query.last_name
+            print(f"Accessing {first_name} - {last_name}")
+            
+            # Known misses move on to their next query without counting as a lookup
+            if negative_cache is not None and negative_cache.is_known_miss(first_name, last_name):
+                print(f"Skipping known miss: {first_name} {last_name}")
+                unresolved.extend(query.records)
+                continue
+            
+            error = None
+            try:
+                # Perform ClusterMaps search
+                result, score = search_clustrmaps(first_name, last_name=last_name, store=store,
+                                           deceased_id=query.records[0].record_id, cache=cache,
+                                           negative_cache=negative_cache, broad_query=broad_query,
+                                           min_score=min_score, archive=archive,
+                                           deceased=[(record.record_id, record.person["Name"])
+                                                     for record in query.records],
+                                           birth_year=query.birth_year)
+            except HostUnavailable as e:
+                # Circuit open: park the query instead of spending its attempts
+                parks[id(query)] = parks.get(id(query), 0) + 1
+                if parks[id(query)] <= MAX_PARKS:
+                    print(f"Parking {first_name} {last_name}: {e}")
+                    parked.append((time.monotonic() + e.retry_in, query))
+                    continue
+                error = e
+            except CacheMiss as e:
+                # Cache-only run: leave the records pending for a run that may hit the network
+                print(f"Skipping {first_name} {last_name}: {e}")
+                continue
+            except Exception as e:
+                error = e
+            stats.lookups += 1
             
-            # Skip if no match found
+            if error is not None:
+                print(f"Error processing {first_name} {last_name}: {error}")
+                for record in query.records:
+                    weak_matches.pop(record.record_id, None)
+                    checkpoint.record(record.record_id, ERROR, index=record.index,
+                                      name=record.person["Name"], error=str(error))
+                continue
+            
+            # No match yet: these records move on to their next query
             if not result:
                 print(f"No match found for names: ['{first_name} {last_name}', '{first_name} {last_name[0]} {last_name}']")
+                unresolved.extend(query.records)
                 continue
             
-            # Process and save the result
-            #processed_result = process_clustrmaps_result(result, person["Name"])
-            processed_data[person["Name"]] = result
+            # Not confident: keep the best match so far and try the next query
+            if score < min_score:
+                print(f"Weak match (score {score}) for {first_name} {last_name}, trying the next query")
+                for record in query.records:
+                    if score > weak_matches.get(record.record_id, (0, None))[0]:
+                        weak_matches[record.record_id] = (score, result)
+                unresolved.extend(query.records)
+                continue
             
-            # Save progress after each successful match
-            save_processed_data(output_file, processed_data)
+            for record in query.records:
+                weak_matches.pop(record.record_id, None)
+            finish(query.records, result)
             
             # Print person data for logging
             print("Person Data:")
             for key, value in result.items():
                 print(f"{key}: {value}")
         
-        except Exception as e:
-            print(f"Error processing {first_name} {last_name}: {e}")
+        pending = unresolved
+        round_number += 1
+
+
+def parse_args(argv=None):
+    """
+    Parse command line options for a scraping run.
+    
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv
+    
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    parser = argparse.ArgumentParser(description="Match Ancestry obituaries against ClustrMaps")
+    parser.add_argument("--input", default="ancestry_obituaries2.json", help="Obituary input (JSON array or JSONL)")
+    parser.add_argument("--output", default="processed_obituaries.json",
+                        help="Merged JSON result file, or a .db/.sqlite path for the SQLite backend")
+    parser.add_argument("--checkpoint", default="processed_obituaries.checkpoint.jsonl", help="Per-record progress log")
+    parser.add_argument("--shard", default=None, help="Process only shard I of N, written as I/N (zero-based)")
+    parser.add_argument("--cache-dir", default=".http_cache", help="On-disk HTTP response cache")
+    parser.add_argument("--cache-ttl", type=float, default=7 * 24, help="Hours a cached response stays fresh")
+    parser.add_argument("--cache-max-mb", type=int, default=500, help="Cache size before LRU eviction")
+    parser.add_argument("--cache-only", action="store_true", help="Serve only from the cache, never hit the network")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the HTTP response cache")
+    parser.add_argument("--negative-cache", default="negative_queries.jsonl", help="Persisted no-match queries")
+    parser.add_argument("--negative-ttl", type=float, default=30, help="Days before a no-match query is retried")
+    parser.add_argument("--parser", default=None, choices=available_backends(),
+                        help="HTML parser backend for person pages (default: fastest available)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Records planned together so duplicate queries run once")
+    parser.add_argument("--broad-query", action="store_true",
+                        help="Send the broadest search once and match every name variant locally")
+    parser.add_argument("--min-score", type=int, default=CONFIDENT_SCORE,
+                        help="Match score that settles an obituary; weaker matches try the next candidate query "
+                             "(and make --broad-query send its follow-up search)")
+    parser.add_argument("--max-queries", type=int, default=DEFAULT_MAX_QUERIES,
+                        help="Ranked candidate queries tried per obituary before giving up")
+    parser.add_argument("--max-rate", type=float, default=DEFAULT_MAX_RATE,
+                        help="Requests per second allowed to each host (0 for no cap)")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="Retries per request for connection errors, 429 and 5xx responses")
+    parser.add_argument("--archive-dir", default="page_archive", help="Archive of raw person pages")
+    parser.add_argument("--no-archive", action="store_true", help="Do not keep raw person pages")
+    parser.add_argument("--report", default="run_report.json", help="JSON run report written at the end of the run")
+    parser.add_argument("--no-timing", action="store_true", help="Disable the per-stage timing hooks")
+    parser.add_argument("--raw-input", action="store_true",
+                        help="Decode the JSON input through its offset index instead of the columnar cache")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    set_default_backend(args.parser)
+    started = time.perf_counter()
+    
+    # Per-stage timings (search, match, page fetch, parse, persist) for the run report
+    instrumentation.enable(not args.no_timing)
+    
+    # Input and output file paths
+    input_file = args.input
+    output_file = args.output
+    checkpoint_file = args.checkpoint
+    
+    # One pooled client for every search and person page request, retrying with
+    # Retry-After aware backoff and a per-host circuit breaker
+    retry_policy = RetryPolicy(max_attempts=args.retries + 1)
+    client = get_client(max_rate=args.max_rate or None, retry_policy=retry_policy)
+    
+    # Result store (JSON log or SQLite, picked by the output file extension)
+    store = open_result_store(output_file)
+    
+    # Per-record progress keyed on a stable obituary ID
+    checkpoint = Checkpoint(checkpoint_file)
+    
+    # Reruns answer repeated searches and person pages from disk
+    cache = None
+    if not args.no_cache:
+        cache = HttpCache(args.cache_dir, ttl=args.cache_ttl * 3600,
+                          max_bytes=args.cache_max_mb * 1024 * 1024, cache_only=args.cache_only)
+    
+    # Raw person pages, for re-parsing offline
+    archive = None if args.no_archive else get_archive(args.archive_dir)
+    
+    # Queries that found nobody are not repeated until they expire
+    negative_cache = NegativeCache(args.negative_cache, ttl=args.negative_ttl * 24 * 3600)
+    
+    # Columnar cache (built once, memory-mapped afterwards) or the offset index over
+    # the raw JSON; both seek straight to any record without parsing the ones before it
+    index = open_index(input_file) if args.raw_input else open_columns(input_file)
+    shard_start, shard_stop = 0, len(index)
+    if args.shard:
+        shard, num_shards = (int(part) for part in args.shard.split("/"))
+        shard_start, shard_stop = index.shard_range(shard, num_shards)
+    
+    # Everything before the first pending record is finished
+    start_index = checkpoint.resume_index(start=shard_start)
+    print(f"Resuming at record {start_index} of [{shard_start}, {shard_stop})")
+    
+    # Results stored before this run; matches made during the run are not legacy
+    stored_ids, stored_names = store.stored_ids()
+    
+    # Collect pending records into batches so duplicate queries run once
+    stats = PlannerStats()
+    batch = []
+    for i, person in index.read_range(start_index, shard_stop):
+        record_id = obituary_id(person)
+        if checkpoint.is_done(record_id):
+            continue
+        
+        # Records matched before checkpoints existed only live in the result store,
+        # by obituary ID when it was recorded and by name for older results
+        if checkpoint.status(record_id) is None and (record_id in stored_ids or person["Name"] in stored_names):
+            checkpoint.record(record_id, MATCHED, index=i, name=person["Name"])
             continue
+        
+        # The columnar cache already holds the name tokens and birth year the planner needs
+        if args.raw_input:
+            batch.append(PendingRecord(i, record_id, person))
+        else:
+            batch.append(PendingRecord(i, record_id, person, index.name_tokens(i), index.birth_year(i)[0]))
+        if len(batch) >= args.batch_size:
+            process_batch(batch, store, checkpoint, cache, negative_cache, args.broad_query, args.min_score,
+                          args.max_queries, stats, archive)
+            batch = []
+    
+    if batch:
+        process_batch(batch, store, checkpoint, cache, negative_cache, args.broad_query, args.min_score,
+                      args.max_queries, stats, archive)
+    
+    # Fold the append log back into (or export to) the merged JSON file
+    close_result_stores()
+    checkpoint.close()
+    negative_cache.close()
+    index.close()
+    close_archives()
+    print(f"Processing complete. {checkpoint.summary()}")
+    if cache is not None:
+        print(f"HTTP cache: {cache.hits} hits, {cache.misses} misses")
+    print(f"Known misses skipped: {negative_cache.skipped}")
+    print(stats.report())
+    print(format_timings(client))
+    print(f"Retries: {retry_policy.retries}")
+    print(instrumentation.format_stages())
+    close_clients()
     
-    print("Processing complete.")
+    # Machine-readable summary of the run
+    instrumentation.write_report(
+        args.report,
+        elapsed=round(time.perf_counter() - started, 3),
+        records={'start': start_index, 'stop': shard_stop},
+        outcomes=checkpoint.summary(),
+        planner={'lookups': stats.lookups, 'matched': stats.matched, 'unmatched': stats.unmatched},
+        http=client.timing_summary(),
+        retries=retry_policy.retries,
+        cache={'hits': cache.hits, 'misses': cache.misses} if cache is not None else None,
+        known_misses_skipped=negative_cache.skipped,
+    )
+    print(f"Run report written to {args.report}")
 
 # Note: You'll need to implement the search_clustrmaps function separately
 # This should be your existing function that performs the ClusterMaps search
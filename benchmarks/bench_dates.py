@@ -0,0 +1,99 @@
+"""
+Birthdate benchmark: parsed date model against the original string splitting.
+
+Times birthdate comparisons on input-like date pairs with the original
+split-on-'/' implementation (kept below as the reference), with the parsed
+model on a warm cache and with a cold cache. The parsed model's correctness
+tables are in tests/test_parsed_date.py.
+
+    python benchmarks/bench_dates.py
+"""
+import random
+import sys
+
+from harness import Case, run_suite
+
+from parsed_date import parse_date
+from scrape_family_v2 import compare_birthdates
+
+def reference_compare_birthdates(date1, date2):
+    """
+    compare_birthdates as it was before the parsed date model, kept verbatim
+    as the speed reference.
+    """
+    if not date1 or not date2:
+        return False
+
+    def clean_date(date_str):
+        parts = [part.lstrip('0') for part in date_str.split('/')]
+        return parts
+
+    try:
+        if date1 == date2:
+            return True
+        clean1 = clean_date(date1)
+        clean2 = clean_date(date2)
+        if clean1[-1] == clean2[-1]:
+            return True
+        if len(clean1) > 1 and len(clean2) > 1:
+            if clean1[-1] == clean2[-1] and clean1[0] == clean2[0]:
+                return True
+        return False
+    except Exception:
+        return False
+
+
+def input_like_dates(count, seed=15):
+    """
+    Dates in the mix of formats found in the Ancestry input and search results.
+    """
+    rng = random.Random(seed)
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    dates = []
+    for _ in range(count):
+        year = rng.randint(1920, 1960)
+        kind = rng.random()
+        if kind < 0.4:
+            dates.append(f'abt {year}')
+        elif kind < 0.75:
+            dates.append(f'{rng.randint(1, 28)} {rng.choice(months)} {year}')
+        elif kind < 0.85:
+            dates.append(f'{rng.randint(1, 12)}/{rng.randint(1, 28)}/{year}')
+        elif kind < 0.93:
+            dates.append(str(year))
+        else:
+            dates.append('')
+    return dates
+
+
+DATES = input_like_dates(4000)
+PAIRS = list(zip(DATES, DATES[1:] + DATES[:1]))
+
+
+def reference_case():
+    def run():
+        for date1, date2 in PAIRS:
+            reference_compare_birthdates(date1, date2)
+        return len(PAIRS)
+    return Case('birthdates[reference]', run)
+
+
+def parsed_case():
+    def run():
+        for date1, date2 in PAIRS:
+            compare_birthdates(date1, date2)
+        return len(PAIRS)
+    return Case('birthdates[parsed]', run)
+
+
+def cold_case():
+    def run():
+        parse_date.cache_clear()
+        for date1, date2 in PAIRS:
+            compare_birthdates(date1, date2)
+        return len(PAIRS)
+    return Case('birthdates[parsed, cold cache]', run)
+
+
+if __name__ == '__main__':
+    sys.exit(run_suite(__doc__.strip().splitlines()[0], [reference_case(), parsed_case(), cold_case()]))
@@ -0,0 +1,105 @@
+"""
+Family tree matching benchmark: lazy match_person against the original loop.
+
+A synthetic FamilyTreeNow results page with many rows is matched by the
+original compare-every-row loop (kept below as the reference) and by
+scrape_family_v2.match_person, which normalizes a row only when it is reached
+and compares names only when the other criteria leave the decision open.
+The chosen links must be identical.
+
+    python benchmarks/bench_family_matching.py
+"""
+import contextlib
+import io
+import random
+import sys
+
+from harness import Case, run_suite
+
+import scrape_family_v2
+
+FIRST = ['John', 'Jon', 'Mary', 'Marie', 'Robert', 'Linda', 'Carlos', 'Anita', 'Edith', 'Susan', 'Karl', 'Carl']
+LAST = ['Pollace', 'Roberts', 'Robertson', 'Dovalina', 'Iglesias', 'Williams', 'Gariepy', 'Smith', 'Smyth']
+MIDDLE = ['', 'A ', 'J ', 'Lee ']
+BIRTHDATES = ['', '1946', '3/1946', '10/25/1949', '1950', '1/1/1931']
+
+
+def reference_match_person(deceased_info, persons):
+    """
+    find_matching_person's comparison loop as it was before lazy evaluation, kept
+    as the correctness reference.
+    """
+    deceased_name = ' '.join(deceased_info.get('name_parts', []))
+    deceased_birthdate = deceased_info.get('birthdate', '')
+    deceased_relatives = deceased_info.get('relatives', [])
+    for person in persons:
+        name_match = scrape_family_v2.compare_names(deceased_name, person['name'])
+        birthdate_match = scrape_family_v2.compare_birthdates(deceased_birthdate, person['birthdate'])
+        relatives_match = scrape_family_v2.compare_relatives(deceased_relatives, person['relatives'])
+        if sum([name_match, birthdate_match, relatives_match]) >= 2:
+            return person['detail_link']
+    return None
+
+
+def synthetic_name(rng):
+    return f"{rng.choice(FIRST)} {rng.choice(MIDDLE)}{rng.choice(LAST)}"
+
+
+def synthetic_jobs(count, rows, seed=12):
+    """
+    Build (deceased_info, persons) jobs resembling extract_person_details output.
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        deceased_info = {
+            'name_parts': synthetic_name(rng).split(),
+            'birthdate': rng.choice(BIRTHDATES),
+            'relatives': [synthetic_name(rng) for _ in range(rng.randint(0, 4))],
+        }
+        persons = [{
+            'name': synthetic_name(rng),
+            'birthdate': rng.choice(BIRTHDATES),
+            'relatives': [synthetic_name(rng) for _ in range(rng.randint(0, 6))],
+            'detail_link': f'/api/details?id={i}',
+        } for i in range(rows)]
+        jobs.append((deceased_info, persons))
+    return jobs
+
+
+JOBS = synthetic_jobs(50, 400)
+
+
+def check_links():
+    for deceased_info, persons in JOBS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            chosen = scrape_family_v2.match_person(deceased_info, persons)
+        if chosen != reference_match_person(deceased_info, persons):
+            raise SystemExit('match_person picked a different person than the reference')
+
+
+def reference_case():
+    def run():
+        for job in JOBS:
+            reference_match_person(*job)
+        return len(JOBS)
+    return Case('family_matching[reference]', run)
+
+
+def lazy_case():
+    def run():
+        for job in JOBS:
+            scrape_family_v2.match_person(*job)
+        return len(JOBS)
+    return Case('family_matching[lazy]', run)
+
+
+def report_speedup(results):
+    reference = results['family_matching[reference]']['records_per_sec']
+    lazy = results['family_matching[lazy]']['records_per_sec']
+    print(f"family_matching[lazy] speedup over reference: {lazy / reference:.2f}x")
+
+
+if __name__ == '__main__':
+    check_links()
+    sys.exit(run_suite(__doc__.strip().splitlines()[0], [reference_case(), lazy_case()], report=report_speedup))
@@ -0,0 +1,98 @@
+"""
+Instrumentation benchmark: cost of the per-stage timing hooks.
+
+Checks the histogram percentiles against exact ones on random latencies,
+then times a small stand-in for a pipeline stage bare, wrapped in a disabled
+``timed`` block and wrapped in an enabled one. The hooked cases are judged
+by their cost relative to the bare one in the same run, not against stored
+absolute figures, so the check holds on any machine.
+
+    python benchmarks/bench_instrumentation.py
+"""
+import math
+import random
+import sys
+
+from harness import Case, run_suite
+
+import instrumentation
+from instrumentation import BUCKETS_PER_DOUBLING, Histogram, timed
+
+CALLS = 10000
+
+# Relative error allowed by the bucket width
+PERCENTILE_TOLERANCE = 2 ** (1 / BUCKETS_PER_DOUBLING) - 1
+
+# Longest a hooked call may take, in bare calls (a dict update) of the same run
+MAX_SLOWDOWN = {
+    'stage[hooks disabled]': 8.0,
+    'stage[hooks enabled]': 40.0,
+}
+
+
+def check_percentiles():
+    rng = random.Random(7)
+    for distribution in (lambda: rng.lognormvariate(-6, 1.5), lambda: rng.uniform(0.001, 0.2),
+                         lambda: rng.expovariate(50)):
+        samples = [distribution() for _ in range(20000)]
+        histogram = Histogram()
+        for sample in samples:
+            histogram.record(sample)
+        samples.sort()
+        for fraction in (0.5, 0.95, 0.99):
+            exact = samples[max(1, math.ceil(fraction * len(samples))) - 1]
+            estimate = histogram.percentile(fraction)
+            if abs(estimate - exact) > exact * PERCENTILE_TOLERANCE:
+                raise SystemExit(f"p{int(fraction * 100)} {estimate} is not within the bucket width of {exact}")
+        if histogram.count != len(samples) or not math.isclose(histogram.total, sum(samples)):
+            raise SystemExit("Histogram count or total is off")
+
+
+def stage(i):
+    # Cheapest realistic stage body: a dict update
+    return {'i': i}
+
+
+def bare_case():
+    def run():
+        for i in range(CALLS):
+            stage(i)
+        return CALLS
+    return Case('stage[no hooks]', run, baseline=False)
+
+
+def hooked_case(enabled):
+    def run():
+        instrumentation.enable(enabled)
+        try:
+            for i in range(CALLS):
+                with timed('bench'):
+                    stage(i)
+        finally:
+            instrumentation.enable(False)
+            instrumentation.reset()
+        return CALLS
+    return Case(f"stage[hooks {'enabled' if enabled else 'disabled'}]", run, baseline=False)
+
+
+def report(results):
+    bare = results['stage[no hooks]']['records_per_sec']
+    for name in ('stage[hooks disabled]', 'stage[hooks enabled]'):
+        per_call = 1e9 / results[name]['records_per_sec'] - 1e9 / bare
+        print(f"{name}: {per_call:.0f} ns added per call")
+
+
+def check_overhead(results):
+    bare = results['stage[no hooks]']['records_per_sec']
+    failures = []
+    for name, max_slowdown in MAX_SLOWDOWN.items():
+        slowdown = bare / results[name]['records_per_sec']
+        if slowdown > max_slowdown:
+            failures.append(f"{name}: {slowdown:.1f}x the bare stage, at most {max_slowdown:.0f}x allowed")
+    return failures
+
+
+if __name__ == '__main__':
+    check_percentiles()
+    sys.exit(run_suite(__doc__.strip().splitlines()[0], [bare_case(), hooked_case(False), hooked_case(True)],
+                       report=report, check=check_overhead))
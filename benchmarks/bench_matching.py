@@ -0,0 +1,132 @@
+"""
+Matching benchmark: NameMatcher against the original improved_matching_logic.
+
+Synthetic /search/live responses are scored by the original list-and-sort
+implementation (kept below as the reference) and by NameMatcher, both per
+call and through the batch API. The winners must be identical.
+
+    python benchmarks/bench_matching.py
+"""
+import random
+import sys
+
+from harness import Case, run_suite
+
+from name_matcher import NameMatcher, best_matches
+
+FIRST = ['John', 'Mary', 'James', 'Patricia', 'Robert', 'Linda', 'Carlos', 'Anita', 'Edith', 'Susan']
+LAST = ['Pollace', 'Roberts', 'Dovalina', 'Iglesias', 'Williams', 'Gariepy', 'Smith', 'Pianoforte']
+MIDDLE = ['A', 'J', 'M', 'R', 'Lee', 'Ann']
+
+
+def reference_matching_logic(results, first_name, last_name, name_variants):
+    """
+    improved_matching_logic as it was before NameMatcher, kept verbatim as
+    the correctness reference.
+    """
+    def name_similarity_score(result_name, target_name_parts):
+        if not result_name:
+            return 0
+        result_words = result_name.lower().split()
+        target_words = [part.lower() for part in target_name_parts]
+        word_overlap = len(set(result_words) & set(target_words))
+        full_name_match = int(all(word in result_words for word in target_words))
+        extra_words_penalty = len(result_words) - len(target_words)
+        return word_overlap + full_name_match * 2 - max(0, extra_words_penalty)
+
+    def is_valid_person_result(result):
+        return (
+            result.get('t') == 'p' and
+            result.get('link', '').startswith('https://clustrmaps.com/person/')
+        )
+
+    name_search_variants = [
+        [first_name, last_name],
+        [last_name, first_name],
+        [name_variants[0]] if name_variants else []
+    ]
+    potential_matches = []
+    for result in results.get('result', []):
+        if not is_valid_person_result(result):
+            continue
+        for name_parts in name_search_variants:
+            similarity_score = name_similarity_score(result.get('name', ''), name_parts)
+            if similarity_score > 0:
+                potential_matches.append({'result': result, 'score': similarity_score})
+    if not potential_matches:
+        return None
+    potential_matches.sort(key=lambda x: x['score'], reverse=True)
+    return potential_matches[0]['result']
+
+
+def synthetic_jobs(count, results_per_set, seed=11):
+    """
+    Build (results, first, last, variants) jobs resembling /search/live output.
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(count):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        variants = [f"{first} {last}", f"{first} {last[0]}", f"{last} {first}"]
+        results = []
+        for i in range(results_per_set):
+            parts = [rng.choice(FIRST + [first] * 3)]
+            if rng.random() < 0.5:
+                parts.append(rng.choice(MIDDLE))
+            parts.append(rng.choice(LAST + [last] * 3))
+            if rng.random() < 0.1:
+                parts.append('Jr')
+            kind = 'p' if rng.random() < 0.9 else 'a'
+            slug = '-'.join(parts)
+            results.append({
+                't': kind,
+                'name': ' '.join(parts),
+                'link': f"https://clustrmaps.com/person/{slug}-{i}" if kind == 'p' else f"https://clustrmaps.com/address/{i}",
+            })
+        jobs.append(({'result': results}, first, last, variants))
+    return jobs
+
+
+JOBS = synthetic_jobs(200, 40)
+
+
+def check_winners():
+    expected = [reference_matching_logic(*job) for job in JOBS]
+    if [NameMatcher(*job[1:]).best(job[0]) for job in JOBS] != expected:
+        raise SystemExit('NameMatcher picked a different winner than the reference')
+    if best_matches(JOBS) != expected:
+        raise SystemExit('best_matches picked a different winner than the reference')
+
+
+def reference_case():
+    def run():
+        for job in JOBS:
+            reference_matching_logic(*job)
+        return len(JOBS)
+    return Case('matching[reference]', run)
+
+
+def matcher_case():
+    def run():
+        for results, first, last, variants in JOBS:
+            NameMatcher(first, last, variants).best(results)
+        return len(JOBS)
+    return Case('matching[NameMatcher]', run)
+
+
+def batch_case():
+    def run():
+        return len(best_matches(JOBS))
+    return Case('matching[best_matches]', run)
+
+
+def report_speedup(results):
+    reference = results['matching[reference]']['records_per_sec']
+    for name in ('matching[NameMatcher]', 'matching[best_matches]'):
+        print(f"{name} speedup over reference: {results[name]['records_per_sec'] / reference:.2f}x")
+
+
+if __name__ == '__main__':
+    check_winners()
+    sys.exit(run_suite(__doc__.strip().splitlines()[0], [reference_case(), matcher_case(), batch_case()],
+                       report=report_speedup))
@@ -0,0 +1,71 @@
+"""
+Parser benchmarks over the recorded fixture pages in benchmarks/fixtures.
+
+Times ClustrMaps person page extraction (every available backend),
+scrape_family_v2.extract_person_details on a FamilyTreeNow results page and
+AncestryObituaryScraper row parsing, then checks them against baseline.json.
+
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --update-baseline
+"""
+import importlib.util
+import os
+import sys
+
+from harness import REPO_DIR, Case, read_fixture, run_suite
+
+import person_parser
+import scrape_family_v2
+
+
+def _load_ancestry_scraper():
+    # test.py would be shadowed by the standard library's `test` package
+    spec = importlib.util.spec_from_file_location('ancestry_scraper', os.path.join(REPO_DIR, 'test.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.AncestryObituaryScraper('https://www.ancestry.com/search/collections/7545/?', {})
+
+
+PERSON_PAGES = [read_fixture(f'clustrmaps_person_{i}.html') for i in (1, 2, 3)]
+FAMILYTREENOW_PAGE = read_fixture('familytreenow_results.html')
+ANCESTRY_PAGE = read_fixture('ancestry_results.html')
+
+
+def person_case(backend):
+    def run():
+        for html in PERSON_PAGES:
+            person_parser.parse_person_page(html, backend)
+        return len(PERSON_PAGES)
+    return Case(f'clustrmaps_person[{backend}]', run)
+
+
+def familytreenow_case():
+    def run():
+        return len(scrape_family_v2.extract_person_details(FAMILYTREENOW_PAGE))
+    return Case('familytreenow_extract_person_details', run)
+
+
+def ancestry_case():
+    scraper = _load_ancestry_scraper()
+
+    def run():
+        return len(scraper.parse_results_page(ANCESTRY_PAGE))
+    return Case('ancestry_scrape_page_rows', run)
+
+
+def check_fixtures():
+    """
+    Make sure every backend still agrees with the full html.parser tree.
+    """
+    for html in PERSON_PAGES:
+        reference = person_parser.parse_person_page(html, 'html.parser')
+        for backend in person_parser.available_backends():
+            if person_parser.parse_person_page(html, backend) != reference:
+                raise SystemExit(f"{backend} output differs from html.parser")
+
+
+if __name__ == '__main__':
+    check_fixtures()
+    cases = [person_case(backend) for backend in person_parser.available_backends()]
+    cases += [familytreenow_case(), ancestry_case()]
+    sys.exit(run_suite(__doc__.strip().splitlines()[0], cases))
@@ -0,0 +1,208 @@
+"""
+End-to-end benchmark of api_scraper.main against the local replay server.
+
+Starts benchmarks/replay_server.py in the background, downloads a synthetic
+obituary input from it and runs the real pipeline (planner, search, match,
+person page fetch and parse, result store) with every ClustrMaps request
+going to the stand-in. Reports throughput, p50/p99 request latency, the
+per-stage timings from the scraper's run report and peak memory.
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --records 500 --latency 0.02 --jitter 0.03 --error-rate 0.05
+    python benchmarks/bench_pipeline.py --archive page_archive --json
+"""
+import argparse
+import contextlib
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Any, List
+
+from replay_server import ReplayServer
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Args:
+        values (List[float]): Samples, sorted ascending
+        fraction (float): 0.5 for the median, 0.99 for p99
+
+    Returns:
+        float: Nearest-rank percentile, 0 when there are no samples
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values) + 0.5)) - 1))]
+
+
+def stage_of(url: str) -> str:
+    if '/search/live' in url:
+        return 'search'
+    if '/person/' in url:
+        return 'person_page'
+    return 'other'
+
+
+def stage_latencies(timings) -> Dict[str, Dict[str, Any]]:
+    """
+    Args:
+        timings (iterable): RequestTiming records from the shared HttpClient
+
+    Returns:
+        Dict[str, Dict[str, Any]]: count, errors, p50 and p99 milliseconds per stage
+    """
+    samples: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    for timing in timings:
+        stage = stage_of(timing.url)
+        samples.setdefault(stage, []).append(timing.elapsed)
+        errors[stage] = errors.get(stage, 0) + (timing.error is not None or (timing.status or 0) >= 400)
+    report = {}
+    for stage, values in samples.items():
+        values.sort()
+        report[stage] = {
+            'count': len(values),
+            'errors': errors[stage],
+            'p50_ms': round(percentile(values, 0.5) * 1000, 2),
+            'p99_ms': round(percentile(values, 0.99) * 1000, 2),
+        }
+    return report
+
+
+def run_pipeline(server: ReplayServer, workdir: str, records: int, retries: int, trace_memory: bool) -> Dict[str, Any]:
+    """
+    Run api_scraper.main once against the stand-in.
+
+    Args:
+        server (ReplayServer): Running stand-in
+        workdir (str): Directory for the input, outputs and archive
+        records (int): Obituaries to process
+        retries (int): --retries passed to the scraper
+        trace_memory (bool): Measure the Python heap peak with tracemalloc (slower)
+
+    Returns:
+        Dict[str, Any]: Throughput, per-stage latency, memory and outcome counts
+    """
+    # The base URL is read at import time, so the scraper is imported only now
+    os.environ['CLUSTRMAPS_BASE_URL'] = server.base_url
+    import requests
+    import api_scraper
+    from checkpoint import Checkpoint
+    from http_client import get_client
+    from retry_policy import RetryPolicy
+
+    input_file = os.path.join(workdir, 'obituaries.json')
+    response = requests.get(f'{server.base_url}/obituaries.json', timeout=30)
+    response.raise_for_status()
+    with open(input_file, 'w', encoding='utf-8') as f:
+        f.write(response.text)
+
+    # Created here with the settings main() asks for, so its timings outlive close_clients()
+    client = get_client(max_rate=None, retry_policy=RetryPolicy(max_attempts=retries + 1))
+    checkpoint_file = os.path.join(workdir, 'checkpoint.jsonl')
+    report_file = os.path.join(workdir, 'run_report.json')
+    argv = ['--input', input_file,
+            '--output', os.path.join(workdir, 'processed.json'),
+            '--checkpoint', checkpoint_file,
+            '--negative-cache', os.path.join(workdir, 'negative.jsonl'),
+            '--archive-dir', os.path.join(workdir, 'archive'),
+            '--report', report_file,
+            '--no-cache', '--max-rate', '0', '--retries', str(retries)]
+
+    if trace_memory:
+        tracemalloc.start()
+    # Per-person JSON files land in new_scraped_data/ under the working directory
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    start = time.perf_counter()
+    try:
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            api_scraper.main(argv)
+    finally:
+        elapsed = time.perf_counter() - start
+        os.chdir(cwd)
+    peak_kb = None
+    if trace_memory:
+        peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+
+    checkpoint = Checkpoint(checkpoint_file)
+    outcomes = checkpoint.summary()
+    checkpoint.close()
+    with open(report_file, 'r', encoding='utf-8') as f:
+        run_report = json.load(f)
+    processed = sum(outcomes.values())
+    return {
+        'records': processed,
+        'seconds': round(elapsed, 3),
+        'records_per_sec': round(processed / elapsed, 1) if elapsed else 0.0,
+        'requests': len(client.timings),
+        'requests_per_sec': round(len(client.timings) / elapsed, 1) if elapsed else 0.0,
+        'requests_by_stage': stage_latencies(client.timings),
+        'stages': run_report['stages'],
+        'outcomes': outcomes,
+        'server_requests': dict(server.counts),
+        'peak_heap_kb': peak_kb,
+        'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def check_outcomes(result: Dict[str, Any], records: int, error_rate: float) -> None:
+    """
+    The pipeline must settle every record, and without injected errors none
+    may end up as an error.
+    """
+    if result['records'] != records:
+        raise SystemExit(f"{result['records']} of {records} records settled")
+    if not error_rate and result['outcomes'].get('error'):
+        raise SystemExit(f"{result['outcomes']['error']} records failed")
+    if not result['outcomes'].get('matched'):
+        raise SystemExit("No record matched")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end api_scraper benchmark against a local stand-in")
+    parser.add_argument('--records', type=int, default=200, help='Synthetic obituaries to process')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random seconds per response')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail with a 503')
+    parser.add_argument('--match-rate', type=float, default=0.7, help='Fraction of synthetic searches with a match')
+    parser.add_argument('--archive', default=None, help='Replay responses recorded in this page archive')
+    parser.add_argument('--retries', type=int, default=3, help='--retries passed to the scraper')
+    parser.add_argument('--trace-memory', action='store_true', help='Also report the tracemalloc heap peak')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    server = ReplayServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          match_rate=args.match_rate, archive_dir=args.archive, obituaries=args.records)
+    with server, tempfile.TemporaryDirectory() as workdir:
+        result = run_pipeline(server, workdir, args.records, args.retries, args.trace_memory)
+    check_outcomes(result, args.records, args.error_rate)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print(f"{result['records']} records in {result['seconds']}s: {result['records_per_sec']} records/sec, "
+          f"{result['requests_per_sec']} requests/sec")
+    for stage, entry in sorted(result['requests_by_stage'].items()):
+        print(f"  {stage:<12} {entry['count']:>6} requests  {entry['errors']:>4} errors  "
+              f"p50 {entry['p50_ms']:>8} ms  p99 {entry['p99_ms']:>8} ms")
+    for stage, entry in result['stages'].items():
+        if entry['count']:
+            print(f"  {'[' + stage + ']':<12} {entry['count']:>6} calls     total {entry['total']:>8.3f} s  "
+                  f"p50 {entry['p50'] * 1000:>8.2f} ms  p99 {entry['p99'] * 1000:>8.2f} ms")
+    print(f"  outcomes     {result['outcomes']}")
+    memory = f"max RSS {result['max_rss_kb']} KiB"
+    if result['peak_heap_kb'] is not None:
+        memory += f", heap peak {result['peak_heap_kb']} KiB"
+    print(f"  memory       {memory}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
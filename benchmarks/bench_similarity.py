@@ -0,0 +1,47 @@
+"""
+Name similarity micro-benchmark of the similarity backends.
+
+compare_names-style decisions on generated misspelled name pairs are timed
+per backend against difflib. The backends' calibration against difflib is
+checked by tests/test_similarity.py.
+
+    python benchmarks/bench_similarity.py
+"""
+import sys
+
+from harness import Case, run_suite
+from name_corpus import name_pairs
+
+import similarity
+
+THRESHOLD = 0.8
+
+PAIRS = name_pairs(2000)
+
+
+def decision_case(backend):
+    def run():
+        for name1, name2 in PAIRS:
+            similarity.is_similar(name1, name2, THRESHOLD, backend)
+        return len(PAIRS)
+    return Case(f'name_similarity[{backend}]', run)
+
+
+def reference_case():
+    def run():
+        for name1, name2 in PAIRS:
+            similarity.difflib_ratio(name1, name2) > THRESHOLD
+        return len(PAIRS)
+    return Case('name_similarity[reference]', run)
+
+
+def report_speedup(results):
+    reference = results['name_similarity[reference]']['records_per_sec']
+    for backend in similarity.available_backends():
+        name = f'name_similarity[{backend}]'
+        print(f"{name} speedup over reference: {results[name]['records_per_sec'] / reference:.2f}x")
+
+
+if __name__ == '__main__':
+    cases = [reference_case()] + [decision_case(backend) for backend in similarity.available_backends()]
+    sys.exit(run_suite(__doc__.strip().splitlines()[0], cases, report=report_speedup))
@@ -0,0 +1,190 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Any, List, NamedTuple, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Make the scraper modules importable when run as `python benchmarks/<bench>.py`
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+class Case(NamedTuple):
+    """
+    One benchmark: ``run`` is called repeatedly and returns how many
+    records it processed. Cases with ``baseline`` off are only compared
+    with other cases of the same run, never stored in the baseline.
+    """
+    name: str
+    run: Callable[[], int]
+    baseline: bool = True
+
+
+def read_fixture(name: str) -> str:
+    """
+    Args:
+        name (str): File name inside benchmarks/fixtures
+
+    Returns:
+        str: Fixture contents
+    """
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def measure(case: Case, min_time: float = 0.5, rounds: int = 5) -> Dict[str, Any]:
+    """
+    Time a case and record its peak traced memory.
+
+    The case is timed over several rounds and the fastest round is kept,
+    which filters out noise from other processes. The scrapers print
+    progress while parsing, so stdout is swallowed while the case runs.
+
+    Args:
+        case (Case): Benchmark to run
+        min_time (float): Total seconds to spend timing the case
+        rounds (int): Number of timed rounds
+
+    Returns:
+        Dict[str, Any]: records, seconds, records_per_sec and peak_kb
+    """
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        # Warm up caches and lazy imports before measuring anything
+        case.run()
+
+        # Collector paused so the peak does not depend on when a cycle runs
+        gc.collect()
+        gc.disable()
+        tracemalloc.start()
+        try:
+            case.run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            gc.enable()
+
+        best_rate = 0.0
+        total_records = 0
+        total_elapsed = 0.0
+        for _ in range(rounds):
+            records = 0
+            start = time.perf_counter()
+            elapsed = 0.0
+            while elapsed < min_time / rounds:
+                records += case.run()
+                sink.seek(0)
+                sink.truncate()
+                elapsed = time.perf_counter() - start
+            best_rate = max(best_rate, records / elapsed)
+            total_records += records
+            total_elapsed += elapsed
+
+    return {
+        'records': total_records,
+        'seconds': round(total_elapsed, 4),
+        'records_per_sec': round(best_rate, 1),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    List the cases that got slower or hungrier than the baseline allows.
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): Fresh measurements by case name
+        baseline (Dict[str, Any]): Stored measurements by case name
+        tolerance (float): Allowed relative slowdown / memory growth
+
+    Returns:
+        List[str]: Human readable regression messages
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if result['records_per_sec'] < reference['records_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: {result['records_per_sec']} records/sec, "
+                               f"baseline {reference['records_per_sec']}")
+        if result['peak_kb'] > reference['peak_kb'] * (1 + tolerance):
+            regressions.append(f"{name}: peak {result['peak_kb']} KiB, baseline {reference['peak_kb']}")
+    return regressions
+
+
+def run_suite(description: str, cases: List[Case], argv=None,
+              report: Optional[Callable[[Dict[str, Dict[str, Any]]], None]] = None,
+              check: Optional[Callable[[Dict[str, Dict[str, Any]]], List[str]]] = None) -> int:
+    """
+    Command line entry point shared by the benchmark scripts.
+
+    Args:
+        description (str): Shown in --help
+        cases (List[Case]): Benchmarks to run
+        argv (list, optional): Arguments, defaults to sys.argv
+        report (callable, optional): Prints extra figures derived from the results
+        check (callable, optional): Compares cases of this run with each other
+            and returns a message per failed comparison
+
+    Returns:
+        int: Exit code, 1 when a case regressed against the baseline or a check failed
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds to spend on each case')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='Allowed relative regression')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for case in cases:
+        results[case.name] = measure(case, args.min_time)
+        if not args.json:
+            result = results[case.name]
+            print(f"{case.name:<40} {result['records_per_sec']:>12} records/sec  "
+                  f"peak {result['peak_kb']:>9} KiB")
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif report is not None:
+        report(results)
+
+    failures = check(results) if check is not None else []
+    for message in failures:
+        print(f"FAILED {message}")
+
+    # Only cases meant for the baseline are stored in or compared with it
+    baselined = {case.name: results[case.name] for case in cases if case.baseline}
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        if failures:
+            return 1
+        baseline.update(baselined)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline updated in {args.baseline}")
+        return 0
+
+    regressions = compare(baselined, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions or failures else 0
@@ -0,0 +1,36 @@
+"""
+Generated misspelled name pairs, shared by benchmarks/bench_similarity.py and
+tests/test_similarity.py.
+"""
+import random
+
+FIRST = ['john', 'jon', 'joan', 'mary', 'marie', 'robert', 'roberto', 'linda', 'lynda', 'carl', 'karl',
+         'anita', 'annette', 'edith', 'susan', 'suzanne', 'patricia', 'patrick']
+LAST = ['smith', 'smyth', 'roberts', 'robertson', 'pollace', 'polace', 'dovalina', 'jones', 'johns',
+        'iglesias', 'williams', 'williamson', 'gariepy', 'trevino']
+
+
+def misspell(rng, name):
+    position = rng.randrange(len(name))
+    letter = rng.choice('aeiourstln')
+    edit = rng.random()
+    if edit < 0.3:
+        return name[:position] + name[position + 1:]
+    if edit < 0.6:
+        return name[:position] + letter + name[position:]
+    if edit < 0.9:
+        return name[:position] + letter + name[position + 1:]
+    return name
+
+
+def name_pairs(count, seed=13):
+    """
+    Build normalized name pairs, half of them a misspelling of each other.
+    """
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(count):
+        name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+        other = misspell(rng, name) if rng.random() < 0.5 else f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+        pairs.append((name, other))
+    return pairs
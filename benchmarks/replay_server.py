@@ -0,0 +1,272 @@
+"""
+Local HTTP stand-in for ClustrMaps and the Ancestry obituary search.
+
+Serves ``/search/live``, ``/person/...``, ``/search/collections/<id>/``
+(Ancestry result pages) and ``/obituaries.json`` (a synthetic obituary
+input), with configurable latency and error injection. Responses come from
+a page archive written by api_scraper when one is given (replay), and are
+synthesized deterministically from the query otherwise.
+
+Point the scraper at it with the CLUSTRMAPS_BASE_URL environment variable:
+
+    python benchmarks/replay_server.py --port 8765 --latency 0.05 --error-rate 0.02
+    CLUSTRMAPS_BASE_URL=http://127.0.0.1:8765 python api_scraper.py --max-rate 0
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from harness import read_fixture
+
+from page_archive import iter_index, read_pages
+
+ORIGINAL_BASE_URL = 'https://clustrmaps.com'
+
+PERSON_PAGES = [read_fixture(f'clustrmaps_person_{i}.html') for i in (1, 2, 3)]
+ANCESTRY_PAGE = read_fixture('ancestry_results.html')
+
+FIRST_NAMES = ['James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'William',
+               'Elizabeth', 'David', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez',
+              'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore']
+
+
+def _fraction(text: str) -> float:
+    # Stable pseudo-random number in [0, 1) for a string
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big') / 2 ** 64
+
+
+def synthetic_obituaries(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Args:
+        count (int): Records to generate
+        seed (int): Random seed
+
+    Returns:
+        List[Dict[str, Any]]: Obituary records in the scraper's input format
+    """
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        last = rng.choice(LAST_NAMES)
+        birth_year = rng.randint(1920, 1960)
+        records.append({
+            'Name': f"{rng.choice(FIRST_NAMES)} {rng.choice('ABCDEFGH')} {last}",
+            'Birth Date': f"{rng.randint(1, 28)} Mar {birth_year}",
+            'Death Date': f"{rng.randint(1, 28)} Oct {rng.randint(2015, 2023)}",
+            'Publication Place': 'Utica, New York, USA',
+            'Relatives': [f"{rng.choice(FIRST_NAMES)} {rng.choice([last, rng.choice(LAST_NAMES)])}"
+                          for _ in range(rng.randint(0, 4))],
+        })
+    return records
+
+
+class ReplayServer:
+    """
+    Threaded stand-in server, started in the background.
+
+    Every request waits ``latency`` plus up to ``jitter`` seconds, and a
+    fraction ``error_rate`` of them fails with ``error_status`` and a
+    ``Retry-After: 0`` header, which the retry policy retries at once.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, match_rate: float = 0.7,
+                 archive_dir: Optional[str] = None, obituaries: int = 200, seed: int = 0):
+        """
+        Args:
+            host (str): Interface to listen on
+            port (int): Port, 0 for any free one
+            latency (float): Seconds added to every response
+            jitter (float): Extra random seconds, up to this much
+            error_rate (float): Fraction of requests answered with ``error_status``
+            error_status (int): Status of injected errors
+            match_rate (float): Fraction of synthetic searches that find the person
+            archive_dir (str, optional): Page archive to replay recorded responses from
+            obituaries (int): Records served at /obituaries.json
+            seed (int): Seed for the injected latency and errors
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.match_rate = match_rate
+        self.obituaries = obituaries
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.searches: Dict[str, str] = {}
+        self.pages: Dict[str, str] = {}
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f'http://{host}:{self.server.server_port}'
+        if archive_dir:
+            self.load_archive(archive_dir)
+        self._thread: Optional[threading.Thread] = None
+
+    def load_archive(self, archive_dir: str) -> None:
+        """
+        Index the recorded search responses by query and person pages by path.
+
+        Args:
+            archive_dir (str): Archive written by api_scraper
+        """
+        records = [record for record in iter_index(archive_dir)
+                   if record.status == 200 and record.meta.get('kind') in ('search', 'person')]
+        for record, body in zip(records, read_pages(archive_dir, records)):
+            body = self._rebase(body.decode('utf-8', errors='replace'))
+            if record.meta['kind'] == 'person':
+                self.pages[urlsplit(record.url).path] = body
+                continue
+            for entry in json.loads(body)['responses']:
+                if entry['status'] == 200:
+                    self.searches[entry['query']] = entry['body']
+
+    def _rebase(self, text: str) -> str:
+        # Recorded links must lead back to this server
+        return (text.replace(ORIGINAL_BASE_URL, self.base_url)
+                .replace(ORIGINAL_BASE_URL.replace('/', '\\/'), self.base_url.replace('/', '\\/')))
+
+    def search(self, query: str) -> str:
+        """
+        Args:
+            query (str): Search text
+
+        Returns:
+            str: JSON body of the /search/live response
+        """
+        recorded = self.searches.get(query)
+        if recorded is not None:
+            return recorded
+        slug = '-'.join(query.split()) or 'unknown'
+        # Decoys share no name with the query, so only the inserted person can match
+        results = [{'t': 'p', 'name': name, 'link': f'{self.base_url}/person/{name.replace(" ", "-")}-{slug}'}
+                   for name in ('Alex Quinlan', 'Jordan Whitaker')]
+        if _fraction(query) < self.match_rate:
+            results.insert(int(_fraction(query + '#') * 3), {
+                't': 'p', 'name': query, 'age': str(40 + int(_fraction(query + '@') * 50)),
+                'link': f'{self.base_url}/person/{slug}'})
+        return json.dumps({'result': results})
+
+    def person_page(self, path: str) -> str:
+        """
+        Args:
+            path (str): Request path
+
+        Returns:
+            str: Person page HTML, a recorded or fixture page
+        """
+        recorded = self.pages.get(path)
+        if recorded is not None:
+            return recorded
+        return PERSON_PAGES[int(_fraction(path) * len(PERSON_PAGES))]
+
+    def _inject(self, route: str) -> Tuple[float, bool]:
+        with self.rng_lock:
+            self.counts[route] = self.counts.get(route, 0) + 1
+            return self.latency + self.rng.uniform(0, self.jitter), self.rng.random() < self.error_rate
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; Nagle would hold the body back
+            disable_nagle_algorithm = True
+
+            def _respond(self, status: int, body: str, content_type: str, headers: Dict[str, str] = None):
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _serve(self, route: str, build):
+                delay, fail = server._inject(route)
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    self._respond(server.error_status, '', 'text/plain', {'Retry-After': '0'})
+                    return
+                self._respond(200, *build())
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+                if urlsplit(self.path).path != '/search/live':
+                    self._respond(404, '', 'text/plain')
+                    return
+                query = (form.get('q') or [''])[0]
+                self._serve('search', lambda: (server.search(query), 'application/json'))
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                if path.startswith('/person/'):
+                    self._serve('person', lambda: (server.person_page(path), 'text/html; charset=utf-8'))
+                elif path.startswith('/search/collections/'):
+                    self._serve('ancestry', lambda: (ANCESTRY_PAGE, 'text/html; charset=utf-8'))
+                elif path == '/obituaries.json':
+                    self._serve('obituaries', lambda: (json.dumps(synthetic_obituaries(server.obituaries, server.seed)),
+                                                       'application/json'))
+                else:
+                    self._respond(404, '', 'text/plain')
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'ReplayServer':
+        self._thread = threading.Thread(target=self.server.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'ReplayServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for ClustrMaps and the Ancestry obituary search")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random seconds per response, up to this much')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail')
+    parser.add_argument('--error-status', type=int, default=503, help='Status of injected errors')
+    parser.add_argument('--match-rate', type=float, default=0.7, help='Fraction of synthetic searches with a match')
+    parser.add_argument('--archive', default=None, help='Replay responses recorded in this page archive')
+    parser.add_argument('--obituaries', type=int, default=200, help='Records served at /obituaries.json')
+    args = parser.parse_args(argv)
+
+    server = ReplayServer(args.host, args.port, args.latency, args.jitter, args.error_rate, args.error_status,
+                          args.match_rate, args.archive, args.obituaries)
+    print(f"Serving on {server.base_url} ({len(server.searches)} recorded searches, {len(server.pages)} pages)")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == '__main__':
+    main()
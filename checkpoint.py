@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+
+from result_store import open_log_for_append
+
+# Record statuses
+MATCHED = 'matched'
+NO_MATCH = 'no_match'
+ERROR = 'error'
+
+
+def obituary_id(person: Dict[str, Any]) -> str:
+    """
+    Build a stable identifier for an obituary record.
+
+    The ID only depends on the record's own fields, so it survives
+    reordering of the input file and does not drift like a positional index.
+
+    Args:
+        person (Dict[str, Any]): Obituary record from the Ancestry input
+
+    Returns:
+        str: 16 character hex digest
+    """
+    key = '|'.join([
+        ' '.join((person.get('Name') or '').split()).lower(),
+        (person.get('Birth Date') or '').strip().lower(),
+        (person.get('Death Date') or '').strip().lower(),
+        (person.get('Publication Place') or '').strip().lower(),
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+class Checkpoint:
+    """
+    Per-obituary progress log keyed on ``obituary_id``.
+
+    Each status change is appended as one JSON line; on load the last line
+    per ID wins. Records that matched or had no match are finished, records
+    that errored stay pending until they reach ``max_attempts``.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        """
+        Args:
+            path (str): Path to the checkpoint ``.jsonl`` file
+            max_attempts (int): Errors allowed before a record is given up on
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._log = None
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                self.entries[entry['id']] = entry
+
+    def status(self, record_id: str) -> Optional[str]:
+        """
+        Args:
+            record_id (str): Obituary ID
+
+        Returns:
+            str or None: Last recorded status, None if never attempted
+        """
+        entry = self.entries.get(record_id)
+        return entry['status'] if entry else None
+
+    def attempts(self, record_id: str) -> int:
+        entry = self.entries.get(record_id)
+        return entry['attempts'] if entry else 0
+
+    def is_done(self, record_id: str) -> bool:
+        """
+        Check whether a record needs no further work.
+
+        Args:
+            record_id (str): Obituary ID
+
+        Returns:
+            bool: True if matched, no-match, or out of retry attempts
+        """
+        entry = self.entries.get(record_id)
+        if entry is None:
+            return False
+        if entry['status'] == ERROR:
+            return entry['attempts'] >= self.max_attempts
+        return True
+
+    def record(self, record_id: str, status: str, index: Optional[int] = None, **extra: Any) -> None:
+        """
+        Append a status change for a record.
+
+        Args:
+            record_id (str): Obituary ID
+            status (str): One of MATCHED, NO_MATCH or ERROR
+            index (int, optional): Position of the record in the input file
+            **extra: Additional fields to keep with the entry (name, error, ...)
+        """
+        previous = self.entries.get(record_id, {})
+        entry = {
+            'id': record_id,
+            'status': status,
+            'attempts': previous.get('attempts', 0) + 1,
+            'index': index if index is not None else previous.get('index'),
+            'updated': int(time.time()),
+        }
+        entry.update({k: v for k, v in extra.items() if v is not None})
+        self.entries[record_id] = entry
+
+        if self._log is None:
+            self._log = open_log_for_append(self.path)
+        self._log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._log.flush()
+
+    def resume_index(self, start: int = 0) -> int:
+        """
+        Find the first input position that still has pending work.
+
+        Everything before this index is finished, so a restart can start
+        reading the input here instead of at the beginning.
+
+        Args:
+            start (int): Position to start looking from (e.g. a shard's start)
+
+        Returns:
+            int: Lowest index at or after ``start`` whose record is not finished
+        """
+        finished = set()
+        for record_id, entry in self.entries.items():
+            if entry.get('index') is not None and self.is_done(record_id):
+                finished.add(entry['index'])
+        index = start
+        while index in finished:
+            index += 1
+        return index
+
+    def summary(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: Number of records per status
+        """
+        counts: Dict[str, int] = {}
+        for entry in self.entries.values():
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        return counts
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,236 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Any, Optional
+
+import requests
+
+
+class CacheMiss(requests.RequestException):
+    """
+    Raised in cache-only mode when a request has no fresh cached response.
+    """
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for ``requests.Response`` rebuilt from a cache entry.
+    """
+
+    def __init__(self, entry: Dict[str, Any]):
+        self.status_code = entry['status']
+        self.url = entry['url']
+        self.headers = entry.get('headers', {})
+        self.text = entry['body']
+        self.from_cache = True
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode('utf-8')
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> None:
+        # Only successful responses are ever cached
+        return None
+
+
+class HttpCache:
+    """
+    Content-addressed, gzip-compressed on-disk cache of HTTP responses.
+
+    Entries are keyed by a hash of method, URL, query parameters and form
+    payload, expire after ``ttl`` seconds and are evicted least-recently-used
+    first once the cache grows past ``max_bytes``. A file's mtime doubles as
+    its last access time.
+    """
+
+    def __init__(self, cache_dir: str = '.http_cache', ttl: float = 7 * 24 * 3600,
+                 max_bytes: int = 500 * 1024 * 1024, cache_only: bool = False):
+        """
+        Args:
+            cache_dir (str): Directory holding the cache entries
+            ttl (float): Seconds a cached response stays fresh
+            max_bytes (int): Size limit before LRU eviction kicks in
+            cache_only (bool): Never touch the network; misses raise CacheMiss
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.cache_only = cache_only
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key(method: str, url: str, params: Any = None, data: Any = None) -> str:
+        """
+        Build the cache key of a request.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            params (optional): Query parameters
+            data (optional): Form payload
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        def normalize(value):
+            if isinstance(value, dict):
+                return sorted((str(k), str(v)) for k, v in value.items())
+            return value
+
+        raw = json.dumps([method.upper(), url, normalize(params), normalize(data)], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.json.gz')
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Args:
+            key (str): Cache key from ``HttpCache.key``
+
+        Returns:
+            CachedResponse or None: Fresh cached response, if any
+        """
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl and time.time() - entry['stored_at'] > self.ttl:
+            self._remove(path)
+            return None
+
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+        return CachedResponse(entry)
+
+    def put(self, key: str, response: Any) -> None:
+        """
+        Store a successful response.
+
+        Args:
+            key (str): Cache key from ``HttpCache.key``
+            response (requests.Response): Response to store
+        """
+        if response.status_code != 200:
+            return
+
+        entry = {
+            'status': response.status_code,
+            'url': response.url,
+            'headers': {'content-type': response.headers.get('content-type', '')},
+            'body': response.text,
+            'stored_at': time.time(),
+        }
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        tmp_path = path + '.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+        if self._size is not None:
+            self._size += os.path.getsize(path) - old_size
+        if self.current_size() > self.max_bytes:
+            self.evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        if self._size is not None:
+            self._size -= size
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.json.gz'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat
+
+    def current_size(self) -> int:
+        """
+        Returns:
+            int: Total bytes used by cache entries
+        """
+        if self._size is None:
+            self._size = sum(stat.st_size for _, stat in self._entries())
+        return self._size
+
+    def evict(self) -> None:
+        """
+        Drop expired entries, then the least recently used ones until the
+        cache is back under 90% of ``max_bytes``.
+        """
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda item: item[1].st_mtime)
+        target = self.max_bytes * 0.9
+        for path, stat in entries:
+            expired = self.ttl and now - stat.st_mtime > self.ttl
+            if not expired and self.current_size() <= target:
+                break
+            self._remove(path)
+
+    def request(self, session: Any, method: str, url: str, **kwargs: Any) -> Any:
+        """
+        Serve a request from the cache, falling back to ``session``.
+
+        Args:
+            session (requests.Session): Session used on a cache miss
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Passed to ``session.request``
+
+        Returns:
+            requests.Response or CachedResponse: The response
+        """
+        key = self.key(method, url, kwargs.get('params'), kwargs.get('data'))
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        if self.cache_only:
+            raise CacheMiss(f"No cached response for {method.upper()} {url}")
+
+        response = session.request(method, url, **kwargs)
+        self.put(key, response)
+        return response
+
+
+class CachingSession:
+    """
+    Wraps a ``requests.Session`` so its GET and POST calls go through an
+    ``HttpCache``. Everything else is delegated to the wrapped session.
+    """
+
+    def __init__(self, session: Any, cache: HttpCache):
+        self.session = session
+        self.cache = cache
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self.cache.request(self.session, 'GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Any:
+        return self.cache.request(self.session, 'POST', url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
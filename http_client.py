@@ -0,0 +1,237 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Any, Deque, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from retry_policy import RetryPolicy
+
+# (connect, read) seconds applied to every request that does not set its own
+DEFAULT_TIMEOUT = (5, 30)
+
+# Requests per second allowed to any single host
+DEFAULT_MAX_RATE = 2.0
+
+# Keep-alive connections kept open per host
+DEFAULT_POOL_SIZE = 10
+
+# Timing records kept in memory
+DEFAULT_MAX_TIMINGS = 10000
+
+
+class RequestTiming(NamedTuple):
+    """
+    One finished (or failed) request.
+    """
+    method: str
+    host: str
+    url: str
+    status: Optional[int]
+    started: float
+    elapsed: float
+    error: Optional[str]
+
+
+class HostRateLimiter:
+    """
+    Spaces requests to the same host at least ``1 / rate`` seconds apart.
+
+    Slots are reserved under a lock and slept for outside it, so threads
+    sharing a client queue up per host without blocking other hosts.
+    """
+
+    def __init__(self, default_rate: Optional[float] = DEFAULT_MAX_RATE,
+                 rates: Optional[Dict[str, Optional[float]]] = None):
+        """
+        Args:
+            default_rate (float, optional): Requests per second per host, None for no cap
+            rates (dict, optional): Per-host overrides
+        """
+        self.default_rate = default_rate
+        self.rates = dict(rates or {})
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> float:
+        """
+        Block until a request to ``host`` is allowed.
+
+        Args:
+            host (str): Host name
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        rate = self.rates.get(host, self.default_rate)
+        if not rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + 1.0 / rate
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by the scrapers.
+
+    Wraps one ``requests.Session`` (or a subclass such as cloudscraper's)
+    with keep-alive connection pools, a default (connect, read) timeout on
+    every request, a per-host rate cap and a record of how long each
+    request took. Anything else is delegated to the wrapped session, so it
+    can be used wherever a session was.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout=DEFAULT_TIMEOUT,
+                 max_rate: Optional[float] = DEFAULT_MAX_RATE, host_rates: Optional[Dict[str, Optional[float]]] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE, max_timings: int = DEFAULT_MAX_TIMINGS,
+                 retry_policy: Optional[RetryPolicy] = None):
+        """
+        Args:
+            session (requests.Session, optional): Session to wrap, a new one by default
+            timeout (float or tuple): Default timeout, seconds or (connect, read)
+            max_rate (float, optional): Requests per second per host, None for no cap
+            host_rates (dict, optional): Per-host rate overrides
+            pool_size (int): Keep-alive connections per host for a new session
+            max_timings (int): Timing records kept in memory
+            retry_policy (RetryPolicy, optional): Retries, backoff and circuit breaking
+        """
+        if session is None:
+            # Sessions passed in keep their own adapters (cloudscraper's carries its TLS setup)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        self.session = session
+        self.timeout = timeout
+        self.limiter = HostRateLimiter(max_rate, host_rates)
+        self.timings: Deque[RequestTiming] = deque(maxlen=max_timings)
+        self.retry_policy = retry_policy
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pool, waiting for the host's rate slot.
+
+        With a retry policy every attempt waits for its own rate slot and is
+        timed separately.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Passed to ``requests.Session.request``; ``timeout``
+                defaults to the client's timeout
+
+        Returns:
+            requests.Response: The response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        host = urlsplit(url).hostname or ''
+
+        def send():
+            self.limiter.wait(host)
+            started = time.time()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                self.timings.append(RequestTiming(method.upper(), host, url, None, started,
+                                                  time.perf_counter() - start, type(e).__name__))
+                raise
+            self.timings.append(RequestTiming(method.upper(), host, url, response.status_code, started,
+                                              time.perf_counter() - start, None))
+            return response
+
+        if self.retry_policy is None:
+            return send()
+        return self.retry_policy.call(host, send)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def timing_summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate the recorded timings per host.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: count, errors, total, mean and max seconds by host
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        for timing in self.timings:
+            entry = summary.setdefault(timing.host, {'count': 0, 'errors': 0, 'total': 0.0, 'max': 0.0})
+            entry['count'] += 1
+            entry['errors'] += timing.error is not None
+            entry['total'] += timing.elapsed
+            entry['max'] = max(entry['max'], timing.elapsed)
+        for entry in summary.values():
+            entry['mean'] = entry['total'] / entry['count']
+        return summary
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __getattr__(self, name):
+        if name == 'session':
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+
+# Clients shared by name for the life of the process
+_clients: Dict[str, HttpClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name: str = 'default', session_factory: Optional[Callable[[], requests.Session]] = None,
+               **kwargs) -> HttpClient:
+    """
+    Return the shared client called ``name``, creating it on first use.
+
+    Args:
+        name (str): Client name, e.g. one per site or per session type
+        session_factory (callable, optional): Builds the wrapped session
+            (e.g. ``cloudscraper.create_scraper``) when the client is created
+        **kwargs: Passed to ``HttpClient`` when the client is created
+
+    Returns:
+        HttpClient: Shared client
+    """
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            session = session_factory() if session_factory is not None else None
+            client = _clients[name] = HttpClient(session, **kwargs)
+        return client
+
+
+def close_clients() -> None:
+    """
+    Close every shared client and its pooled connections.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def format_timings(client: HttpClient) -> str:
+    """
+    Args:
+        client (HttpClient): Client whose timings to report
+
+    Returns:
+        str: One line per host with request count, errors and latency
+    """
+    lines = []
+    for host, entry in sorted(client.timing_summary().items()):
+        lines.append(f"{host}: {entry['count']} requests, {entry['errors']} errors, "
+                     f"mean {entry['mean']:.3f}s, max {entry['max']:.3f}s")
+    return '\n'.join(lines)
@@ -0,0 +1,232 @@
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+# Histogram resolution: percentiles are exact to within about 2%
+BUCKETS_PER_DOUBLING = 16
+
+# Stage names used by the scraper
+SEARCH = 'search'
+MATCH = 'match'
+PAGE_FETCH = 'page_fetch'
+PARSE = 'parse'
+PERSIST = 'persist'
+
+
+class Histogram:
+    """
+    Latency histogram with logarithmic buckets.
+
+    Keeps a count per bucket instead of every sample, so memory stays
+    bounded however long the run; count, total, min and max are exact.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """
+        Args:
+            seconds (float): Duration of one call
+        """
+        index = math.floor(math.log2(seconds) * BUCKETS_PER_DOUBLING) if seconds > 0 else None
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.min = min(self.min, seconds)
+            self.max = max(self.max, seconds)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Args:
+            fraction (float): 0.5 for the median, 0.99 for p99
+
+        Returns:
+            float: Seconds at that rank (bucket midpoint), 0 when empty
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        # Zero durations (None bucket) sort first
+        for index in sorted(self.buckets, key=lambda i: -math.inf if i is None else i):
+            seen += self.buckets[index]
+            if seen >= rank:
+                if index is None:
+                    return 0.0
+                midpoint = 2 ** ((index + 0.5) / BUCKETS_PER_DOUBLING)
+                return min(self.max, max(self.min, midpoint))
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: count, then total, mean, min, max, p50, p95 and p99 in seconds
+        """
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'total': round(self.total, 6),
+            'mean': round(self.total / self.count, 6),
+            'min': round(self.min, 6),
+            'max': round(self.max, 6),
+            'p50': round(self.percentile(0.50), 6),
+            'p95': round(self.percentile(0.95), 6),
+            'p99': round(self.percentile(0.99), 6),
+        }
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+# Returned while the hooks are disabled: entering and leaving it does nothing
+_NULL_TIMER = contextlib.nullcontext()
+
+_enabled = False
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def enable(flag: bool = True) -> None:
+    """
+    Turn the timing hooks on or off for the whole process.
+
+    Args:
+        flag (bool): True to record stage timings
+    """
+    global _enabled
+    _enabled = flag
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def histogram(stage: str) -> Histogram:
+    """
+    Args:
+        stage (str): Stage name
+
+    Returns:
+        Histogram: Shared histogram of that stage, created on first use
+    """
+    found = _histograms.get(stage)
+    if found is None:
+        with _histograms_lock:
+            found = _histograms.setdefault(stage, Histogram())
+    return found
+
+
+def timed(stage: str):
+    """
+    Time a block as one call of ``stage``::
+
+        with timed(PARSE):
+            person_data = parse_person_page(html)
+
+    While the hooks are disabled this returns a shared no-op context
+    manager, so an instrumented block costs one function call.
+
+    Args:
+        stage (str): Stage name
+
+    Returns:
+        Context manager recording the block's duration
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(histogram(stage))
+
+
+def record(stage: str, seconds: float) -> None:
+    """
+    Record a duration measured elsewhere.
+
+    Args:
+        stage (str): Stage name
+        seconds (float): Duration
+    """
+    if _enabled:
+        histogram(stage).record(seconds)
+
+
+def stage_summaries() -> Dict[str, Dict[str, Any]]:
+    """
+    Returns:
+        Dict[str, Dict[str, Any]]: ``Histogram.summary()`` per stage
+    """
+    return {stage: found.summary() for stage, found in sorted(_histograms.items())}
+
+
+def reset() -> None:
+    """
+    Drop every recorded timing.
+    """
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def write_report(path: str, **extra: Any) -> Dict[str, Any]:
+    """
+    Write the run report as JSON.
+
+    Args:
+        path (str): Report file, replaced atomically
+        **extra: Additional top-level fields (outcomes, HTTP timings, ...)
+
+    Returns:
+        Dict[str, Any]: The report that was written
+    """
+    report: Dict[str, Any] = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'timing_enabled': _enabled,
+        'stages': stage_summaries(),
+    }
+    report.update(extra)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, default=str)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return report
+
+
+def format_stages(stages: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    """
+    Args:
+        stages (dict, optional): Stage summaries, the current ones by default
+
+    Returns:
+        str: One line per stage with count, total and p50/p95/p99 in milliseconds
+    """
+    lines = []
+    for stage, entry in (stage_summaries() if stages is None else stages).items():
+        if not entry['count']:
+            continue
+        lines.append(f"{stage}: {entry['count']} calls, total {entry['total']:.3f}s, "
+                     f"p50 {entry['p50'] * 1000:.2f}ms, p95 {entry['p95'] * 1000:.2f}ms, "
+                     f"p99 {entry['p99'] * 1000:.2f}ms")
+    return '\n'.join(lines)
@@ -0,0 +1,235 @@
+import heapq
+import os
+import time
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+from instrumentation import MATCH, timed
+from name_normalization import name_tokens
+
+# Overridable to point the scraper at a local stand-in (see benchmarks/replay_server.py)
+CLUSTRMAPS_BASE_URL = os.environ.get('CLUSTRMAPS_BASE_URL', 'https://clustrmaps.com').rstrip('/')
+
+PERSON_LINK_PREFIX = CLUSTRMAPS_BASE_URL + '/person/'
+
+# Full first + last name match with at most one extra word (e.g. a middle name)
+CONFIDENT_SCORE = 3
+
+
+def is_valid_person_result(result: Dict[str, Any]) -> bool:
+    """
+    Check if a search result is a person result with a person page link.
+
+    Args:
+        result (dict): Individual search result
+
+    Returns:
+        bool: True if valid, False otherwise
+    """
+    return (
+        result.get('t') == 'p' and
+        result.get('link', '').startswith(PERSON_LINK_PREFIX)
+    )
+
+
+@lru_cache(maxsize=8192)
+def _result_tokens(result_name: str) -> Tuple[frozenset, int]:
+    # Search responses repeat the same names across queries and variants
+    words = name_tokens(result_name)
+    return frozenset(words), len(words)
+
+
+class NameMatcher:
+    """
+    Scores ClustrMaps search results against one person's name.
+
+    The target name variants are lowercased and split once when the matcher
+    is built, each result name is tokenized once no matter how many variants
+    it is scored against, and only the best ``k`` results are kept on a
+    bounded heap instead of sorting every positive pair.
+
+    Scoring and tie-breaking are those of ``improved_matching_logic``: the
+    highest score wins and among equal scores the earliest result does. With
+    a ``birth_year``, a result whose listed age fits it wins a tie first.
+    """
+
+    def __init__(self, first_name: str, last_name: str, name_variants: Sequence[str], birth_year: int = 0):
+        """
+        Args:
+            first_name (str): First name to match
+            last_name (str): Last name to match
+            name_variants (list): Query variations; the first one is also scored
+            birth_year (int, optional): Birth year of the searched person, 0 if unknown
+        """
+        self._expected_age = time.localtime().tm_year - birth_year if birth_year else None
+        name_search_variants = [
+            [first_name, last_name],  # Standard order
+            [last_name, first_name],  # Reversed order
+            [name_variants[0]] if name_variants else []  # Additional name variant if available
+        ]
+        # (words, word set) per variant, normalized once; each part stays one word
+        self._targets: List[Tuple[Tuple[str, ...], frozenset]] = []
+        for name_parts in name_search_variants:
+            words = tuple(' '.join(name_tokens(part)) for part in name_parts)
+            self._targets.append((words, frozenset(words)))
+
+    def score(self, result_name: str) -> float:
+        """
+        Best similarity score of a result name over all target variants.
+
+        Args:
+            result_name (str): Name from a search result
+
+        Returns:
+            float: Highest variant score (higher is better), 0 for no name
+        """
+        if not result_name:
+            return 0
+
+        result_set, result_len = _result_tokens(result_name)
+
+        best = None
+        for target_words, target_set in self._targets:
+            # Word overlap, bonus for a full name match, penalty for extra words
+            word_overlap = len(result_set & target_set)
+            full_name_match = target_set <= result_set
+            extra_words_penalty = result_len - len(target_words)
+            score = word_overlap + full_name_match * 2 - max(0, extra_words_penalty)
+            if best is None or score > best:
+                best = score
+        return best
+
+    def top_k(self, results: Dict[str, Any], k: int = 1) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Find the ``k`` best person results.
+
+        Args:
+            results (dict): Search response with a ``result`` list
+            k (int): Number of results to keep
+
+        Returns:
+            List[Tuple[float, dict]]: (score, result) pairs, best first
+        """
+        heap: List[Tuple[float, bool, int, int]] = []
+        candidates = results.get('result', []) if results else []
+        for order, result in enumerate(candidates):
+            # Skip non-person results
+            if not is_valid_person_result(result):
+                continue
+
+            score = self.score(result.get('name', ''))
+            # Only consider results with a meaningful similarity score
+            if score <= 0:
+                continue
+
+            # Results of the right age, then earlier results win ties
+            entry = (score, self.age_fits(result), -order, order)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        return [(score, candidates[order]) for score, _, _, order in sorted(heap, reverse=True)]
+
+    def age_fits(self, result: Dict[str, Any]) -> bool:
+        """
+        Args:
+            result (dict): Individual search result
+
+        Returns:
+            bool: True if the result's listed age is within a year of the birth year's
+        """
+        if self._expected_age is None:
+            return False
+        age = str(result.get('age') or '').strip()
+        return age.isdigit() and abs(int(age) - self._expected_age) <= 1
+
+    def best_with_score(self, results: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Args:
+            results (dict): Search response with a ``result`` list
+
+        Returns:
+            Tuple[dict or None, float]: Winning result and its score (0 if none)
+        """
+        top = self.top_k(results, 1)
+        if not top:
+            return None, 0
+        score, result = top[0]
+        return result, score
+
+    def best(self, results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            results (dict): Search response with a ``result`` list
+
+        Returns:
+            dict or None: Best matching result or None if no match found
+        """
+        return self.best_with_score(results)[0]
+
+    def best_many(self, result_sets: Iterable[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Pick the winner of several search responses for the same person.
+
+        Args:
+            result_sets (iterable): Search responses
+
+        Returns:
+            list: Best result (or None) per response
+        """
+        return [self.best(results) for results in result_sets]
+
+
+def select_match(matcher: NameMatcher, responses: Iterable[Tuple[str, Dict[str, Any]]], broad_query: bool = False,
+                 min_score: float = CONFIDENT_SCORE) -> Tuple[Optional[Dict[str, Any]], float, int, bool]:
+    """
+    Pick the chosen result of a search the way ``search_clustrmaps`` does,
+    consuming the responses lazily so no query is sent after the decision.
+
+    By default the first response with any match wins. With ``broad_query``
+    the best scoring result over all responses wins, and the search stops
+    as soon as one reaches ``min_score``.
+
+    Args:
+        matcher (NameMatcher): Matcher for the searched person
+        responses (iterable): (query, search response) pairs in query order
+        broad_query (bool): Use the single broad query mode
+        min_score (float): Score that ends a broad search
+
+    Returns:
+        Tuple[dict or None, float, int, bool]: Chosen result, its score,
+        responses consumed and whether the search stopped before running
+        out of responses
+    """
+    best_match, best_score, query_count = None, 0, 0
+    for query_count, (_, results) in enumerate(responses, start=1):
+        # Score every variant locally, keeping the best result over all queries
+        with timed(MATCH):
+            match, score = matcher.best_with_score(results)
+        if score > best_score:
+            best_match, best_score = match, score
+        if best_match is not None and (not broad_query or best_score >= min_score):
+            return best_match, best_score, query_count, True
+    return best_match, best_score, query_count, False
+
+
+def best_matches(jobs: Iterable[Tuple[Dict[str, Any], str, str, Sequence[str]]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Score many result sets at once, building one matcher per distinct target.
+
+    Args:
+        jobs (iterable): (results, first_name, last_name, name_variants) tuples
+
+    Returns:
+        list: Best result (or None) per job, in input order
+    """
+    matchers: Dict[Tuple[str, str, str], NameMatcher] = {}
+    winners = []
+    for results, first_name, last_name, name_variants in jobs:
+        key = (first_name, last_name, name_variants[0] if name_variants else None)
+        matcher = matchers.get(key)
+        if matcher is None:
+            matcher = matchers[key] = NameMatcher(first_name, last_name, name_variants)
+        winners.append(matcher.best(results))
+    return winners
@@ -0,0 +1,97 @@
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from typing import Tuple
+
+# Generational suffixes dropped from the end of a name
+SUFFIXES = frozenset(['jr', 'sr', 'ii', 'iii', 'iv', 'v'])
+
+CACHE_SIZE = 65536
+
+# Apostrophes and periods join ("O'Brien" -> "obrien", "J." -> "j"), hyphens
+# stay inside the word and any other punctuation separates words
+_JOINING = re.compile(r"['’.]")
+_SEPARATING = re.compile(r'[^\w\s-]|_')
+
+
+def fold(text: str) -> str:
+    """
+    Lowercase a string and strip diacritics, e.g. ``Treviño`` -> ``trevino``.
+
+    Args:
+        text (str): Text to fold
+
+    Returns:
+        str: Casefolded ASCII-compatible text
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def name_tokens(name: str) -> Tuple[str, ...]:
+    """
+    All words of a name, folded and with punctuation removed.
+
+    Tokens are interned so the same word from different records shares one
+    string object, and the whole tuple is memoized in a bounded LRU cache.
+
+    Args:
+        name (str): Name as scraped or read from the input
+
+    Returns:
+        Tuple[str, ...]: Words, e.g. ``('anita', 'm', 'trevino', 'jr')``
+    """
+    if not name:
+        return ()
+    text = _SEPARATING.sub(' ', _JOINING.sub('', fold(name)))
+    words = (word.strip('-') for word in text.split())
+    return tuple(sys.intern(word) for word in words if word)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def core_tokens(name: str) -> Tuple[str, ...]:
+    """
+    First and last name tokens, without middle names, initials or suffixes.
+
+    Args:
+        name (str): Name as scraped or read from the input
+
+    Returns:
+        Tuple[str, ...]: ``(first, last)``, or fewer words for short names
+    """
+    tokens = name_tokens(name)
+    # Only strip a suffix when a first and last name remain
+    while len(tokens) > 2 and tokens[-1] in SUFFIXES:
+        tokens = tokens[:-1]
+    if len(tokens) > 2:
+        # Keep first and last name, remove middle names and initials
+        tokens = (tokens[0], tokens[-1])
+    return tokens
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_name(name: str) -> str:
+    """
+    Normalize name for comparison: folded "first last" string.
+
+    Args:
+        name (str): Name as scraped or read from the input
+
+    Returns:
+        str: Normalized name, e.g. ``'anita trevino'``
+    """
+    return sys.intern(' '.join(core_tokens(name)))
+
+
+def cache_info():
+    """
+    Returns:
+        dict: LRU statistics per memoized function
+    """
+    return {
+        'name_tokens': name_tokens.cache_info(),
+        'core_tokens': core_tokens.cache_info(),
+        'normalize_name': normalize_name.cache_info(),
+    }
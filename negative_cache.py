@@ -0,0 +1,118 @@
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from name_normalization import name_tokens
+from result_store import open_log_for_append
+
+
+def miss_key(first_name: str, last_name: str, middle_name: Optional[str] = None) -> str:
+    """
+    Normalize a search query into its negative cache key.
+
+    Args:
+        first_name (str): First name
+        last_name (str): Last name
+        middle_name (str, optional): Middle name
+
+    Returns:
+        str: Case, accent, punctuation and whitespace insensitive query,
+        normalized like ``query_planner.query_key``
+    """
+    parts = [first_name or '', middle_name or '', last_name or '']
+    return ' '.join(name_tokens(' '.join(parts)))
+
+
+class NegativeCache:
+    """
+    Persisted record of ClustrMaps queries that returned no match.
+
+    Misses are appended to a JSON Lines file as ``{"key", "at"}`` and stay
+    valid for ``ttl`` seconds, after which the query is tried again.
+    """
+
+    def __init__(self, path: str, ttl: float = 30 * 24 * 3600):
+        """
+        Args:
+            path (str): Path to the ``.jsonl`` file
+            ttl (float): Seconds before a recorded miss is retried
+        """
+        self.path = path
+        self.ttl = ttl
+        self.misses: Dict[str, float] = {}
+        self.skipped = 0
+        self._log = None
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # Keys written before accents and punctuation were folded normalize the same way
+                self.misses[' '.join(name_tokens(entry['key']))] = entry['at']
+
+    def _fresh(self, recorded_at: float) -> bool:
+        return not self.ttl or time.time() - recorded_at <= self.ttl
+
+    def is_known_miss(self, first_name: str, last_name: str, middle_name: Optional[str] = None) -> bool:
+        """
+        Args:
+            first_name (str): First name
+            last_name (str): Last name
+            middle_name (str, optional): Middle name
+
+        Returns:
+            bool: True if the query missed within the last ``ttl`` seconds
+        """
+        recorded_at = self.misses.get(miss_key(first_name, last_name, middle_name))
+        if recorded_at is not None and self._fresh(recorded_at):
+            self.skipped += 1
+            return True
+        return False
+
+    def record_miss(self, first_name: str, last_name: str, middle_name: Optional[str] = None) -> None:
+        """
+        Remember that a query returned no match.
+
+        Args:
+            first_name (str): First name
+            last_name (str): Last name
+            middle_name (str, optional): Middle name
+        """
+        key = miss_key(first_name, last_name, middle_name)
+        now = time.time()
+        self.misses[key] = now
+
+        if self._log is None:
+            self._log = open_log_for_append(self.path)
+        self._log.write(json.dumps({'key': key, 'at': now}, ensure_ascii=False) + '\n')
+        self._log.flush()
+
+    def compact(self) -> None:
+        """
+        Rewrite the file with one line per unexpired miss.
+        """
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self.misses = {key: at for key, at in self.misses.items() if self._fresh(at)}
+        if not self.misses and not os.path.exists(self.path):
+            return
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, at in self.misses.items():
+                f.write(json.dumps({'key': key, 'at': at}, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        self.compact()
@@ -0,0 +1,342 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import name_normalization
+import parsed_date
+from name_normalization import name_tokens
+from obituary_reader import iter_obituaries
+from parsed_date import parse_date
+
+# (column, array typecode), stored in this order
+COLUMNS = (
+    ('strings', 'B'),            # UTF-8 bytes of every distinct string
+    ('string_offsets', 'Q'),     # start of string k in `strings`, plus the end
+    ('name', 'I'),               # string id of the raw Name, per record
+    ('birth_date', 'I'),         # string id of the raw Birth Date
+    ('death_date', 'I'),         # string id of the raw Death Date
+    ('place', 'I'),              # string id of the Publication Place
+    ('birth_year', 'h'),         # parsed birth year, 0 when unknown
+    ('death_year', 'h'),         # parsed death year, 0 when unknown
+    ('date_flags', 'B'),         # APPROX_BIRTH / APPROX_DEATH bits
+    ('token_offsets', 'I'),      # start of record i in `tokens`, plus the end
+    ('tokens', 'I'),             # string ids of the normalized name tokens
+    ('relative_offsets', 'I'),   # start of record i in `relatives`, plus the end
+    ('relatives', 'I'),          # string ids of the raw relative names
+)
+
+APPROX_BIRTH = 1
+APPROX_DEATH = 2
+
+# magic, version, input size, input mtime (ns), code fingerprint, record count,
+# then one item count per column
+_HEADER = struct.Struct('<4sIQQQQ' + 'Q' * len(COLUMNS))
+_MAGIC = b'OBCC'
+_VERSION = 2
+
+
+def code_fingerprint() -> int:
+    """
+    The name tokens and parsed years are derived data, so a cache built by an
+    older normalizer or date parser is stale even when the input is unchanged.
+
+    Returns:
+        int: 64-bit hash of the name normalization and date parsing sources
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for module in (name_normalization, parsed_date):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return int.from_bytes(digest.digest(), 'little')
+
+
+def columns_path(input_file: str) -> str:
+    """
+    Args:
+        input_file (str): Path to the obituary input file
+
+    Returns:
+        str: Path of the side-car columnar cache for that file
+    """
+    return input_file + '.cols'
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _StringTable:
+    """
+    Assigns one id per distinct string; id 0 is the empty string.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {'': 0}
+        self.strings = bytearray()
+        self.offsets = array('Q', [0, 0])
+
+    def add(self, text: Optional[str]) -> int:
+        text = text or ''
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.ids)
+            self.strings += text.encode('utf-8')
+            self.offsets.append(len(self.strings))
+        return string_id
+
+
+def build_columns(input_file: str, columns_file: Optional[str] = None) -> str:
+    """
+    One-time preprocessing pass: decode the input once and write the fields
+    the scraper needs as memory-mappable columns.
+
+    Args:
+        input_file (str): Path to a JSON array or JSON Lines file
+        columns_file (str, optional): Where to write the cache
+
+    Returns:
+        str: Path of the written cache
+    """
+    columns_file = columns_file or columns_path(input_file)
+    stat = os.stat(input_file)
+
+    table = _StringTable()
+    data = {name: array(typecode) for name, typecode in COLUMNS if name not in ('strings', 'string_offsets')}
+    data['token_offsets'].append(0)
+    data['relative_offsets'].append(0)
+
+    count = 0
+    for person in iter_obituaries(input_file):
+        data['name'].append(table.add(person.get('Name')))
+        data['place'].append(table.add(person.get('Publication Place')))
+
+        flags = 0
+        for field, column, approx_flag in (('Birth Date', 'birth', APPROX_BIRTH), ('Death Date', 'death', APPROX_DEATH)):
+            raw = person.get(field)
+            data[column + '_date'].append(table.add(raw))
+            parsed = parse_date(raw or '')
+            data[column + '_year'].append(parsed.year if parsed else 0)
+            if parsed and parsed.approximate:
+                flags |= approx_flag
+        data['date_flags'].append(flags)
+
+        data['tokens'].extend(table.add(token) for token in name_tokens(person.get('Name') or ''))
+        data['token_offsets'].append(len(data['tokens']))
+        data['relatives'].extend(table.add(relative) for relative in person.get('Relatives') or [])
+        data['relative_offsets'].append(len(data['relatives']))
+        count += 1
+
+    data['strings'] = array('B', bytes(table.strings))
+    data['string_offsets'] = table.offsets
+
+    tmp_file = columns_file + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, stat.st_size, stat.st_mtime_ns, code_fingerprint(), count,
+                             *(len(data[name]) for name, _ in COLUMNS)))
+        for name, _ in COLUMNS:
+            f.write(b'\0' * (_aligned(f.tell()) - f.tell()))
+            data[name].tofile(f)
+    os.replace(tmp_file, columns_file)
+    return columns_file
+
+
+class ObituaryColumns:
+    """
+    Memory-mapped view of the columnar cache.
+
+    Names, dates, places and relatives come straight out of the mapped
+    columns without decoding any JSON, strings are decoded and interned at
+    most once per run, and ``read_range`` / ``shard_range`` work like
+    ``ObituaryIndex`` so either can feed the scraper.
+    """
+
+    def __init__(self, columns_file: str):
+        """
+        Args:
+            columns_file (str): Path written by ``build_columns``
+        """
+        self.columns_file = columns_file
+        self._fh = open(columns_file, 'rb')
+        self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = _HEADER.unpack_from(self._map, 0)[:2] if len(self._map) >= _HEADER.size else (None, None)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{columns_file} is not an obituary column cache")
+        header = _HEADER.unpack_from(self._map, 0)
+        self.input_size, self.input_mtime_ns, self.fingerprint, self.count = header[2:6]
+
+        self._views: Dict[str, memoryview] = {}
+        offset = _HEADER.size
+        for (name, typecode), length in zip(COLUMNS, header[6:]):
+            offset = _aligned(offset)
+            nbytes = length * array(typecode).itemsize
+            self._views[name] = memoryview(self._map)[offset:offset + nbytes].cast(typecode)
+            offset += nbytes
+        for name, view in self._views.items():
+            setattr(self, '_' + name, view)
+
+        self._decoded: List[Optional[str]] = [None] * (len(self._string_offsets) - 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def string(self, string_id: int) -> str:
+        """
+        Args:
+            string_id (int): Id from one of the string columns
+
+        Returns:
+            str: Interned string
+        """
+        text = self._decoded[string_id]
+        if text is None:
+            start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+            text = self._decoded[string_id] = sys.intern(bytes(self._strings[start:end]).decode('utf-8'))
+        return text
+
+    def name(self, i: int) -> str:
+        return self.string(self._name[i])
+
+    def name_tokens(self, i: int) -> Tuple[str, ...]:
+        """
+        Args:
+            i (int): Record position
+
+        Returns:
+            Tuple[str, ...]: Normalized name tokens, as ``name_tokens`` returns them
+        """
+        return tuple(self.string(token_id) for token_id in
+                     self._tokens[self._token_offsets[i]:self._token_offsets[i + 1]])
+
+    def birth_year(self, i: int) -> Tuple[int, bool]:
+        """
+        Args:
+            i (int): Record position
+
+        Returns:
+            Tuple[int, bool]: Parsed year (0 if unknown) and whether it is approximate
+        """
+        return self._birth_year[i], bool(self._date_flags[i] & APPROX_BIRTH)
+
+    def death_year(self, i: int) -> Tuple[int, bool]:
+        """
+        Args:
+            i (int): Record position
+
+        Returns:
+            Tuple[int, bool]: Parsed year (0 if unknown) and whether it is approximate
+        """
+        return self._death_year[i], bool(self._date_flags[i] & APPROX_DEATH)
+
+    def place(self, i: int) -> str:
+        return self.string(self._place[i])
+
+    def relatives(self, i: int) -> List[str]:
+        return [self.string(relative_id) for relative_id in
+                self._relatives[self._relative_offsets[i]:self._relative_offsets[i + 1]]]
+
+    def read(self, i: int) -> Dict[str, Any]:
+        """
+        Rebuild the fields of a record the scraper uses.
+
+        Args:
+            i (int): Record position
+
+        Returns:
+            Dict[str, Any]: Obituary record
+        """
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return {
+            'Name': self.name(i),
+            'Birth Date': self.string(self._birth_date[i]),
+            'Death Date': self.string(self._death_date[i]),
+            'Publication Place': self.place(i),
+            'Relatives': self.relatives(i),
+        }
+
+    def read_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Rebuild records ``start`` to ``stop`` (exclusive) in order.
+
+        Args:
+            start (int): First record position
+            stop (int, optional): End position, defaults to the last record
+
+        Yields:
+            Tuple[int, Dict[str, Any]]: (position, record)
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        for i in range(max(start, 0), stop):
+            yield i, self.read(i)
+
+    def shard_range(self, shard: int, num_shards: int) -> Tuple[int, int]:
+        """
+        Split the records into ``num_shards`` contiguous, near-equal slices.
+
+        Args:
+            shard (int): Zero-based shard number
+            num_shards (int): Total number of shards
+
+        Returns:
+            Tuple[int, int]: Start and stop position of the shard
+        """
+        if not 0 <= shard < num_shards:
+            raise ValueError(f"Shard {shard} out of range for {num_shards} shards")
+        return self.count * shard // num_shards, self.count * (shard + 1) // num_shards
+
+    def close(self) -> None:
+        for name in list(getattr(self, '_views', {})):
+            delattr(self, '_' + name)
+            self._views.pop(name).release()
+        self._map.close()
+        self._fh.close()
+
+
+def open_columns(input_file: str) -> ObituaryColumns:
+    """
+    Open the columnar cache for an input file, (re)building it when missing,
+    when it was written by another cache version, or when the input or the
+    normalization code changed since it was built.
+
+    Args:
+        input_file (str): Path to the obituary input file
+
+    Returns:
+        ObituaryColumns: Ready-to-use reader
+    """
+    path = columns_path(input_file)
+    stat = os.stat(input_file)
+    if os.path.exists(path):
+        try:
+            columns = ObituaryColumns(path)
+        except ValueError:
+            columns = None
+        if columns is not None:
+            if (columns.input_size == stat.st_size and columns.input_mtime_ns == stat.st_mtime_ns
+                    and columns.fingerprint == code_fingerprint()):
+                return columns
+            columns.close()
+    build_columns(input_file, path)
+    return ObituaryColumns(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the columnar cache of an obituary input file")
+    parser.add_argument("input", nargs="?", default="ancestry_obituaries2.json", help="Obituary input (JSON array or JSONL)")
+    parser.add_argument("--output", default=None, help="Cache path (default: <input>.cols)")
+    args = parser.parse_args(argv)
+
+    path = build_columns(args.input, args.output)
+    columns = ObituaryColumns(path)
+    print(f"Wrote {len(columns)} records to {path} ({os.path.getsize(path)} bytes)")
+    columns.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+from obituary_reader import iter_obituary_spans
+
+# magic, version, input size, input mtime (ns), record count
+_HEADER = struct.Struct('<4sIQQQ')
+_MAGIC = b'OBIX'
+_VERSION = 1
+
+
+def index_path(input_file: str) -> str:
+    """
+    Args:
+        input_file (str): Path to the obituary input file
+
+    Returns:
+        str: Path of the side-car offset index for that file
+    """
+    return input_file + '.idx'
+
+
+def build_index(input_file: str, index_file: Optional[str] = None) -> str:
+    """
+    Scan the input once and write the byte span of every record.
+
+    Args:
+        input_file (str): Path to a JSON array or JSON Lines file
+        index_file (str, optional): Where to write the index
+
+    Returns:
+        str: Path of the written index
+    """
+    index_file = index_file or index_path(input_file)
+    stat = os.stat(input_file)
+
+    spans = array('Q')
+    for start, end, _ in iter_obituary_spans(input_file):
+        spans.append(start)
+        spans.append(end)
+
+    tmp_file = index_file + '.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, stat.st_size, stat.st_mtime_ns, len(spans) // 2))
+        spans.tofile(f)
+    os.replace(tmp_file, index_file)
+    return index_file
+
+
+class ObituaryIndex:
+    """
+    Random access into the obituary input through its offset index.
+
+    Both the input and the index are memory-mapped, so jumping to record N
+    costs the same regardless of N and only the requested records are decoded.
+    """
+
+    def __init__(self, input_file: str, index_file: Optional[str] = None):
+        """
+        Args:
+            input_file (str): Path to the obituary input file
+            index_file (str, optional): Path to its offset index
+        """
+        self.input_file = input_file
+        self.index_file = index_file or index_path(input_file)
+
+        self._index_fh = open(self.index_file, 'rb')
+        self._index_map = mmap.mmap(self._index_fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, mtime_ns, count = _HEADER.unpack_from(self._index_map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{self.index_file} is not an obituary index")
+        self.input_size = size
+        self.input_mtime_ns = mtime_ns
+        self.count = count
+        self._spans = memoryview(self._index_map)[_HEADER.size:_HEADER.size + count * 16].cast('Q')
+
+        self._input_fh = open(input_file, 'rb')
+        self._input_map = mmap.mmap(self._input_fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def __len__(self) -> int:
+        return self.count
+
+    def span(self, i: int) -> Tuple[int, int]:
+        """
+        Args:
+            i (int): Record position
+
+        Returns:
+            Tuple[int, int]: Start and end byte of the record in the input
+        """
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return self._spans[2 * i], self._spans[2 * i + 1]
+
+    def read(self, i: int) -> Dict[str, Any]:
+        """
+        Decode a single record.
+
+        Args:
+            i (int): Record position
+
+        Returns:
+            Dict[str, Any]: Obituary record
+        """
+        start, end = self.span(i)
+        return json.loads(self._input_map[start:end])
+
+    def read_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Decode records ``start`` to ``stop`` (exclusive) in order.
+
+        Args:
+            start (int): First record position
+            stop (int, optional): End position, defaults to the last record
+
+        Yields:
+            Tuple[int, Dict[str, Any]]: (position, record)
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        for i in range(max(start, 0), stop):
+            yield i, self.read(i)
+
+    def shard_range(self, shard: int, num_shards: int) -> Tuple[int, int]:
+        """
+        Split the records into ``num_shards`` contiguous, near-equal slices.
+
+        Args:
+            shard (int): Zero-based shard number
+            num_shards (int): Total number of shards
+
+        Returns:
+            Tuple[int, int]: Start and stop position of the shard
+        """
+        if not 0 <= shard < num_shards:
+            raise ValueError(f"Shard {shard} out of range for {num_shards} shards")
+        return self.count * shard // num_shards, self.count * (shard + 1) // num_shards
+
+    def close(self) -> None:
+        if hasattr(self, '_spans'):
+            self._spans.release()
+        if isinstance(getattr(self, '_input_map', None), mmap.mmap):
+            self._input_map.close()
+        if hasattr(self, '_input_fh'):
+            self._input_fh.close()
+        self._index_map.close()
+        self._index_fh.close()
+
+
+def open_index(input_file: str) -> ObituaryIndex:
+    """
+    Open the offset index for an input file, (re)building it when missing
+    or when the input changed since it was built.
+
+    Args:
+        input_file (str): Path to the obituary input file
+
+    Returns:
+        ObituaryIndex: Ready-to-use random access reader
+    """
+    path = index_path(input_file)
+    stat = os.stat(input_file)
+    if os.path.exists(path):
+        index = ObituaryIndex(input_file, path)
+        if index.input_size == stat.st_size and index.input_mtime_ns == stat.st_mtime_ns:
+            return index
+        index.close()
+    build_index(input_file, path)
+    return ObituaryIndex(input_file, path)
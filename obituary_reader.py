@@ -0,0 +1,133 @@
+import json
+import re
+from typing import Dict, Any, Iterator, Tuple
+
+# Characters read per chunk when streaming a JSON array
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\r\n]*')
+_SEPARATORS = re.compile(r'[ \t\r\n,]*')
+
+
+def is_jsonl(input_file: str) -> bool:
+    """
+    Detect whether an input file is JSON Lines rather than a JSON array.
+
+    Args:
+        input_file (str): Path to the obituary input file
+
+    Returns:
+        bool: True for one-record-per-line input
+    """
+    if input_file.endswith(('.jsonl', '.ndjson')):
+        return True
+    with open(input_file, 'r', encoding='utf-8') as f:
+        while True:
+            char = f.read(1)
+            if not char:
+                return False
+            if not char.isspace():
+                return char != '['
+
+
+def iter_obituary_spans(input_file: str) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Stream records from the input file together with their byte offsets.
+
+    Only one chunk plus the record being decoded is held in memory, so the
+    input can be far larger than RAM.
+
+    Args:
+        input_file (str): Path to a JSON array or JSON Lines file
+
+    Yields:
+        Tuple[int, int, Dict[str, Any]]: (start byte, end byte, record)
+    """
+    if is_jsonl(input_file):
+        yield from _iter_jsonl_spans(input_file)
+    else:
+        yield from _iter_array_spans(input_file)
+
+
+def iter_obituaries(input_file: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream obituary records one at a time.
+
+    Args:
+        input_file (str): Path to a JSON array or JSON Lines file
+
+    Yields:
+        Dict[str, Any]: Obituary record
+    """
+    for _, _, record in iter_obituary_spans(input_file):
+        yield record
+
+
+def _iter_jsonl_spans(input_file: str) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    offset = 0
+    with open(input_file, 'rb') as f:
+        for line in f:
+            start = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            yield start, offset, json.loads(line)
+
+
+def _iter_array_spans(input_file: str) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    # newline='' keeps '\r\n' intact so character counts map back to bytes
+    with open(input_file, 'r', encoding='utf-8', newline='') as f:
+        buffer = ''
+        # Read position in buffer and the byte offset it corresponds to
+        pos = 0
+        byte_offset = 0
+        eof = False
+        in_array = False
+
+        while True:
+            skip = (_SEPARATORS if in_array else _WHITESPACE).match(buffer, pos)
+            if skip.end() != pos:
+                byte_offset += len(buffer[pos:skip.end()].encode('utf-8'))
+                pos = skip.end()
+
+            if pos == len(buffer):
+                if eof:
+                    if in_array:
+                        raise ValueError(f"Unterminated JSON array in {input_file}")
+                    return
+                # Drop everything already consumed before reading more
+                buffer, pos = buffer[pos:] + f.read(CHUNK_SIZE), 0
+                eof = pos == len(buffer)
+                continue
+
+            if not in_array:
+                if buffer[pos] != '[':
+                    raise ValueError(f"Expected a JSON array in {input_file}")
+                pos += 1
+                byte_offset += 1
+                in_array = True
+                continue
+
+            if buffer[pos] == ']':
+                return
+
+            try:
+                record, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                record, end = None, -1
+
+            # Only trust a decode that stopped before the end of the buffer,
+            # otherwise the record may continue in the next chunk
+            if end < 0 or (end == len(buffer) and not eof):
+                if eof:
+                    raise ValueError(f"Malformed record in {input_file} at byte {byte_offset}")
+                chunk = f.read(CHUNK_SIZE)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            start = byte_offset
+            byte_offset += len(buffer[pos:end].encode('utf-8'))
+            pos = end
+            yield start, byte_offset, record
@@ -0,0 +1,343 @@
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional
+
+from result_store import open_log_for_append
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+DEFAULT_CODEC = 'zstd' if HAS_ZSTD else 'gzip'
+
+# Pages written per batch by the background writer
+DEFAULT_BATCH_SIZE = 64
+
+BLOBS_FILE = 'pages.blobs'
+INDEX_FILE = 'pages.index.jsonl'
+
+
+class ArchiveRecord(NamedTuple):
+    """
+    One archived fetch: where the page came from and where its body lives.
+
+    Several records share a blob when the same content was fetched more
+    than once.
+    """
+    url: str
+    fetched_at: float
+    status: Optional[int]
+    digest: str
+    offset: int
+    length: int
+    codec: str
+    meta: Dict[str, Any]
+
+
+def _compress(body: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if not HAS_ZSTD:
+            raise RuntimeError("zstandard is required to read zstd archive entries")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _read_blob(fh, record: ArchiveRecord) -> bytes:
+    fh.seek(record.offset)
+    return _decompress(fh.read(record.length), record.codec)
+
+
+def read_pages(archive_dir: str, records: List[ArchiveRecord]) -> Iterator[bytes]:
+    """
+    Read page bodies straight from an archive's blob file, without opening
+    the archive for writing (e.g. from worker processes).
+
+    Args:
+        archive_dir (str): Archive directory
+        records (List[ArchiveRecord]): Records from the index
+
+    Yields:
+        bytes: Decompressed body of each record, in order
+    """
+    with open(os.path.join(archive_dir, BLOBS_FILE), 'rb') as fh:
+        for record in records:
+            yield _read_blob(fh, record)
+
+
+def iter_index(archive_dir: str) -> Iterator[ArchiveRecord]:
+    """
+    Read an archive's index in fetch order.
+
+    Args:
+        archive_dir (str): Archive directory
+
+    Yields:
+        ArchiveRecord: Every archived fetch
+    """
+    index_file = os.path.join(archive_dir, INDEX_FILE)
+    if not os.path.exists(index_file):
+        return
+    with open(index_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # A torn final line from an interrupted write
+                continue
+            yield ArchiveRecord(entry['url'], entry['fetched_at'], entry.get('status'), entry['digest'],
+                                entry['offset'], entry['length'], entry['codec'], entry.get('meta') or {})
+
+
+def latest_records(archive_dir: str, kind: Optional[str] = None) -> Dict[str, ArchiveRecord]:
+    """
+    Args:
+        archive_dir (str): Archive directory
+        kind (str, optional): Only records whose ``kind`` metadata matches
+
+    Returns:
+        Dict[str, ArchiveRecord]: Most recent successful fetch of each URL
+    """
+    latest: Dict[str, ArchiveRecord] = {}
+    for record in iter_index(archive_dir):
+        if record.status != 200 or (kind is not None and record.meta.get('kind') != kind):
+            continue
+        if record.url not in latest or record.fetched_at >= latest[record.url].fetched_at:
+            latest[record.url] = record
+    return latest
+
+
+class PageArchive:
+    """
+    Append-only, content-addressed archive of raw fetched pages.
+
+    Bodies are compressed one by one (zstd when available, gzip otherwise)
+    and appended to a single blob file under their SHA-256 digest, so a page
+    fetched again with identical content is stored once. Every fetch adds a
+    line to a JSON Lines index with its URL, fetch time, status, digest and
+    any extra metadata. Writes are queued and done in batches by a
+    background thread, so archiving a page costs the caller no disk I/O.
+    """
+
+    def __init__(self, archive_dir: str = 'page_archive', codec: str = DEFAULT_CODEC,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            archive_dir (str): Directory holding the blob file and the index
+            codec (str): 'zstd' or 'gzip' for new entries
+            batch_size (int): Pages written per batch by the background writer
+        """
+        if codec == 'zstd' and not HAS_ZSTD:
+            raise ValueError("zstd compression requires the zstandard package")
+        self.archive_dir = archive_dir
+        self.codec = codec
+        self.batch_size = batch_size
+        self.blobs_file = os.path.join(archive_dir, BLOBS_FILE)
+        self.index_file = os.path.join(archive_dir, INDEX_FILE)
+        self.records = 0
+        self.deduplicated = 0
+        self.stored_bytes = 0
+
+        os.makedirs(archive_dir, exist_ok=True)
+        # Digest -> (offset, length, codec) of every stored blob, and URL -> its
+        # records in fetch order; read from the index once, then kept up to date
+        self._blobs: Dict[str, tuple] = {}
+        self._urls: Dict[str, List[ArchiveRecord]] = {}
+        self._urls_lock = threading.Lock()
+        for record in self.iter_records():
+            self._blobs.setdefault(record.digest, (record.offset, record.length, record.codec))
+            self._urls.setdefault(record.url, []).append(record)
+        self._blob_fh = open(self.blobs_file, 'ab')
+        self._index_fh = open_log_for_append(self.index_file)
+        self._reader = None
+
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name='page-archive-writer', daemon=True)
+        self._writer.start()
+
+    def put(self, url: str, body: Any, status: Optional[int] = 200, fetched_at: Optional[float] = None,
+            **meta: Any) -> None:
+        """
+        Queue a fetched page for archiving and return immediately.
+
+        Args:
+            url (str): URL the page was fetched from
+            body (str or bytes): Raw page body
+            status (int, optional): HTTP status of the response
+            fetched_at (float, optional): Epoch fetch time, now by default
+            **meta: Extra fields kept on the index line (e.g. kind, attempt)
+        """
+        if self._closed:
+            raise ValueError("Archive is closed")
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self._queue.put((url, body, status, time.time() if fetched_at is None else fetched_at,
+                         {k: v for k, v in meta.items() if v is not None}))
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not None and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            try:
+                self._write_batch([entry for entry in batch if entry is not None])
+            except Exception as e:
+                print(f"Page archive write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        if not batch:
+            return
+        lines = []
+        records = []
+        for url, body, status, fetched_at, meta in batch:
+            digest = hashlib.sha256(body).hexdigest()
+            blob = self._blobs.get(digest)
+            if blob is None:
+                data = _compress(body, self.codec)
+                blob = self._blobs[digest] = (self._blob_fh.tell(), len(data), self.codec)
+                self._blob_fh.write(data)
+                self.stored_bytes += len(data)
+            else:
+                self.deduplicated += 1
+            offset, length, codec = blob
+            lines.append(json.dumps({'url': url, 'fetched_at': fetched_at, 'status': status, 'digest': digest,
+                                     'offset': offset, 'length': length, 'codec': codec, 'meta': meta},
+                                    ensure_ascii=False))
+            records.append(ArchiveRecord(url, fetched_at, status, digest, offset, length, codec, meta))
+        # Blobs reach the disk before the index lines that point at them
+        self._blob_fh.flush()
+        self._index_fh.write('\n'.join(lines) + '\n')
+        self._index_fh.flush()
+        self.records += len(lines)
+        with self._urls_lock:
+            for record in records:
+                self._urls.setdefault(record.url, []).append(record)
+
+    def flush(self) -> None:
+        """
+        Block until every queued page has been written.
+        """
+        self._queue.join()
+
+    def iter_records(self) -> Iterator[ArchiveRecord]:
+        """
+        Read the index in fetch order.
+
+        Yields:
+            ArchiveRecord: Every archived fetch written so far
+        """
+        return iter_index(self.archive_dir)
+
+    def lookup(self, url: str) -> List[ArchiveRecord]:
+        """
+        Answered from memory, without reading the index file.
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            List[ArchiveRecord]: Every fetch of that URL written so far, oldest first
+        """
+        with self._urls_lock:
+            return list(self._urls.get(url, ()))
+
+    def read_bytes(self, record: ArchiveRecord) -> bytes:
+        """
+        Args:
+            record (ArchiveRecord): Record from the index
+
+        Returns:
+            bytes: Decompressed page body
+        """
+        if self._reader is None:
+            self._reader = open(self.blobs_file, 'rb')
+        return _read_blob(self._reader, record)
+
+    def read(self, record: ArchiveRecord) -> str:
+        """
+        Args:
+            record (ArchiveRecord): Record from the index
+
+        Returns:
+            str: Page body decoded as UTF-8
+        """
+        return self.read_bytes(record).decode('utf-8', errors='replace')
+
+    def close(self) -> None:
+        """
+        Write everything still queued, stop the writer and release the files.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._blob_fh.close()
+        self._index_fh.close()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+# Archives shared by directory for the life of the process
+_archives: Dict[str, PageArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def get_archive(archive_dir: str = 'page_archive', **kwargs: Any) -> PageArchive:
+    """
+    Return the shared archive for a directory, opening it on first use.
+
+    Args:
+        archive_dir (str): Archive directory
+        **kwargs: Passed to ``PageArchive`` when the archive is opened
+
+    Returns:
+        PageArchive: Shared archive
+    """
+    with _archives_lock:
+        archive = _archives.get(archive_dir)
+        if archive is None:
+            archive = _archives[archive_dir] = PageArchive(archive_dir, **kwargs)
+        return archive
+
+
+def close_archives() -> None:
+    """
+    Flush and close every archive opened through ``get_archive``.
+    """
+    with _archives_lock:
+        for archive in _archives.values():
+            archive.close()
+        _archives.clear()
+
+
+# Queued pages are written even when a script exits without closing its archive
+atexit.register(close_archives)
@@ -0,0 +1,134 @@
+import re
+import time
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+# Qualifiers marking a date as approximate ("abt 1946", "circa 1950")
+APPROXIMATE_WORDS = frozenset(['abt', 'about', 'approx', 'around', 'c', 'ca', 'circa', 'est', 'estimated'])
+
+# Years an approximate date may be off by
+APPROXIMATE_YEARS = 1
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+
+# Two digit years ("1/2/46") up to this one are read as 20xx, later ones as
+# 19xx: the most recent past year, since birth and death dates never lie ahead
+TWO_DIGIT_PIVOT = time.localtime().tm_year % 100
+
+CACHE_SIZE = 65536
+
+_TOKEN = re.compile(r'[a-z]+|\d+')
+
+
+class ParsedDate(NamedTuple):
+    """
+    A birth or death date as found in obituaries and search results.
+
+    Unknown parts are 0. ``lo`` and ``hi`` are the years the date may fall
+    in, widened by ``APPROXIMATE_YEARS`` for approximate dates, so two dates
+    match when their year ranges overlap.
+    """
+    year: int
+    month: int
+    day: int
+    approximate: bool
+    lo: int
+    hi: int
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_date(text: str) -> Optional[ParsedDate]:
+    """
+    Parse the date formats used by Ancestry, FamilyTreeNow and the input
+    file: "25 Oct 1949", "Oct 1949", "abt 1946", "1946", "10/25/1949",
+    "25/10/1949", "1949-10-25" and "1/2/46" (century by ``TWO_DIGIT_PIVOT``).
+
+    Args:
+        text (str): Date string, possibly empty
+
+    Returns:
+        ParsedDate or None: Parsed date, None when no year can be found
+    """
+    if not text:
+        return None
+
+    approximate = False
+    month = 0
+    numbers = []
+    for token in _TOKEN.findall(text.lower()):
+        if token.isdigit():
+            numbers.append(token)
+        elif token in APPROXIMATE_WORDS:
+            approximate = True
+        elif token[:3] in MONTHS and not month:
+            month = MONTHS[token[:3]]
+
+    year = 0
+    rest = []
+    for number in numbers:
+        if len(number) == 4 and not year:
+            year = int(number)
+        else:
+            rest.append(int(number))
+
+    # Numeric dates with a two digit year ("1/2/46") get the most recent century
+    if not year and len(rest) == 3 and '/' in text and rest[-1] < 100:
+        short_year = rest.pop()
+        year = short_year + (2000 if short_year <= TWO_DIGIT_PIVOT else 1900)
+    if not year:
+        return None
+
+    day = 0
+    if month:
+        day = rest[0] if rest and 1 <= rest[0] <= 31 else 0
+    elif len(rest) >= 2:
+        # MM/DD unless the first part cannot be a month (DD/MM)
+        first, second = rest[0], rest[1]
+        if 1 <= first <= 12:
+            month, day = first, second if 1 <= second <= 31 else 0
+        elif 1 <= second <= 12:
+            month, day = second, first if 1 <= first <= 31 else 0
+    elif len(rest) == 1 and 1 <= rest[0] <= 12:
+        month = rest[0]
+
+    slack = APPROXIMATE_YEARS if approximate else 0
+    return ParsedDate(year, month, day, approximate, year - slack, year + slack)
+
+
+def year_range(text: str) -> Optional[Tuple[int, int]]:
+    """
+    Args:
+        text (str): Date string
+
+    Returns:
+        Tuple[int, int] or None: (lo, hi) years, None when unparseable
+    """
+    parsed = parse_date(text)
+    return (parsed.lo, parsed.hi) if parsed else None
+
+
+def dates_match(date1: str, date2: str) -> bool:
+    """
+    Check whether two date strings can refer to the same year.
+
+    Identical non-empty strings always match; otherwise both must parse and
+    their year ranges must overlap.
+
+    Args:
+        date1 (str): First date
+        date2 (str): Second date
+
+    Returns:
+        bool: True if the dates match
+    """
+    if not date1 or not date2:
+        return False
+    if date1 == date2:
+        return True
+
+    parsed1 = parse_date(date1)
+    parsed2 = parse_date(date2)
+    if parsed1 is None or parsed2 is None:
+        return False
+    return parsed1.lo <= parsed2.hi and parsed2.lo <= parsed1.hi
@@ -0,0 +1,227 @@
+import importlib.util
+from typing import Dict, Any, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# BeautifulSoup loads lxml itself; only check that it is installed
+HAS_LXML = importlib.util.find_spec('lxml') is not None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+        HAS_SELECTOLAX = True
+    except ImportError:
+        HAS_SELECTOLAX = False
+
+# Backends in order of preference when none is requested
+BACKENDS = ('selectolax', 'lxml', 'strained', 'html.parser')
+
+DEFAULT_BACKEND: Optional[str] = None
+
+
+def _wanted_tag(name, attrs=None):
+    """
+    SoupStrainer filter keeping only the parts of a person page we read:
+    the person header, the contact spans and the relatedTo cards.
+    """
+    if attrs is None:
+        # Strainer implementations that only pass the tag name
+        return name in ('h1', 'div', 'span')
+    classes = attrs.get('class') or []
+    if isinstance(classes, str):
+        classes = classes.split()
+    if name == 'h1':
+        return 'person-name' in classes
+    if name == 'div':
+        return 'person-addon' in classes or ('card-body' in classes and attrs.get('itemprop') == 'relatedTo')
+    if name == 'span':
+        return attrs.get('itemprop') in ('telephone', 'email')
+    return False
+
+
+class _PersonStrainer(SoupStrainer):
+    """
+    Applies ``_wanted_tag`` on BeautifulSoup 4.13+, which asks the strainer
+    through these hooks instead of calling the name function with attributes.
+    """
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return _wanted_tag(name, attrs or {})
+
+    def allow_string_creation(self, string):
+        return False
+
+
+_PERSON_STRAINER = _PersonStrainer(_wanted_tag)
+
+
+def available_backends() -> List[str]:
+    """
+    Returns:
+        List[str]: Parser backends usable in this environment
+    """
+    backends = []
+    if HAS_SELECTOLAX:
+        backends.append('selectolax')
+    if HAS_LXML:
+        backends.append('lxml')
+    backends.extend(['strained', 'html.parser'])
+    return backends
+
+
+def set_default_backend(backend: Optional[str]) -> None:
+    """
+    Choose the backend used when ``parse_person_page`` is called without one.
+
+    Args:
+        backend (str or None): Backend name, None to pick the fastest available
+    """
+    global DEFAULT_BACKEND
+    if backend is not None and backend not in available_backends():
+        raise ValueError(f"Parser backend {backend!r} is not available, choose from {available_backends()}")
+    DEFAULT_BACKEND = backend
+
+
+def _build_person_data(name_text, addon_text, phone_text, email_text, cards) -> Dict[str, Any]:
+    # Initialize person data dictionary
+    person_data = {
+        'full_name': '',
+        'age': '',
+        'location': '',
+        'email': '',
+        'phone_number': '',
+        'associated_persons': cards
+    }
+
+    if name_text is not None:
+        person_data['full_name'] = name_text
+
+    if addon_text is not None:
+        person_data['location'] = addon_text.split(',')[-1].strip()
+
+        # Try to extract age
+        if 'age' in addon_text:
+            person_data['age'] = addon_text.split('age')[1].split(',')[0].strip()
+
+    if phone_text is not None:
+        person_data['phone_number'] = phone_text
+
+    if email_text is not None:
+        person_data['email'] = email_text
+
+    return person_data
+
+
+def _extract_soup(person_soup) -> Dict[str, Any]:
+    # Extract name and location
+    name_elem = person_soup.find('h1', class_='person-name')
+    addon_elem = person_soup.find('div', class_='person-addon')
+    phone_elem = person_soup.find('span', itemprop='telephone')
+    email_elem = person_soup.find('span', itemprop='email')
+
+    # Extract associated persons
+    cards = []
+    for assoc_person in person_soup.find_all('div', class_='card-body', itemprop='relatedTo'):
+        assoc_data = {}
+
+        # Name
+        name = assoc_person.find('span', itemprop='name')
+        if name:
+            assoc_data['name'] = name.get_text(strip=True)
+
+        # Age
+        age_elem = assoc_person.find('div', string=lambda t: t and 'Age' in t)
+        if age_elem:
+            assoc_data['age'] = age_elem.get_text(strip=True).replace('Age', '').strip()
+
+        # Phone
+        phone = assoc_person.find('span', itemprop='telephone')
+        if phone:
+            assoc_data['phone'] = phone.get_text(strip=True)
+
+        cards.append(assoc_data)
+
+    def text(elem):
+        return elem.get_text(strip=True) if elem else None
+
+    return _build_person_data(text(name_elem), text(addon_elem), text(phone_elem), text(email_elem), cards)
+
+
+def _node_string(node) -> Optional[str]:
+    # Mirror BeautifulSoup's Tag.string: the text of a single-child chain
+    child = node.child
+    if child is None or child.next is not None:
+        return None
+    if child.tag == '-text':
+        return child.text(deep=False)
+    return _node_string(child)
+
+
+def _extract_selectolax(html: str) -> Dict[str, Any]:
+    tree = HTMLParser(html)
+
+    def text(node):
+        return node.text(deep=True, separator='', strip=True) if node is not None else None
+
+    cards = []
+    for assoc_person in tree.css('div.card-body[itemprop="relatedTo"]'):
+        assoc_data = {}
+
+        name = assoc_person.css_first('span[itemprop="name"]')
+        if name is not None:
+            assoc_data['name'] = text(name)
+
+        for div in assoc_person.css('div'):
+            if div.mem_id == assoc_person.mem_id:
+                continue
+            string = _node_string(div)
+            if string and 'Age' in string:
+                assoc_data['age'] = text(div).replace('Age', '').strip()
+                break
+
+        phone = assoc_person.css_first('span[itemprop="telephone"]')
+        if phone is not None:
+            assoc_data['phone'] = text(phone)
+
+        cards.append(assoc_data)
+
+    return _build_person_data(
+        text(tree.css_first('h1.person-name')),
+        text(tree.css_first('div.person-addon')),
+        text(tree.css_first('span[itemprop="telephone"]')),
+        text(tree.css_first('span[itemprop="email"]')),
+        cards
+    )
+
+
+def parse_person_page(html: str, backend: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Extract a person's details from a ClustrMaps person page.
+
+    Every backend returns the same dictionary; they only differ in speed.
+    ``html.parser`` builds the full tree like the original scraper did,
+    ``strained`` and ``lxml`` only build the elements we read, and
+    ``selectolax`` uses a C parser with CSS selectors.
+
+    Args:
+        html (str): Person page HTML
+        backend (str, optional): One of BACKENDS, defaults to the fastest available
+
+    Returns:
+        Dict[str, Any]: full_name, age, location, email, phone_number and
+        associated_persons
+    """
+    backend = backend or DEFAULT_BACKEND or available_backends()[0]
+
+    if backend == 'selectolax':
+        return _extract_selectolax(html)
+    if backend == 'lxml':
+        return _extract_soup(BeautifulSoup(html, 'lxml', parse_only=_PERSON_STRAINER))
+    if backend == 'strained':
+        return _extract_soup(BeautifulSoup(html, 'html.parser', parse_only=_PERSON_STRAINER))
+    if backend == 'html.parser':
+        return _extract_soup(BeautifulSoup(html, 'html.parser'))
+    raise ValueError(f"Unknown parser backend {backend!r}, choose from {BACKENDS}")
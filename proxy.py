@@ -1,4 +1,5 @@
 import requests
+from http_client import get_client
 import json
 import time
 from datetime import datetime
@@ -25,6 +26,9 @@ def scrape_obituaries(fh_id=16293, page_count=20):
         "x-requested-with": "XMLHttpRequest"
     }
     
+    # Shared pooled client with default timeouts and a per-host rate cap
+    client = get_client()
+    
     # List to store all obituaries
     all_obituaries = []
     
@@ -47,7 +51,7 @@ def scrape_obituaries(fh_id=16293, page_count=20):
         
         try:
             # Send GET request
-            response = requests.get(base_url, headers=headers, params=params)
+            response = client.get(base_url, headers=headers, params=params)
             #print(f"response is {response.text}, {response.json()}")
             
             # Check if request was successful
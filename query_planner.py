@@ -0,0 +1,211 @@
+from typing import Dict, Any, List, NamedTuple, Optional, Set, Tuple
+
+from name_normalization import SUFFIXES, name_tokens
+from parsed_date import parse_date
+
+
+class PendingRecord(NamedTuple):
+    """
+    An obituary waiting to be looked up.
+
+    ``name_tokens`` and ``birth_year`` come precomputed from the columnar
+    cache; when left empty they are worked out from ``person``.
+    """
+    index: int
+    record_id: str
+    person: Dict[str, Any]
+    name_tokens: Tuple[str, ...] = ()
+    birth_year: int = 0
+
+
+class PlannedQuery(NamedTuple):
+    """
+    One unique ClustrMaps search and every obituary that needs its result.
+
+    ``birth_year`` is set when the query is the deceased's own name and all
+    its records agree on the year, 0 otherwise.
+    """
+    first_name: str
+    last_name: str
+    records: List[PendingRecord]
+    birth_year: int = 0
+
+
+def record_name_tokens(record: PendingRecord) -> Tuple[str, ...]:
+    """
+    Args:
+        record (PendingRecord): Pending obituary
+
+    Returns:
+        Tuple[str, ...]: Normalized tokens of the deceased's name
+    """
+    return record.name_tokens or name_tokens(record.person.get("Name") or "")
+
+
+def record_birth_year(record: PendingRecord) -> int:
+    """
+    Args:
+        record (PendingRecord): Pending obituary
+
+    Returns:
+        int: Birth year of the deceased, 0 when unknown
+    """
+    if record.birth_year:
+        return record.birth_year
+    parsed = parse_date(record.person.get("Birth Date") or "")
+    return parsed.year if parsed else 0
+
+
+def own_name(tokens: Tuple[str, ...]) -> Optional[Tuple[str, str]]:
+    """
+    Args:
+        tokens (Tuple[str, ...]): Normalized name tokens
+
+    Returns:
+        Tuple[str, str] or None: First and last name, without a generational
+        suffix, None for an empty name
+    """
+    # Only strip a suffix when a first and last name remain
+    while len(tokens) > 2 and tokens[-1] in SUFFIXES:
+        tokens = tokens[:-1]
+    return (tokens[0], tokens[-1]) if tokens else None
+
+
+def candidate_queries(person: Dict[str, Any], max_queries: Optional[int] = None,
+                      tokens: Optional[Tuple[str, ...]] = None) -> List[Tuple[str, str]]:
+    """
+    Rank the searches worth trying for an obituary, most useful first.
+
+    Relatives come first, in input order, searched by their first name under
+    the deceased's last name: the input mostly lists them by given and
+    middle name ("Sara Alicia", "Erta J."), so a second token is rarely a
+    surname. Relatives listed by an initial only are skipped. The deceased's
+    own name comes last. Queries that normalize to the same key are kept
+    once, so the plan is the same on every run.
+
+    Names are searched in their normalized form (``name_tokens``), and a
+    generational suffix is never taken for the last name.
+
+    Args:
+        person (Dict[str, Any]): Obituary record
+        max_queries (int, optional): Keep only this many queries
+        tokens (Tuple[str, ...], optional): Precomputed name tokens of the
+            deceased, tokenized from ``person["Name"]`` when not given
+
+    Returns:
+        List[Tuple[str, str]]: (first name, last name) pairs, empty when the
+        record has no name to search for
+    """
+    if tokens is None:
+        tokens = name_tokens(person.get("Name") or "")
+    deceased = own_name(tokens)
+    if deceased is None:
+        return []
+    last_name = deceased[1]
+
+    given_names = []
+    for relative in person.get("Relatives") or []:
+        relative_tokens = name_tokens(relative or "")
+        if relative_tokens and len(relative_tokens[0]) > 1:
+            given_names.append((relative_tokens[0], last_name))
+
+    queries = []
+    seen = set()
+    for first_name, query_last_name in given_names + [deceased]:
+        key = query_key(first_name, query_last_name)
+        if key in seen:
+            continue
+        seen.add(key)
+        queries.append((first_name, query_last_name))
+    return queries[:max_queries] if max_queries else queries
+
+
+def build_query(person: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """
+    Pick the first and last name to search for an obituary.
+
+    Args:
+        person (Dict[str, Any]): Obituary record
+
+    Returns:
+        Tuple[str, str] or None: Highest ranked query from
+        ``candidate_queries``, None when the record has no name to search for
+    """
+    queries = candidate_queries(person, 1)
+    return queries[0] if queries else None
+
+
+def query_key(first_name: str, last_name: str) -> Tuple[str, str]:
+    """
+    Normalize a query so equivalent searches collapse to the same key.
+
+    Args:
+        first_name (str): First name
+        last_name (str): Last name
+
+    Returns:
+        Tuple[str, str]: Case, accent, punctuation and whitespace insensitive key
+    """
+    return ' '.join(name_tokens(first_name)), ' '.join(name_tokens(last_name))
+
+
+def coalesce_queries(batch: List[PendingRecord], round_number: int = 0,
+                     max_queries: Optional[int] = None) -> Tuple[List[PlannedQuery], List[PendingRecord]]:
+    """
+    Plan one round of searches for a batch, running each unique query only once.
+
+    In round N every record uses its N-th ranked candidate query, so records
+    still unresolved after a round move on to their next best query.
+
+    Args:
+        batch (List[PendingRecord]): Obituaries to look up
+        round_number (int): Zero-based round
+        max_queries (int, optional): Candidate queries allowed per record
+
+    Returns:
+        Tuple[List[PlannedQuery], List[PendingRecord]]: Unique queries in
+        first-seen order, each with the records its result fans out to, and
+        the records that have nothing (left) to search for
+    """
+    plan: Dict[Tuple[str, str], PlannedQuery] = {}
+    birth_years: Dict[Tuple[str, str], Set[int]] = {}
+    unplannable: List[PendingRecord] = []
+    for record in batch:
+        tokens = record_name_tokens(record)
+        queries = candidate_queries(record.person, max_queries, tokens)
+        if round_number >= len(queries):
+            unplannable.append(record)
+            continue
+        first_name, last_name = queries[round_number]
+        key = query_key(first_name, last_name)
+        if key not in plan:
+            plan[key] = PlannedQuery(first_name, last_name, [])
+            birth_years[key] = set()
+        plan[key].records.append(record)
+        # A birth year only says something about the deceased's own name
+        birth_years[key].add(record_birth_year(record) if (first_name, last_name) == own_name(tokens) else 0)
+    planned = []
+    for key, query in plan.items():
+        years = birth_years[key]
+        planned.append(query._replace(birth_year=years.pop() if len(years) == 1 else 0))
+    return planned, unplannable
+
+
+class PlannerStats:
+    """
+    Lookup accounting for a run: how many searches each resolved obituary cost.
+    """
+
+    def __init__(self):
+        self.lookups = 0
+        self.matched = 0
+        self.unmatched = 0
+
+    def report(self) -> str:
+        """
+        Returns:
+            str: One line summary with lookups per match
+        """
+        per_match = f"{self.lookups / self.matched:.2f}" if self.matched else "n/a"
+        return (f"Lookups: {self.lookups} for {self.matched} matched and {self.unmatched} unmatched "
+                f"obituaries ({per_match} lookups per match)")
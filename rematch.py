@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from name_matcher import NameMatcher, CONFIDENT_SCORE, select_match
+from page_archive import ArchiveRecord, iter_index, read_pages
+from reparse import CHUNKS_PER_WORKER, chunked
+
+# Obituary ID, name and the archived searches made for it, oldest first
+Obituary = Tuple[str, Optional[str], List[ArchiveRecord]]
+
+
+def collect_searches(archive_dir: str) -> List[Obituary]:
+    """
+    Group the archived searches by the obituary they were made for.
+
+    A search repeated by a later run (same name, same mode) replaces the
+    earlier one, keeping its place in the order the searches were first run.
+
+    Args:
+        archive_dir (str): Archive directory
+
+    Returns:
+        List[Obituary]: Obituaries in the order they were first searched for
+    """
+    obituaries: Dict[str, Dict[str, Any]] = {}
+    for record in iter_index(archive_dir):
+        meta = record.meta
+        if meta.get('kind') != 'search':
+            continue
+        signature = (meta.get('first_name'), meta.get('middle_name'), meta.get('last_name'), meta.get('broad_query'))
+        for deceased_id, deceased_name in meta.get('deceased') or []:
+            if deceased_id is None:
+                continue
+            entry = obituaries.setdefault(deceased_id, {'name': deceased_name, 'searches': {}})
+            entry['searches'][signature] = record
+    return [(deceased_id, entry['name'], list(entry['searches'].values()))
+            for deceased_id, entry in obituaries.items()]
+
+
+def replay(record: ArchiveRecord, body: bytes) -> Tuple[Optional[str], bool]:
+    """
+    Run the current matcher over one archived search.
+
+    Args:
+        record (ArchiveRecord): Search record from the index
+        body (bytes): Archived body with the raw responses
+
+    Returns:
+        Tuple[str or None, bool]: Link the matcher now chooses, and whether
+        it would have sent queries that were never recorded
+    """
+    meta = record.meta
+    responses = [(entry['query'], json.loads(entry['body'])) for entry in json.loads(body)['responses']]
+    matcher = NameMatcher(meta['first_name'], meta.get('last_name') or '', meta['variants'], meta.get('birth_year', 0))
+    match, _, used, settled = select_match(matcher, responses, meta.get('broad_query', False),
+                                           meta.get('min_score', CONFIDENT_SCORE))
+    incomplete = not settled and used < len(meta.get('queries') or [])
+    return (match['link'] if match else None), incomplete
+
+
+def rematch_chunk(archive_dir: str, obituaries: List[Obituary]) -> List[Dict[str, Any]]:
+    """
+    Replay the searches of a chunk of obituaries; runs in a worker process.
+
+    Each obituary's searches are replayed in the order they were run and the
+    first one with a match decides, as in ``process_batch``.
+
+    Args:
+        archive_dir (str): Archive directory
+        obituaries (List[Obituary]): Obituaries to replay
+
+    Returns:
+        List[Dict[str, Any]]: One outcome per obituary with its old and new link
+    """
+    records = [record for _, _, searches in obituaries for record in searches]
+    bodies = dict(zip((id(record) for record in records), read_pages(archive_dir, records)))
+
+    outcomes = []
+    for deceased_id, deceased_name, searches in obituaries:
+        old_link = next((record.meta.get('link') for record in searches if record.meta.get('link')), None)
+        new_link, incomplete = None, False
+        for record in searches:
+            new_link, incomplete = replay(record, bodies[id(record)])
+            if new_link or incomplete:
+                break
+        outcomes.append({'deceased_id': deceased_id, 'name': deceased_name, 'old_link': old_link,
+                         'new_link': new_link, 'incomplete': incomplete})
+    return outcomes
+
+
+def rematch_archive(archive_dir: str, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Replay the matcher over every archived search in parallel.
+
+    Args:
+        archive_dir (str): Archive directory
+        workers (int, optional): Worker processes, defaults to one per core
+
+    Returns:
+        List[Dict[str, Any]]: Outcome per obituary (deceased_id, name,
+        old_link, new_link, incomplete)
+    """
+    obituaries = collect_searches(archive_dir)
+    workers = workers or os.cpu_count() or 1
+    outcomes = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(rematch_chunk, archive_dir, chunk)
+                   for chunk in chunked(obituaries, workers * CHUNKS_PER_WORKER)]
+        for future in futures:
+            outcomes.extend(future.result())
+    return outcomes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the ClustrMaps matcher over archived search responses")
+    parser.add_argument("--archive-dir", default="page_archive", help="Archive written by api_scraper")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--output", default=None, help="Write every changed obituary as JSON Lines")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    outcomes = rematch_archive(args.archive_dir, args.workers)
+    elapsed = time.perf_counter() - start
+
+    changed = [outcome for outcome in outcomes if not outcome['incomplete'] and outcome['old_link'] != outcome['new_link']]
+    incomplete = [outcome for outcome in outcomes if outcome['incomplete']]
+    for outcome in changed:
+        print(f"{outcome['deceased_id']} {outcome['name']}: {outcome['old_link']} -> {outcome['new_link']}")
+    print(f"Replayed {len(outcomes)} obituaries in {elapsed:.1f}s: {len(changed)} would change their link, "
+          f"{len(incomplete)} would need queries that were never sent")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for outcome in changed:
+                f.write(json.dumps(outcome, ensure_ascii=False) + '\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from page_archive import ArchiveRecord, latest_records, read_pages
+from person_parser import parse_person_page, set_default_backend, available_backends
+from result_store import open_result_store, close_result_stores
+
+# Chunks per worker, so a slow chunk does not leave the other cores idle
+CHUNKS_PER_WORKER = 4
+
+
+def parse_chunk(archive_dir: str, records: List[ArchiveRecord],
+                backend: Optional[str] = None) -> List[Tuple[ArchiveRecord, Optional[Dict[str, Any]]]]:
+    """
+    Extract person details from a chunk of archived person pages.
+
+    Runs in a worker process and never touches the network: page bodies are
+    read straight from the archive's blob file.
+
+    Args:
+        archive_dir (str): Archive directory
+        records (List[ArchiveRecord]): Person page records to parse
+        backend (str, optional): person_parser backend
+
+    Returns:
+        List[Tuple[ArchiveRecord, dict or None]]: Each record with its
+        extracted data, None when the page could not be parsed
+    """
+    parsed = []
+    for record, body in zip(records, read_pages(archive_dir, records)):
+        try:
+            person_data = parse_person_page(body.decode('utf-8', errors='replace'), backend)
+        except Exception as e:
+            print(f"Could not parse {record.url}: {e}")
+            person_data = None
+        parsed.append((record, person_data))
+    return parsed
+
+
+def chunked(items: List[Any], num_chunks: int) -> List[List[Any]]:
+    """
+    Split ``items`` into at most ``num_chunks`` contiguous, near-equal chunks.
+    """
+    num_chunks = max(1, min(num_chunks, len(items)))
+    return [items[len(items) * i // num_chunks:len(items) * (i + 1) // num_chunks] for i in range(num_chunks)]
+
+
+def reparse_archive(archive_dir: str, output_file: str, workers: Optional[int] = None,
+                    backend: Optional[str] = None, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Re-run the person page extraction over every archived person page and
+    write the refreshed records to the result store.
+
+    Only the latest successful fetch of each page is parsed. Each page
+    refreshes its person entry and the processed record of every obituary
+    it was matched for.
+
+    Args:
+        archive_dir (str): Archive directory
+        output_file (str): Result store path, as given to api_scraper
+        workers (int, optional): Worker processes, defaults to one per core
+        backend (str, optional): person_parser backend
+        dry_run (bool): Count the changes without writing them
+
+    Returns:
+        Dict[str, int]: pages, failed, records and changed counts
+    """
+    records = sorted(latest_records(archive_dir, kind='person').values(), key=lambda record: record.offset)
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(records, workers * CHUNKS_PER_WORKER)
+
+    store = open_result_store(output_file)
+    current = store.load()
+    counts = {'pages': len(records), 'failed': 0, 'records': 0, 'changed': 0}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(parse_chunk, archive_dir, chunk, backend) for chunk in chunks]
+        for future in futures:
+            for record, person_data in future.result():
+                if person_data is None:
+                    counts['failed'] += 1
+                    continue
+                deceased = record.meta.get('deceased') or []
+                if not dry_run:
+                    store.save_person(record.url, person_data, deceased_id=deceased[0][0] if deceased else None)
+                for deceased_id, deceased_name in deceased:
+                    if not deceased_name:
+                        continue
+                    counts['records'] += 1
+                    if current.get(deceased_name) != person_data:
+                        counts['changed'] += 1
+                        if not dry_run:
+                            store.put(deceased_name, person_data, deceased_id=deceased_id)
+
+    close_result_stores()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-parse archived ClustrMaps person pages without refetching them")
+    parser.add_argument("--archive-dir", default="page_archive", help="Archive written by api_scraper")
+    parser.add_argument("--output", default="processed_obituaries.json",
+                        help="Result store to refresh (JSON, or a .db/.sqlite path)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--parser", default=None, choices=available_backends(),
+                        help="HTML parser backend (default: fastest available)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changed records without writing them")
+    args = parser.parse_args(argv)
+    set_default_backend(args.parser)
+
+    start = time.perf_counter()
+    counts = reparse_archive(args.archive_dir, args.output, args.workers, args.parser, args.dry_run)
+    elapsed = time.perf_counter() - start
+    print(f"Re-parsed {counts['pages']} pages in {elapsed:.1f}s ({counts['failed']} failed): "
+          f"{counts['changed']} of {counts['records']} records changed"
+          + (" (dry run, nothing written)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
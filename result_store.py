@@ -0,0 +1,291 @@
+import json
+import os
+from typing import Dict, Any, Optional, Set, Tuple
+
+
+class ResultStore:
+    """
+    Append-only store for processed obituary results.
+
+    Every save appends a single JSON line to a log file next to the JSON
+    snapshot (``processed_obituaries.json`` -> ``processed_obituaries.jsonl``),
+    so the cost of a save no longer grows with the number of stored records.
+    The log is periodically folded back into the JSON snapshot, which keeps
+    the snapshot readable by anything that still expects the merged file.
+    """
+
+    def __init__(self, output_file: str, compact_every: int = 500, fsync: bool = False):
+        """
+        Args:
+            output_file (str): Path to the merged JSON snapshot
+            compact_every (int): Fold the log into the snapshot after this many appends
+            fsync (bool): Force every appended line to disk before returning
+        """
+        self.output_file = output_file
+        self.log_file = output_file + 'l' if output_file.endswith('.json') else output_file + '.jsonl'
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.data: Dict[str, Any] = {}
+        # Obituary ID of each key appended since the last compaction
+        self.ids: Dict[str, str] = {}
+        self._appended = 0
+        self._loaded = False
+        self._log = None
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Rebuild the current state from the snapshot plus the append log.
+
+        Returns:
+            Dict[str, Any]: Merged processed data keyed by deceased name
+        """
+        data: Dict[str, Any] = {}
+        ids: Dict[str, str] = {}
+        if os.path.exists(self.output_file):
+            with open(self.output_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+        pending = 0
+        if os.path.exists(self.log_file):
+            with open(self.log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted write
+                        continue
+                    data[entry['key']] = entry['value']
+                    if entry.get('deceased_id'):
+                        ids[entry['key']] = entry['deceased_id']
+                    pending += 1
+
+        self.data = data
+        self.ids = ids
+        self._appended = pending
+        self._loaded = True
+        return data
+
+    def put(self, key: str, value: Any, **meta: Any) -> None:
+        """
+        Append a single record to the log.
+
+        Args:
+            key (str): Deceased name the record is stored under
+            value (Any): Processed result for that person
+            **meta: Extra fields kept on the log line (ignored when loading)
+        """
+        if not self._loaded:
+            # Never compact a partial view over an existing snapshot
+            self.load()
+        self.data[key] = value
+        if meta.get('deceased_id'):
+            self.ids[key] = meta['deceased_id']
+        entry = {'key': key, 'value': value}
+        entry.update({k: v for k, v in meta.items() if v is not None})
+
+        if self._log is None:
+            self._log = open_log_for_append(self.log_file)
+        self._log.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+
+        self._appended += 1
+        if self.compact_every and self._appended >= self.compact_every:
+            self.compact()
+
+    def has(self, key: str) -> bool:
+        """
+        Args:
+            key (str): Deceased name
+
+        Returns:
+            bool: True if a result is stored for that name
+        """
+        if not self._loaded:
+            self.load()
+        return key in self.data
+
+    def stored_ids(self) -> Tuple[Set[str], Set[str]]:
+        """
+        What is stored, for migrating records matched before checkpoints existed.
+
+        The JSON snapshot keeps no obituary IDs, so only records still in
+        the log are known by ID.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: Obituary IDs of the stored results, and
+            the names stored without an ID
+        """
+        if not self._loaded:
+            self.load()
+        return set(self.ids.values()), set(key for key in self.data if key not in self.ids)
+
+    def flush(self) -> None:
+        """
+        Make the appended records durable (each line is already flushed on append).
+        """
+        if self._log is not None and self.fsync:
+            os.fsync(self._log.fileno())
+
+    def get_person(self, link: str) -> Optional[Dict[str, Any]]:
+        """
+        Person pages are saved as files keyed by name, not by link, so a
+        stored page cannot be found again here.
+
+        Args:
+            link (str): Person page URL
+
+        Returns:
+            None: Always
+        """
+        return None
+
+    def write_all(self, processed_data: Dict[str, Any]) -> None:
+        """
+        Replace the whole state and write it out as the JSON snapshot.
+
+        Args:
+            processed_data (Dict[str, Any]): Data keyed by deceased name
+        """
+        self.data = processed_data
+        self._loaded = True
+        self.compact()
+
+    def save_person(self, link: str, person_data: Dict[str, Any], deceased_id: Optional[str] = None) -> None:
+        """
+        Store a scraped ClustrMaps person page as its own JSON file.
+
+        Args:
+            link (str): Person page URL
+            person_data (Dict[str, Any]): Extracted person details
+            deceased_id (str, optional): Obituary the page was matched for
+        """
+        save_person_json(person_data)
+
+    def compact(self) -> None:
+        """
+        Write the merged state to the JSON snapshot and truncate the log.
+        """
+        self.export_json(self.output_file)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+        # The snapshot is keyed by name only
+        self.ids = {}
+        self._appended = 0
+
+    def export_json(self, path: str) -> None:
+        """
+        Write the current merged state as a single JSON document.
+
+        Args:
+            path (str): Destination file
+        """
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        """
+        Compact any pending appends and release the log handle.
+        """
+        if self._appended:
+            self.compact()
+        elif self._log is not None:
+            self._log.close()
+            self._log = None
+
+
+def open_log_for_append(path: str):
+    """
+    Open a JSON Lines log for appending.
+
+    A torn final line left by an interrupted write has no trailing newline;
+    one is added so the next record starts on its own line instead of being
+    glued to the torn one (which would make both unreadable).
+
+    Args:
+        path (str): Log file
+
+    Returns:
+        file: Text handle positioned at the end of the log
+    """
+    if os.path.exists(path) and os.path.getsize(path):
+        with open(path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+    return open(path, 'a', encoding='utf-8')
+
+
+def save_person_json(person_data: Dict[str, Any], output_dir: str = 'new_scraped_data') -> str:
+    """
+    Write one person's details to ``<output_dir>/<First>_<Last>_clustrmaps_data.json``.
+
+    Args:
+        person_data (Dict[str, Any]): Extracted person details
+        output_dir (str): Directory holding the per-person files
+
+    Returns:
+        str: Path of the written file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Use first and last name from the full name for filename
+    name_parts = person_data['full_name'].split()
+    first_name = name_parts[0]
+    last_name = name_parts[-1]
+
+    output_file = os.path.join(output_dir, f'{first_name}_{last_name}_clustrmaps_data.json')
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(person_data, f, indent=4)
+    return output_file
+
+
+# Output files with these extensions are stored in SQLite instead of JSON
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+_stores: Dict[str, Any] = {}
+
+
+def open_result_store(output_file: str, **kwargs: Any):
+    """
+    Return the shared store for a given output file, creating it if needed.
+
+    ``.db``/``.sqlite`` paths open a ``ResultsDB`` whose JSON export is the
+    same path with a ``.json`` extension; anything else is a JSON snapshot
+    with an append log.
+
+    Args:
+        output_file (str): Path to the merged JSON snapshot or SQLite database
+        **kwargs: Passed to the store constructor on first use
+
+    Returns:
+        ResultStore or ResultsDB: Store bound to ``output_file``
+    """
+    store = _stores.get(output_file)
+    if store is None:
+        if output_file.endswith(SQLITE_EXTENSIONS):
+            from results_db import ResultsDB
+            kwargs.setdefault('json_export', os.path.splitext(output_file)[0] + '.json')
+            store = ResultsDB(output_file, **kwargs)
+        else:
+            store = ResultStore(output_file, **kwargs)
+        _stores[output_file] = store
+    return store
+
+
+def close_result_stores() -> None:
+    """
+    Close every store opened through ``open_result_store``.
+    """
+    for store in _stores.values():
+        store.close()
+    _stores.clear()
@@ -0,0 +1,201 @@
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Any, Optional, Set, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS processed (
+    deceased_name TEXT PRIMARY KEY,
+    deceased_id TEXT,
+    data TEXT NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_processed_deceased_id ON processed(deceased_id);
+
+CREATE TABLE IF NOT EXISTS persons (
+    link TEXT PRIMARY KEY,
+    deceased_id TEXT,
+    full_name TEXT,
+    data TEXT NOT NULL,
+    updated_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_persons_deceased_id ON persons(deceased_id);
+"""
+
+
+class ResultsDB:
+    """
+    SQLite backend for processed obituaries and scraped person pages.
+
+    Drop-in alternative to ``ResultStore``: lookups by deceased name,
+    deceased ID or person link hit an index instead of loading every record.
+    Writes are batched into one transaction per ``batch_size`` records and
+    the database runs in WAL mode so readers never block the scraper.
+    """
+
+    def __init__(self, db_file: str, batch_size: int = 100, json_export: Optional[str] = None):
+        """
+        Args:
+            db_file (str): Path to the SQLite database
+            batch_size (int): Number of writes per committed transaction
+            json_export (str, optional): Merged JSON file kept in sync on close;
+                imported into an empty database on first open
+        """
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.json_export = json_export
+        self._pending = 0
+
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+        if json_export and os.path.exists(json_export) and not self.conn.execute(
+                'SELECT 1 FROM processed LIMIT 1').fetchone():
+            self._import_json(json_export)
+
+    def _import_json(self, json_file: str) -> None:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        now = int(time.time())
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO processed (deceased_name, deceased_id, data, updated_at) VALUES (?, NULL, ?, ?)',
+                ((name, json.dumps(value, ensure_ascii=False), now) for name, value in data.items())
+            )
+        print(f"Imported {len(data)} records from {json_file}")
+
+    def _written(self) -> None:
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: All processed data keyed by deceased name
+        """
+        rows = self.conn.execute('SELECT deceased_name, data FROM processed')
+        return {name: json.loads(data) for name, data in rows}
+
+    def has(self, key: str) -> bool:
+        """
+        Args:
+            key (str): Deceased name
+
+        Returns:
+            bool: True if a result is stored for that name
+        """
+        return self.conn.execute('SELECT 1 FROM processed WHERE deceased_name = ?', (key,)).fetchone() is not None
+
+    def stored_ids(self) -> Tuple[Set[str], Set[str]]:
+        """
+        What is stored, for migrating records matched before checkpoints existed.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: Obituary IDs of the stored results, and
+            the names stored without an ID (e.g. imported from JSON)
+        """
+        ids, names = set(), set()
+        for name, deceased_id in self.conn.execute('SELECT deceased_name, deceased_id FROM processed'):
+            if deceased_id:
+                ids.add(deceased_id)
+            else:
+                names.add(name)
+        return ids, names
+
+    def get_person(self, link: str) -> Optional[Dict[str, Any]]:
+        """
+        Args:
+            link (str): Person page URL
+
+        Returns:
+            dict or None: Stored person details, None if the page was never saved
+        """
+        row = self.conn.execute('SELECT data FROM persons WHERE link = ?', (link,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, value: Any, deceased_id: Optional[str] = None, **meta: Any) -> None:
+        """
+        Store the processed result for one deceased person.
+
+        Args:
+            key (str): Deceased name
+            value (Any): Processed result
+            deceased_id (str, optional): Stable obituary ID
+            **meta: Accepted for interface compatibility with ``ResultStore``
+        """
+        self.conn.execute(
+            'INSERT OR REPLACE INTO processed (deceased_name, deceased_id, data, updated_at) VALUES (?, ?, ?, ?)',
+            (key, deceased_id, json.dumps(value, ensure_ascii=False), int(time.time()))
+        )
+        self._written()
+
+    def write_all(self, processed_data: Dict[str, Any]) -> None:
+        """
+        Store every record of a processed data dictionary in one transaction.
+
+        Args:
+            processed_data (Dict[str, Any]): Data keyed by deceased name
+        """
+        now = int(time.time())
+        self.conn.executemany(
+            'INSERT OR REPLACE INTO processed (deceased_name, deceased_id, data, updated_at) '
+            'VALUES (?, (SELECT deceased_id FROM processed WHERE deceased_name = ?), ?, ?)',
+            ((name, name, json.dumps(value, ensure_ascii=False), now) for name, value in processed_data.items())
+        )
+        self.flush()
+
+    def save_person(self, link: str, person_data: Dict[str, Any], deceased_id: Optional[str] = None) -> None:
+        """
+        Store a scraped ClustrMaps person page.
+
+        Args:
+            link (str): Person page URL
+            person_data (Dict[str, Any]): Extracted person details
+            deceased_id (str, optional): Obituary the page was matched for
+        """
+        self.conn.execute(
+            'INSERT OR REPLACE INTO persons (link, deceased_id, full_name, data, updated_at) VALUES (?, ?, ?, ?, ?)',
+            (link, deceased_id, person_data.get('full_name', ''),
+             json.dumps(person_data, ensure_ascii=False), int(time.time()))
+        )
+        self._written()
+
+    def flush(self) -> None:
+        """
+        Commit the current batch.
+        """
+        self.conn.commit()
+        self._pending = 0
+
+    def compact(self) -> None:
+        """
+        Commit pending writes and refresh the JSON export if one is configured.
+        """
+        self.flush()
+        if self.json_export:
+            self.export_json(self.json_export)
+
+    def export_json(self, path: str) -> None:
+        """
+        Write all processed results as the merged JSON document used by the
+        JSON backend.
+
+        Args:
+            path (str): Destination file
+        """
+        self.flush()
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.load(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def close(self) -> None:
+        """
+        Commit, export and close the connection.
+        """
+        self.compact()
+        self.conn.close()
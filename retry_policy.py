@@ -0,0 +1,229 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import requests
+
+# Responses worth retrying: rate limited or a temporary server failure
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+# Errors that say nothing about the request itself
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+
+class HostUnavailable(requests.RequestException):
+    """
+    Raised instead of sending a request while a host's circuit is open.
+
+    Subclasses ``requests.RequestException`` so callers that already treat
+    request errors as retryable keep working; ``retry_in`` says when the
+    host may be tried again, so work for it can be parked until then.
+    """
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} is unavailable, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header.
+
+    Args:
+        value (str, optional): Header value, delay seconds or an HTTP date
+        now (float, optional): Current epoch time, for HTTP dates
+
+    Returns:
+        float or None: Seconds to wait, None when missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    After ``failure_threshold`` consecutive failures a host's circuit opens
+    and requests to it are refused for ``reset_timeout`` seconds. The next
+    request after that is a trial: success closes the circuit, failure
+    opens it again for twice as long (up to ``max_timeout``).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, max_timeout: float = 600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit first stays open
+            max_timeout (float): Upper bound for the open period
+            clock (callable): Monotonic time source
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_timeout = max_timeout
+        self.clock = clock
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+        self._timeouts: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> str:
+        """
+        Returns:
+            str: 'closed', 'open' or 'half-open' (next request is a trial)
+        """
+        with self._lock:
+            until = self._open_until.get(host)
+            if until is None:
+                return 'closed'
+            return 'open' if self.clock() < until else 'half-open'
+
+    def allow(self, host: str) -> bool:
+        """
+        Returns:
+            bool: False while the host's circuit is open
+        """
+        return self.state(host) != 'open'
+
+    def retry_in(self, host: str) -> float:
+        """
+        Returns:
+            float: Seconds until the host may be tried again, 0 if it may now
+        """
+        with self._lock:
+            return max(0.0, self._open_until.get(host, 0.0) - self.clock())
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._open_until.pop(host, None)
+            self._timeouts.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            failures = self._failures[host] = self._failures.get(host, 0) + 1
+            trial_failed = host in self._open_until
+            if trial_failed or failures >= self.failure_threshold:
+                timeout = self._timeouts.get(host)
+                timeout = min(self.max_timeout, timeout * 2) if timeout else self.reset_timeout
+                self._timeouts[host] = timeout
+                self._open_until[host] = self.clock() + timeout
+
+    def trip(self, host: str, seconds: float) -> None:
+        """
+        Open a host's circuit for at least ``seconds``, e.g. for a long Retry-After.
+        """
+        with self._lock:
+            self._open_until[host] = max(self._open_until.get(host, 0.0), self.clock() + seconds)
+
+
+class RetryPolicy:
+    """
+    Retry engine for the shared fetch path.
+
+    Temporary failures (connection errors, timeouts, 429 and 5xx) are
+    retried up to ``max_attempts`` times. A ``Retry-After`` header sets the
+    wait when present; otherwise the wait is capped exponential backoff with
+    full jitter. A Retry-After longer than ``max_retry_after`` trips the
+    host's circuit instead of blocking, and while a circuit is open
+    ``HostUnavailable`` is raised without touching the network.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0,
+                 max_retry_after: float = 120.0, retry_statuses=RETRY_STATUSES,
+                 breaker: Optional[CircuitBreaker] = None, rng: Optional[random.Random] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            max_attempts (int): Attempts per request, including the first
+            base_delay (float): Backoff before the first retry, before jitter
+            max_delay (float): Cap for the exponential backoff
+            max_retry_after (float): Longest Retry-After waited for in place
+            retry_statuses (iterable): Status codes that are retried
+            breaker (CircuitBreaker, optional): Per-host breaker, a new one by default
+            rng (random.Random, optional): Jitter source
+            sleep (callable): Used to wait between attempts
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.rng = rng or random.Random()
+        self.sleep = sleep
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Args:
+            attempt (int): Zero-based attempt that just failed
+
+        Returns:
+            float: Seconds to wait, uniformly drawn up to the capped exponential delay
+        """
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, host: str, send: Callable[[], requests.Response]) -> requests.Response:
+        """
+        Run ``send`` under the policy.
+
+        Args:
+            host (str): Host the request goes to
+            send (callable): Sends the request once and returns the response
+
+        Returns:
+            requests.Response: First successful response, or the last
+            retryable one once the attempts are used up
+
+        Raises:
+            HostUnavailable: The host's circuit is open
+            requests.RequestException: Non-retryable error, or the last retryable one
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow(host):
+                raise HostUnavailable(host, self.breaker.retry_in(host))
+
+            try:
+                response = send()
+            except RETRY_EXCEPTIONS:
+                self.breaker.record_failure(host)
+                if attempt + 1 >= self.max_attempts:
+                    raise
+                wait = self.backoff(attempt)
+            else:
+                if response.status_code not in self.retry_statuses:
+                    self.breaker.record_success(host)
+                    return response
+
+                self.breaker.record_failure(host)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    # Told to stay away longer than we are willing to block
+                    self.breaker.trip(host, retry_after)
+                    raise HostUnavailable(host, retry_after)
+                if attempt + 1 >= self.max_attempts:
+                    return response
+                wait = retry_after if retry_after is not None else self.backoff(attempt)
+
+            # A circuit opened by this failure parks the work rather than sleeping on it
+            if not self.breaker.allow(host):
+                raise HostUnavailable(host, self.breaker.retry_in(host))
+            self.retries += 1
+            self.sleep(wait)
+            attempt += 1
@@ -1,6 +1,7 @@
 import requests
 from urllib.parse import quote
 import cloudscraper
+from http_client import get_client
 from twocaptcha import TwoCaptcha
 from urllib.parse import quote
 
@@ -14,8 +15,8 @@ def solve_captcha(url, sitekey):
         return None
 
 def search_family_tree(first_name, last_name, city_state_zip):
-    # Use cloudscraper to handle Cloudflare protection
-    scraper = cloudscraper.create_scraper()
+    # Use cloudscraper to handle Cloudflare protection, through the shared pooled client
+    scraper = get_client('cloudscraper', session_factory=cloudscraper.create_scraper)
     
     # Captcha parameters
     captcha_url = 'https://www.familytreenow.com/internalcaptcha/captchasubmit'
@@ -2,83 +2,48 @@ import requests
 import re
 import json
 import cloudscraper
+from http_client import get_client
+from retry_policy import RetryPolicy, HostUnavailable
+from page_archive import get_archive, close_archives
 from twocaptcha import TwoCaptcha
 from urllib.parse import quote
 from bs4 import BeautifulSoup
-import difflib
+import similarity
+from name_normalization import normalize_name
+from parsed_date import dates_match
 import time
 import random
+from collections import deque
 
-def normalize_name(name):
-    """
-    Normalize name for comparison by removing extra whitespaces, 
-    converting to lowercase, and handling middle initials.
-    """
-    # Remove extra whitespaces and convert to lowercase
-    name = ' '.join(name.split()).lower()
-    
-    # Remove middle initial if present
-    name_parts = name.split()
-    if len(name_parts) > 2:
-        # Keep first and last name, remove middle initial
-        name = f"{name_parts[0]} {name_parts[-1]}"
-    
-    return name
+# Shared by every FamilyTreeNow request: one attempt per request, since
+# search_family_tree retries with captcha handling itself, plus the circuit breaker
+RETRY_POLICY = RetryPolicy(max_attempts=1)
+
+# Times a person is parked for an unavailable host before giving up on them
+MAX_PARKS = 3
 
 def compare_names(name1, name2):
     """
-    Advanced name comparison using difflib for similarity
+    Advanced name comparison using the similarity backend (bit-parallel LCS
+    by default, difflib as the reference)
     """
     # Normalize names first
     norm_name1 = normalize_name(name1)
     norm_name2 = normalize_name(name2)
     
-    # Use SequenceMatcher to get a similarity ratio
-    similarity = difflib.SequenceMatcher(None, norm_name1, norm_name2).ratio()
-    
     # If names are very similar (above 0.8 threshold)
-    return similarity > 0.8
+    return similarity.is_similar(norm_name1, norm_name2, 0.8)
 
 def compare_birthdates(date1, date2):
     """
     Compare birthdates with some flexibility
     
-    :param date1: First date in format MM/DD/YYYY or DD/MM/YYYY or YYYY
+    :param date1: First date, e.g. "25 Oct 1949", "abt 1946", "10/25/1949" or "1949"
     :param date2: Second date for comparison
-    :return: Boolean indicating if dates match
+    :return: Boolean indicating if the dates can fall in the same year
     """
-    if not date1 or not date2:
-        return False
-    
-    # Remove any leading zeros and split
-    def clean_date(date_str):
-        # Split by / and remove leading zeros
-        parts = [part.lstrip('0') for part in date_str.split('/')]
-        return parts
-    
-    try:
-        # First try exact match
-        if date1 == date2:
-            return True
-        
-        # If dates have different formats
-        clean1 = clean_date(date1)
-        clean2 = clean_date(date2)
-        
-        # Check if years match
-        if clean1[-1] == clean2[-1]:
-            return True
-        
-        # Check partial matches (for cases with incomplete info)
-        if len(clean1) > 1 and len(clean2) > 1:
-            # Check if month and year match
-            if clean1[-1] == clean2[-1] and clean1[0] == clean2[0]:
-                return True
-        
-        return False
-    
-    except Exception:
-        return False
+    # Dates are parsed once into cached year ranges, approximate dates widened
+    return dates_match(date1, date2)
 
 def compare_relatives(relatives1, relatives2):
     """
@@ -172,24 +137,40 @@ def find_matching_person(deceased_info, search_results):
     persons = extract_person_details(search_results)
     print(f"Found {len(persons)} potential matches")
     
+    return match_person(deceased_info, persons)
+
+def match_person(deceased_info, persons):
+    """
+    Pick the first extracted person matching at least 2 of name, birthdate
+    and relatives
+    
+    :param deceased_info: Dictionary with deceased person's details
+    :param persons: Persons from extract_person_details, in result order
+    :return: Matching person's detail link or None
+    """
     # Prepare deceased info
     deceased_name = ' '.join(deceased_info.get('name_parts', []))
     deceased_birthdate = deceased_info.get('birthdate', '')
     deceased_relatives = deceased_info.get('relatives', [])
     
-    # Compare each person
+    # Compare each person, in result order
     for person in persons:
-        # Name comparison
-        name_match = compare_names(deceased_name, person['name'])
-        
         # Birthdate comparison
         birthdate_match = compare_birthdates(deceased_birthdate, person['birthdate'])
         
         # Relatives comparison (optional)
         relatives_match = compare_relatives(deceased_relatives, person['relatives'])
         
+        # The name only decides when exactly one of the other criteria matched
+        if birthdate_match and relatives_match:
+            match_criteria = 2
+        elif birthdate_match or relatives_match:
+            name_match = compare_names(deceased_name, person['name'])
+            match_criteria = 1 + name_match
+        else:
+            continue
+        
         # If at least 2 out of 3 criteria match
-        match_criteria = sum([name_match, birthdate_match, relatives_match])
         if match_criteria >= 2:
             print(f"Matched person: {person['name']}")
             return person['detail_link']
@@ -203,9 +184,11 @@ def search_family_tree(deceased_info, max_retries=3):
     :param deceased_info: Dictionary containing deceased person details
     :param max_retries: Maximum number of retry attempts
     :return: Detailed page HTML or None
+    :raises HostUnavailable: FamilyTreeNow's circuit is open; park the person
+        and search again after ``retry_in`` seconds (see search_family_trees)
     """
-    # Use cloudscraper to handle Cloudflare protection
-    scraper = cloudscraper.create_scraper()
+    # Use cloudscraper to handle Cloudflare protection, through the shared pooled client
+    scraper = get_client('cloudscraper', session_factory=cloudscraper.create_scraper, retry_policy=RETRY_POLICY)
     
     # Captcha parameters
     captcha_url = 'https://www.familytreenow.com/internalcaptcha/captchasubmit'
@@ -227,6 +210,8 @@ def search_family_tree(deceased_info, max_retries=3):
                   f'&last={last_name_encoded}'
                   f'&citystatezip={city_state_zip_encoded}')
     
+    archive = get_archive()
+    
     # Retry loop
     for attempt in range(max_retries):
         try:
@@ -262,9 +247,9 @@ def search_family_tree(deceased_info, max_retries=3):
             if response.status_code == 200:
                 print("Successfully accessed the search results URL!")
                 
-                # Save search results
-                with open(f'search_results_attempt_{attempt + 1}.html', 'w', encoding='utf-8') as f:
-                    f.write(response.text)
+                # Archive search results (written in the background)
+                archive.put(search_url, response.text, response.status_code, kind='search',
+                            attempt=attempt + 1, deceased_name=deceased_info.get('deceased_name'))
                 
                 # Find matching person's detail link
                 matching_detail_link = find_matching_person(deceased_info, response.text)
@@ -278,9 +263,10 @@ def search_family_tree(deceased_info, max_retries=3):
                     details_response = scraper.get(full_url, headers=headers)
                     
                     if details_response.status_code == 200:
-                        # Save user details
-                        with open(f'users_details_attempt_{attempt + 1}.html', 'w', encoding='utf-8') as f:
-                            f.write(details_response.text)
+                        # Archive user details
+                        archive.put(full_url, details_response.text, details_response.status_code,
+                                    kind='details', attempt=attempt + 1,
+                                    deceased_name=deceased_info.get('deceased_name'))
                         
                         return details_response.text
                     else:
@@ -290,16 +276,59 @@ def search_family_tree(deceased_info, max_retries=3):
                 
                 return None
             
-            # Add a small delay between retries to avoid rate limiting
-            time.sleep(random.uniform(1, 3))
+            # Back off before the next attempt (capped exponential with jitter)
+            time.sleep(RETRY_POLICY.backoff(attempt))
+        
+        except HostUnavailable:
+            # Circuit open: the caller parks this person instead of waiting here
+            raise
         
         except Exception as e:
             print(f"Request error on attempt {attempt + 1}: {e}")
-            time.sleep(random.uniform(1, 3))
+            time.sleep(RETRY_POLICY.backoff(attempt))
     
     print("Max retries reached. Unable to complete the search.")
     return None
 
+def search_family_trees(deceased_data):
+    """
+    Search several deceased persons, parking the ones whose search hits an
+    open circuit and carrying on with the rest
+    
+    Parked persons are searched again once the host reopens; the wait only
+    happens when nothing else is left to search.
+    
+    :param deceased_data: List of deceased person details
+    :return: Detailed page HTML or None per person, in input order
+    """
+    results = [None] * len(deceased_data)
+    queue = deque(enumerate(deceased_data))
+    # (monotonic time the host reopens, position, person) for parked searches
+    parked = []
+    parks = {}
+    while queue or parked:
+        if not queue:
+            parked.sort(key=lambda item: item[0])
+            delay = parked[0][0] - time.monotonic()
+            if delay > 0:
+                print(f"Parked {len(parked)} searches, resuming in {delay:.1f}s")
+                time.sleep(delay)
+            queue.extend((position, person) for _, position, person in parked)
+            parked = []
+        
+        position, person = queue.popleft()
+        print(f"Searching for: {person['deceased_name']}")
+        try:
+            results[position] = search_family_tree(person)
+        except HostUnavailable as e:
+            parks[position] = parks.get(position, 0) + 1
+            if parks[position] <= MAX_PARKS:
+                print(f"Parking {person['deceased_name']}: {e}")
+                parked.append((time.monotonic() + e.retry_in, position, person))
+            else:
+                print(f"Giving up on {person['deceased_name']}: {e}")
+    return results
+
 # Example usage
 def main():
     # Load deceased info from JSON file
@@ -307,10 +336,9 @@ def main():
         deceased_data = json.load(f)
     
     # Search for each deceased person
-    for person in deceased_data:
-        print(f"Searching for: {person['deceased_name']}")
-        search_family_tree(person)
-        break  # Process only the first person in this example
+    search_family_trees(deceased_data[:1])  # Process only the first person in this example
+    
+    close_archives()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,177 @@
+import difflib
+from functools import lru_cache
+from typing import Callable, Dict, Tuple
+
+try:
+    from rapidfuzz.distance import Indel
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False
+
+# Reference first, fastest last
+BACKENDS = ('difflib', 'lcs', 'rapidfuzz')
+
+
+def difflib_ratio(a: str, b: str) -> float:
+    """
+    Reference similarity: ``difflib.SequenceMatcher(None, a, b).ratio()``.
+    """
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+@lru_cache(maxsize=4096)
+def _match_masks(pattern: str) -> Tuple[Dict[str, int], int]:
+    # Bit i of masks[c] is set where pattern[i] == c
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks, (1 << len(pattern)) - 1
+
+
+def lcs_length(a: str, b: str) -> int:
+    """
+    Length of the longest common subsequence of two strings.
+
+    Bit-parallel (Allison-Dix / Hyyrö): one big-int row of the LCS table is
+    updated per character of ``b``, so the cost is O(len(b)) integer
+    operations on len(a) bit words instead of a pure-Python dynamic program.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+
+    Returns:
+        int: LCS length
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return 0
+
+    masks, full = _match_masks(a)
+    row = full
+    for char in b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(a) - bin(row).count('1')
+
+
+def lcs_ratio(a: str, b: str) -> float:
+    """
+    Indel similarity ``2 * LCS / (len(a) + len(b))``, the score difflib's
+    ratio approximates with greedy longest blocks. It is never lower than
+    the difflib ratio and equal to it on almost all name pairs.
+
+    Args:
+        a (str): First string
+        b (str): Second string
+
+    Returns:
+        float: Similarity between 0 and 1
+    """
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    return 2.0 * lcs_length(a, b) / total
+
+
+def rapidfuzz_ratio(a: str, b: str) -> float:
+    """
+    ``lcs_ratio`` computed by rapidfuzz's C implementation.
+    """
+    return Indel.normalized_similarity(a, b)
+
+
+_RATIOS: Dict[str, Callable[[str, str], float]] = {
+    'difflib': difflib_ratio,
+    'lcs': lcs_ratio,
+}
+if HAS_RAPIDFUZZ:
+    _RATIOS['rapidfuzz'] = rapidfuzz_ratio
+
+DEFAULT_BACKEND = 'rapidfuzz' if HAS_RAPIDFUZZ else 'lcs'
+_default_backend = DEFAULT_BACKEND
+
+
+def available_backends() -> Tuple[str, ...]:
+    """
+    Returns:
+        Tuple[str, ...]: Backends usable in this environment
+    """
+    return tuple(backend for backend in BACKENDS if backend in _RATIOS)
+
+
+def get_ratio(backend: str = None) -> Callable[[str, str], float]:
+    """
+    Args:
+        backend (str, optional): Backend name, defaults to the current default
+
+    Returns:
+        callable: ratio(a, b) function of that backend
+    """
+    backend = backend or _default_backend
+    if backend not in _RATIOS:
+        raise ValueError(f"Unknown or unavailable similarity backend: {backend}")
+    return _RATIOS[backend]
+
+
+def set_default_backend(backend: str) -> None:
+    """
+    Select the backend used by ``ratio`` and ``is_similar``.
+
+    Args:
+        backend (str): One of ``available_backends()``
+    """
+    global _default_backend
+    get_ratio(backend)
+    _default_backend = backend
+
+
+def default_backend() -> str:
+    return _default_backend
+
+
+def ratio(a: str, b: str, backend: str = None) -> float:
+    """
+    Similarity of two (normalized) names between 0 and 1.
+
+    Args:
+        a (str): First name
+        b (str): Second name
+        backend (str, optional): Backend name, defaults to the current default
+
+    Returns:
+        float: Similarity ratio
+    """
+    return get_ratio(backend)(a, b)
+
+
+def is_similar(a: str, b: str, threshold: float = 0.8, backend: str = None) -> bool:
+    """
+    The ``compare_names`` decision: similarity strictly above ``threshold``.
+
+    Pairs whose lengths alone rule out the threshold are rejected without
+    running the backend; difflib additionally tries its cheaper upper
+    bounds before the full ratio.
+
+    Args:
+        a (str): First name
+        b (str): Second name
+        threshold (float): Similarity a match has to exceed
+        backend (str, optional): Backend name, defaults to the current default
+
+    Returns:
+        bool: True if the names are similar enough
+    """
+    backend = backend or _default_backend
+    if backend == 'difflib':
+        matcher = difflib.SequenceMatcher(None, a, b)
+        return (matcher.real_quick_ratio() > threshold and
+                matcher.quick_ratio() > threshold and
+                matcher.ratio() > threshold)
+
+    total = len(a) + len(b)
+    # No backend scores above 2 * min(len) / total
+    if total and 2.0 * min(len(a), len(b)) / total <= threshold:
+        return False
+    return get_ratio(backend)(a, b) > threshold
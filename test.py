@@ -1,4 +1,5 @@
 import requests
+from http_client import get_client
 import json
 from bs4 import BeautifulSoup
 import time
@@ -14,7 +15,7 @@ class AncestryObituaryScraper:
         """
         self.base_url = base_url
         self.headers = headers
-        self.session = requests.Session()
+        self.session = get_client()
         #self.session.headers.update(headers)
         
         # Configure logging
@@ -22,6 +23,50 @@ class AncestryObituaryScraper:
                             format='%(asctime)s - %(levelname)s - %(message)s')
         self.logger = logging.getLogger(__name__)
 
+    def parse_results_page(self, html):
+        """
+        Extract obituary rows from an Ancestry search results page
+        
+        :param html: HTML of the search results page
+        :return: List of obituary dictionaries
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Find table rows
+        rows = soup.select('table.collection-results-table tbody tr')
+
+        # Extract data
+        page_results = []
+        for row in rows:
+            try:
+                data = {}
+
+                # Loop through each <td> in the row and map the "data-label" to its content
+                for cell in row.find_all('td'):
+                    label = cell.get('data-label')  # Extract the data-label attribute
+                    if label:
+                        # Extract content, handling <br> tags for "Relatives"
+                        content = cell.get_text(separator=',', strip=True)
+                        data[label] = content
+                    # Parse relatives into a list
+                    relatives = data.get('Relatives', '')
+                    relatives_list = [relative.strip() for relative in relatives.split(',') if relative.strip()]
+                print(data.get("Name"))
+
+
+                page_results.append({
+                    "Name": data.get("Name"),
+                    "Birth Date": data.get("Birth Date"),
+                    "Death Date": data.get("Death Date"),
+                    "Publication Place": data.get("Publication Place"),
+                    "Relatives": relatives_list,
+                })
+                #print(page_results)
+            except Exception as row_error:
+                self.logger.warning(f"Error parsing row: {row_error}")
+        
+        return page_results
+
     def scrape_page(self, page_num):
         """
         Scrape a single page of obituary results
@@ -47,40 +92,7 @@ class AncestryObituaryScraper:
                 response.raise_for_status()
                 
                 # Parse HTML
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Find table rows
-                rows = soup.select('table.collection-results-table tbody tr')
-                
-                # Extract data
-                page_results = []
-                for row in rows:
-                    try:
-                        data = {}
-
-                        # Loop through each <td> in the row and map the "data-label" to its content
-                        for cell in row.find_all('td'):
-                            label = cell.get('data-label')  # Extract the data-label attribute
-                            if label:
-                                # Extract content, handling <br> tags for "Relatives"
-                                content = cell.get_text(separator=',', strip=True)
-                                data[label] = content
-                            # Parse relatives into a list
-                            relatives = data.get('Relatives', '')
-                            relatives_list = [relative.strip() for relative in relatives.split(',') if relative.strip()]
-                        print(data.get("Name"))
-
-
-                        page_results.append({
-                            "Name": data.get("Name"),
-                            "Birth Date": data.get("Birth Date"),
-                            "Death Date": data.get("Death Date"),
-                            "Publication Place": data.get("Publication Place"),
-                            "Relatives": relatives_list,
-                        })
-                        #print(page_results)
-                    except Exception as row_error:
-                        self.logger.warning(f"Error parsing row: {row_error}")
+                page_results = self.parse_results_page(response.text)
                 
                 self.logger.info(f"Successfully scraped page {page_num}")
                 with open("temporary_obit1.json", 'a', encoding='utf-8') as f:
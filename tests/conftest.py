@@ -0,0 +1,42 @@
+import json
+import os
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(REPO_DIR, 'benchmarks')
+
+# Make the scraper modules and the benchmark helpers importable however pytest is started
+for path in (BENCH_DIR, REPO_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+# Obituary records covering the shapes seen in the Ancestry input
+OBITUARIES = [
+    {'Name': 'Edward John Pollace', 'Birth Date': 'abt 1946', 'Death Date': '25 Dec 2022',
+     'Publication Place': 'Langhome, Pennsylvania', 'Relatives': ['John', 'Eleanor']},
+    {'Name': 'José Treviño', 'Birth Date': '10/25/1949', 'Death Date': '3 Feb 2021',
+     'Publication Place': 'San Antonio, Texas', 'Relatives': ['María Treviño']},
+    {'Name': 'Carlos H. Dovalina', 'Birth Date': '', 'Death Date': '18 Dec 2022',
+     'Publication Place': 'Houston, Texas', 'Relatives': []},
+    {'Name': 'Mary Smith Jr', 'Birth Date': None, 'Death Date': 'Jan 2020'},
+] * 50
+
+
+@pytest.fixture(params=['array', 'array_crlf', 'jsonl'])
+def obituary_file(request, tmp_path):
+    """
+    The OBITUARIES written as a JSON array (LF and CRLF) and as JSON Lines.
+    """
+    if request.param == 'jsonl':
+        path = tmp_path / 'obituaries.jsonl'
+        text = '\n'.join(json.dumps(record, ensure_ascii=False) for record in OBITUARIES) + '\n\n'
+    else:
+        path = tmp_path / 'obituaries.json'
+        text = json.dumps(OBITUARIES, indent=2, ensure_ascii=False)
+        if request.param == 'array_crlf':
+            text = text.replace('\n', '\r\n')
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
@@ -0,0 +1,66 @@
+"""
+Checkpoint: stable obituary IDs, last-status-wins reload, retry limits,
+resume position and torn-tail recovery.
+"""
+from checkpoint import ERROR, MATCHED, NO_MATCH, Checkpoint, obituary_id
+
+PERSON = {'Name': 'John  Smith', 'Birth Date': '25 Oct 1949', 'Death Date': '3 Feb 2021',
+          'Publication Place': 'Chicago, IL'}
+
+
+def test_obituary_id_ignores_case_and_spacing():
+    variant = {'Name': 'john smith', 'Birth Date': ' 25 oct 1949', 'Death Date': '3 Feb 2021 ',
+               'Publication Place': 'CHICAGO, IL', 'Relatives': ['Mary Smith']}
+    assert obituary_id(PERSON) == obituary_id(variant)
+    assert obituary_id(PERSON) != obituary_id(dict(PERSON, **{'Birth Date': '1950'}))
+    assert len(obituary_id(PERSON)) == 16
+
+
+def test_last_status_wins_on_reload(tmp_path):
+    path = str(tmp_path / 'checkpoint.jsonl')
+    checkpoint = Checkpoint(path)
+    checkpoint.record('a', ERROR, index=0, error='timeout')
+    checkpoint.record('a', MATCHED)
+    checkpoint.record('b', NO_MATCH, index=1)
+    checkpoint.close()
+
+    reloaded = Checkpoint(path)
+    assert reloaded.status('a') == MATCHED
+    assert reloaded.attempts('a') == 2
+    assert reloaded.entries['a']['index'] == 0
+    assert reloaded.status('c') is None
+    assert reloaded.summary() == {MATCHED: 1, NO_MATCH: 1}
+
+
+def test_errors_stay_pending_until_max_attempts(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint.jsonl'), max_attempts=2)
+    checkpoint.record('a', ERROR)
+    assert not checkpoint.is_done('a')
+    checkpoint.record('a', ERROR)
+    assert checkpoint.is_done('a')
+    assert not checkpoint.is_done('b')
+
+
+def test_resume_index_skips_finished_prefix(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint.jsonl'))
+    checkpoint.record('a', MATCHED, index=0)
+    checkpoint.record('b', NO_MATCH, index=1)
+    checkpoint.record('c', ERROR, index=2)
+    checkpoint.record('d', MATCHED, index=3)
+    assert checkpoint.resume_index() == 2
+    assert checkpoint.resume_index(3) == 4
+
+
+def test_torn_tail_is_skipped_and_not_glued(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    checkpoint = Checkpoint(str(path))
+    checkpoint.record('a', MATCHED)
+    checkpoint.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"id": "b", "sta')
+
+    reopened = Checkpoint(str(path))
+    assert set(reopened.entries) == {'a'}
+    reopened.record('c', NO_MATCH)
+    reopened.close()
+    assert Checkpoint(str(path)).summary() == {MATCHED: 1, NO_MATCH: 1}
@@ -0,0 +1,29 @@
+"""
+scrape_family_v2.match_person must pick the same person as the original
+compare-every-row loop kept in benchmarks/bench_family_matching.py.
+"""
+import contextlib
+import io
+
+import pytest
+
+# scrape_family_v2 imports the scraper's network clients
+pytest.importorskip('cloudscraper')
+pytest.importorskip('twocaptcha')
+
+import scrape_family_v2
+from bench_family_matching import JOBS, reference_match_person
+
+
+def test_jobs_have_links():
+    # Agreement alone would also pass if nothing ever matched
+    links = [reference_match_person(*job) for job in JOBS]
+    assert any(links) and not all(links)
+
+
+@pytest.mark.parametrize('job', range(len(JOBS)))
+def test_link_matches_reference(job):
+    deceased_info, persons = JOBS[job]
+    with contextlib.redirect_stdout(io.StringIO()):
+        chosen = scrape_family_v2.match_person(deceased_info, persons)
+    assert chosen == reference_match_person(deceased_info, persons)
@@ -0,0 +1,49 @@
+"""
+The benchmark harness: regression detection and baseline handling.
+"""
+import json
+
+from harness import Case, compare, run_suite
+
+
+def counting_case(name, baseline=True):
+    return Case(name, lambda: 10, baseline)
+
+
+def test_compare_flags_slowdowns_and_memory_growth():
+    baseline = {'a': {'records_per_sec': 100.0, 'peak_kb': 10.0},
+                'b': {'records_per_sec': 100.0, 'peak_kb': 10.0}}
+    results = {'a': {'records_per_sec': 71.0, 'peak_kb': 12.9},
+               'b': {'records_per_sec': 69.0, 'peak_kb': 13.1},
+               'new': {'records_per_sec': 1.0, 'peak_kb': 1000.0}}
+    regressions = compare(results, baseline, tolerance=0.3)
+    assert len(regressions) == 2
+    assert all(message.startswith('b: ') for message in regressions)
+
+
+def test_update_then_check_baseline(tmp_path, capsys):
+    baseline_file = str(tmp_path / 'baseline.json')
+    cases = [counting_case('kept'), counting_case('compared_only', baseline=False)]
+    args = ['--min-time', '0.01', '--baseline', baseline_file]
+
+    assert run_suite('test', cases, args + ['--update-baseline']) == 0
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        stored = json.load(f)
+    assert list(stored) == ['kept']
+    assert stored['kept']['records_per_sec'] > 0
+
+    assert run_suite('test', cases, args) == 0
+    stored['kept']['records_per_sec'] *= 1000
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        json.dump(stored, f)
+    capsys.readouterr()
+    assert run_suite('test', cases, args) == 1
+    assert 'REGRESSION kept' in capsys.readouterr().out
+
+
+def test_failed_check_fails_the_run_and_blocks_the_update(tmp_path):
+    baseline_file = str(tmp_path / 'baseline.json')
+    args = ['--min-time', '0.01', '--baseline', baseline_file]
+    assert run_suite('test', [counting_case('kept')], args + ['--update-baseline'],
+                     check=lambda results: ['output differs']) == 1
+    assert not (tmp_path / 'baseline.json').exists()
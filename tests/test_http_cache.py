@@ -0,0 +1,94 @@
+"""
+HttpCache: keys, hits and misses, expiry, LRU eviction and cache-only mode.
+"""
+import json
+import os
+import time
+
+import pytest
+
+from http_cache import CacheMiss, CachingSession, HttpCache
+
+
+class FakeResponse:
+    def __init__(self, url, status_code=200, text='{"result": []}'):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.headers = {'content-type': 'application/json'}
+
+
+class FakeSession:
+    """
+    Answers every request locally and counts the calls.
+    """
+
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        return FakeResponse(url, self.status_code, f'{{"call": {self.calls}}}')
+
+
+def test_key_ignores_param_order():
+    assert HttpCache.key('get', 'https://x/', {'a': 1, 'b': 2}) == HttpCache.key('GET', 'https://x/', {'b': 2, 'a': 1})
+    assert HttpCache.key('GET', 'https://x/', {'a': 1}) != HttpCache.key('POST', 'https://x/', {'a': 1})
+    assert HttpCache.key('POST', 'https://x/', data={'q': 'a'}) != HttpCache.key('POST', 'https://x/', data={'q': 'b'})
+
+
+def test_second_request_is_served_from_cache(tmp_path):
+    session = CachingSession(FakeSession(), HttpCache(str(tmp_path)))
+    first = session.post('https://x/search', data={'q': 'john smith'})
+    second = session.post('https://x/search', data={'q': 'john smith'})
+    assert session.session.calls == 1
+    assert second.from_cache and second.json() == json.loads(first.text)
+    assert (session.cache.hits, session.cache.misses) == (1, 1)
+
+
+def test_errors_are_not_cached(tmp_path):
+    session = CachingSession(FakeSession(status_code=503), HttpCache(str(tmp_path)))
+    session.get('https://x/person/1')
+    session.get('https://x/person/1')
+    assert session.session.calls == 2
+
+
+def test_expired_entries_are_refetched(tmp_path, monkeypatch):
+    session = CachingSession(FakeSession(), HttpCache(str(tmp_path), ttl=60))
+    session.get('https://x/person/1')
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert session.get('https://x/person/1').text == '{"call": 2}'
+    assert session.session.calls == 2
+
+
+def test_cache_only_raises_on_miss(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    CachingSession(FakeSession(), cache).get('https://x/person/1')
+
+    offline = CachingSession(FakeSession(), HttpCache(str(tmp_path), cache_only=True))
+    assert offline.get('https://x/person/1').from_cache
+    with pytest.raises(CacheMiss):
+        offline.get('https://x/person/2')
+    assert offline.session.calls == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    now = time.time()
+    keys = [HttpCache.key('GET', f'https://x/person/{i}') for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.put(key, FakeResponse(f'https://x/person/{i}', text='x' * 1000))
+        os.utime(cache._path(key), (now - 100 + i, now - 100 + i))
+    # Reading an entry makes it the most recently used
+    assert cache.get(keys[0]) is not None
+
+    entry_size = os.path.getsize(cache._path(keys[0]))
+    cache.max_bytes = entry_size * 4
+    cache.put(HttpCache.key('GET', 'https://x/person/5'), FakeResponse('https://x/person/5', text='x' * 1000))
+
+    assert cache.current_size() <= cache.max_bytes * 0.9
+    assert cache.get(keys[0]) is not None
+    assert all(cache.get(key) is None for key in keys[1:4])
+    assert cache.get(keys[4]) is not None
@@ -0,0 +1,102 @@
+"""
+HttpClient: default timeouts, per-host rate cap, timings and retries.
+"""
+import random
+import time
+
+import pytest
+import requests
+
+import http_client
+from http_client import HostRateLimiter, HttpClient, format_timings, get_client
+from retry_policy import CircuitBreaker, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+
+
+class FakeSession:
+    """
+    Answers with the given statuses (or raises the given errors) in turn.
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        outcome = self.outcomes.pop(0) if self.outcomes else 200
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    slept = []
+    monkeypatch.setattr(time, 'sleep', slept.append)
+    return slept
+
+
+def test_default_timeout_unless_given():
+    session = FakeSession()
+    client = HttpClient(session, timeout=(1, 2), max_rate=None)
+    client.get('https://x/a')
+    client.post('https://x/b', data={'q': 1}, timeout=9)
+    assert [kwargs['timeout'] for _, _, kwargs in session.calls] == [(1, 2), 9]
+    assert [method for method, _, _ in session.calls] == ['GET', 'POST']
+
+
+def test_rate_cap_spaces_requests_per_host(no_sleep):
+    limiter = HostRateLimiter(default_rate=10, rates={'fast': None})
+    delays = [limiter.wait('x') for _ in range(3)]
+    assert delays[0] == 0
+    assert delays[1] == pytest.approx(0.1, abs=0.02) and delays[2] == pytest.approx(0.2, abs=0.02)
+    assert limiter.wait('y') == 0
+    assert limiter.wait('fast') == limiter.wait('fast') == 0
+    assert len(no_sleep) == 2
+
+
+def test_timings_record_statuses_and_errors():
+    client = HttpClient(FakeSession(200, requests.ConnectionError()), max_rate=None)
+    client.get('https://x/a')
+    with pytest.raises(requests.ConnectionError):
+        client.get('https://x/b')
+    assert [(timing.status, timing.error) for timing in client.timings] == [(200, None), (None, 'ConnectionError')]
+    summary = client.timing_summary()['x']
+    assert (summary['count'], summary['errors']) == (2, 1)
+    assert format_timings(client).startswith('x: 2 requests, 1 errors')
+
+
+def test_every_retry_waits_for_a_rate_slot_and_is_timed(no_sleep):
+    policy = RetryPolicy(breaker=CircuitBreaker(), rng=random.Random(1), sleep=lambda seconds: None)
+    session = FakeSession(503, 200)
+    client = HttpClient(session, max_rate=10, retry_policy=policy)
+    assert client.get('https://x/a').status_code == 200
+    assert len(session.calls) == 2 and len(client.timings) == 2
+    assert len(no_sleep) == 1
+
+
+def test_unknown_attributes_go_to_the_session():
+    session = FakeSession()
+    session.headers = {'User-Agent': 'test'}
+    client = HttpClient(session)
+    assert client.headers == {'User-Agent': 'test'}
+
+
+def test_shared_clients(monkeypatch):
+    monkeypatch.setattr(http_client, '_clients', {})
+    first = get_client('site', session_factory=FakeSession, max_rate=None)
+    assert get_client('site') is first
+    assert get_client('other') is not first
+    http_client.close_clients()
+    assert first.session.closed
+    assert http_client._clients == {}
@@ -0,0 +1,26 @@
+"""
+NameMatcher and best_matches must pick the same winner as the original
+matching loop kept in benchmarks/bench_matching.py.
+"""
+import pytest
+
+from bench_matching import JOBS, reference_matching_logic
+from name_matcher import NameMatcher, best_matches
+
+
+@pytest.fixture(scope='module')
+def expected():
+    return [reference_matching_logic(*job) for job in JOBS]
+
+
+def test_jobs_have_winners(expected):
+    # Agreement alone would also pass if nothing ever matched
+    assert any(expected)
+
+
+@pytest.mark.parametrize('pick', [
+    lambda jobs: [NameMatcher(first, last, variants).best(results) for results, first, last, variants in jobs],
+    best_matches,
+], ids=['NameMatcher', 'best_matches'])
+def test_winners_match_reference(pick, expected):
+    assert pick(JOBS) == expected
@@ -0,0 +1,42 @@
+"""
+Name folding and tokenizing shared by the matchers, planner and caches.
+"""
+import pytest
+
+from name_normalization import core_tokens, fold, name_tokens, normalize_name
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Anita M. Treviño Jr.', ('anita', 'm', 'trevino', 'jr')),
+    ("Mary O'Brien", ('mary', 'obrien')),
+    ('Jean-Luc  Picard', ('jean-luc', 'picard')),
+    ('Smith, John (Jack)', ('smith', 'john', 'jack')),
+    ('- Edith -', ('edith',)),
+    ('JOSÉ', ('jose',)),
+    ('', ()),
+])
+def test_name_tokens(name, expected):
+    assert name_tokens(name) == expected
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Anita M. Treviño Jr.', 'anita trevino'),
+    ('Robert Smith III', 'robert smith'),
+    ('John Jr', 'john jr'),
+    ('Edward John Pollace', 'edward pollace'),
+    ('Cher', 'cher'),
+    ('', ''),
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+    assert ' '.join(core_tokens(name)) == expected
+
+
+def test_fold():
+    assert fold('Ñuñez STRAßE') == 'nunez strasse'
+
+
+def test_tokens_are_interned():
+    first = name_tokens('Linda Roberts')
+    second = name_tokens('linda  ROBERTS')
+    assert all(a is b for a, b in zip(first, second))
@@ -0,0 +1,58 @@
+"""
+NegativeCache: normalized keys, reload, expiry, compaction and torn tails.
+"""
+import json
+import time
+
+from negative_cache import NegativeCache, miss_key
+
+
+def test_miss_key_is_normalized():
+    assert miss_key('José', 'Treviño') == miss_key(' jose ', 'TREVINO')
+    assert miss_key('John', 'Smith', 'A.') == miss_key('john', 'smith', 'a')
+    assert miss_key('John', 'Smith') != miss_key('John', 'Smyth')
+
+
+def test_miss_survives_reload(tmp_path):
+    path = str(tmp_path / 'misses.jsonl')
+    cache = NegativeCache(path)
+    cache.record_miss('John', 'Smith')
+    cache.close()
+
+    reloaded = NegativeCache(path)
+    assert reloaded.is_known_miss('john', 'SMITH')
+    assert not reloaded.is_known_miss('Mary', 'Jones')
+    assert reloaded.skipped == 1
+
+
+def test_expired_miss_is_retried_and_compacted_away(tmp_path, monkeypatch):
+    path = tmp_path / 'misses.jsonl'
+    cache = NegativeCache(str(path), ttl=60)
+    cache.record_miss('John', 'Smith')
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 30)
+    cache.record_miss('Mary', 'Jones')
+
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert not cache.is_known_miss('John', 'Smith')
+    assert cache.is_known_miss('Mary', 'Jones')
+
+    cache.compact()
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['key'] for line in lines] == [miss_key('Mary', 'Jones')]
+
+
+def test_torn_tail_is_skipped_and_not_glued(tmp_path):
+    path = tmp_path / 'misses.jsonl'
+    cache = NegativeCache(str(path))
+    cache.record_miss('John', 'Smith')
+    cache._log.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"key": "mary jo')
+
+    reopened = NegativeCache(str(path))
+    reopened.record_miss('Linda', 'Roberts')
+    reopened._log.close()
+
+    reloaded = NegativeCache(str(path))
+    assert set(reloaded.misses) == {miss_key('John', 'Smith'), miss_key('Linda', 'Roberts')}
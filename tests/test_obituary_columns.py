@@ -0,0 +1,66 @@
+"""
+The columnar cache must match a raw read of the input, and be rebuilt when it
+no longer reflects the input or the normalization code.
+"""
+import struct
+
+import obituary_columns
+from conftest import OBITUARIES
+from name_normalization import name_tokens
+from obituary_columns import columns_path, open_columns
+from parsed_date import parse_date
+
+
+def expected_record(raw):
+    # Missing fields come back empty
+    return {
+        'Name': raw.get('Name') or '',
+        'Birth Date': raw.get('Birth Date') or '',
+        'Death Date': raw.get('Death Date') or '',
+        'Publication Place': raw.get('Publication Place') or '',
+        'Relatives': raw.get('Relatives') or [],
+    }
+
+
+def expected_year(text):
+    parsed = parse_date(text or '')
+    return (parsed.year, parsed.approximate) if parsed else (0, False)
+
+
+def test_columns_match_raw_read(obituary_file):
+    columns = open_columns(obituary_file)
+    try:
+        assert len(columns) == len(OBITUARIES)
+        for i, raw in enumerate(OBITUARIES):
+            assert columns.read(i) == expected_record(raw)
+            assert columns.name_tokens(i) == tuple(name_tokens(raw['Name']))
+            assert columns.birth_year(i) == expected_year(raw.get('Birth Date'))
+            assert columns.death_year(i) == expected_year(raw.get('Death Date'))
+    finally:
+        columns.close()
+
+
+def test_rebuilt_for_other_normalization_code(obituary_file, monkeypatch):
+    open_columns(obituary_file).close()
+    monkeypatch.setattr(obituary_columns, 'code_fingerprint', lambda: 1)
+
+    columns = open_columns(obituary_file)
+    try:
+        assert columns.fingerprint == 1
+        assert columns.read(0) == expected_record(OBITUARIES[0])
+    finally:
+        columns.close()
+
+
+def test_rebuilt_over_other_cache_version(obituary_file):
+    open_columns(obituary_file).close()
+    path = columns_path(obituary_file)
+    with open(path, 'r+b') as f:
+        f.seek(4)
+        f.write(struct.pack('<I', obituary_columns._VERSION - 1))
+
+    columns = open_columns(obituary_file)
+    try:
+        assert len(columns) == len(OBITUARIES)
+    finally:
+        columns.close()
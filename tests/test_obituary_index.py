@@ -0,0 +1,48 @@
+"""
+Random access through the offset index must match a raw read of the input.
+"""
+import os
+
+import pytest
+
+from conftest import OBITUARIES
+from obituary_index import index_path, open_index
+
+
+def test_read_matches_raw_read(obituary_file):
+    index = open_index(obituary_file)
+    try:
+        assert len(index) == len(OBITUARIES)
+        assert [index.read(i) for i in reversed(range(len(index)))] == OBITUARIES[::-1]
+        assert [record for _, record in index.read_range(5, 9)] == OBITUARIES[5:9]
+    finally:
+        index.close()
+
+
+def test_shards_cover_every_record(obituary_file):
+    index = open_index(obituary_file)
+    try:
+        ranges = [index.shard_range(shard, 3) for shard in range(3)]
+        assert ranges[0][0] == 0 and ranges[-1][1] == len(index)
+        assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:]))
+        with pytest.raises(ValueError):
+            index.shard_range(3, 3)
+    finally:
+        index.close()
+
+
+def test_rebuilt_when_input_changes(obituary_file):
+    open_index(obituary_file).close()
+    assert os.path.exists(index_path(obituary_file))
+
+    with open(obituary_file, 'rb') as f:
+        data = f.read()
+    with open(obituary_file, 'wb') as f:
+        f.write(data.replace(b'Pollace', b'Polace'))
+
+    index = open_index(obituary_file)
+    try:
+        assert len(index) == len(OBITUARIES)
+        assert index.read(0)['Name'] == 'Edward John Polace'
+    finally:
+        index.close()
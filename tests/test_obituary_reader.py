@@ -0,0 +1,39 @@
+"""
+Streaming obituary reads must return what json.load returns, with byte spans
+that point back at each record in the file.
+"""
+import json
+
+import pytest
+
+import obituary_reader
+from conftest import OBITUARIES
+from obituary_reader import is_jsonl, iter_obituaries, iter_obituary_spans
+
+
+def test_stream_matches_raw_read(obituary_file):
+    assert list(iter_obituaries(obituary_file)) == OBITUARIES
+
+
+def test_records_span_chunk_boundaries(obituary_file, monkeypatch):
+    monkeypatch.setattr(obituary_reader, 'CHUNK_SIZE', 7)
+    assert list(iter_obituaries(obituary_file)) == OBITUARIES
+
+
+def test_spans_point_at_records(obituary_file):
+    with open(obituary_file, 'rb') as f:
+        data = f.read()
+    for start, end, record in iter_obituary_spans(obituary_file):
+        assert json.loads(data[start:end]) == record
+
+
+def test_format_detection(obituary_file):
+    assert is_jsonl(obituary_file) == obituary_file.endswith('.jsonl')
+
+
+@pytest.mark.parametrize('text', ['[{"Name": "John"}, oops]', '[{"Name": "John"}', '[{"Name": "Jo'])
+def test_malformed_array_raises(tmp_path, text):
+    path = tmp_path / 'obituaries.json'
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_obituaries(str(path)))
@@ -0,0 +1,90 @@
+"""
+PageArchive: content dedup, lookup by URL, reopening and reading back.
+"""
+import os
+
+import pytest
+
+from page_archive import HAS_ZSTD, INDEX_FILE, PageArchive, iter_index, latest_records, read_pages
+
+CODECS = ['gzip'] + (['zstd'] if HAS_ZSTD else [])
+
+
+@pytest.fixture(params=CODECS)
+def archive(request, tmp_path):
+    archive = PageArchive(str(tmp_path / 'archive'), codec=request.param, batch_size=2)
+    yield archive
+    archive.close()
+
+
+def test_identical_bodies_are_stored_once(archive):
+    archive.put('https://x/person/1', '<html>one</html>', fetched_at=1, kind='person')
+    archive.put('https://x/person/1', '<html>one</html>', fetched_at=2, kind='person')
+    archive.put('https://x/person/2', '<html>one</html>', fetched_at=3, kind='person')
+    archive.put('https://x/person/3', b'<html>three</html>', fetched_at=4, kind='person')
+    archive.flush()
+
+    records = list(archive.iter_records())
+    assert archive.records == 4 and archive.deduplicated == 2
+    assert len({(record.offset, record.length) for record in records}) == 2
+    assert [archive.read(record) for record in records] == ['<html>one</html>'] * 3 + ['<html>three</html>']
+
+
+def test_lookup_returns_every_fetch_oldest_first(archive):
+    archive.put('https://x/person/1', 'first', fetched_at=1)
+    archive.put('https://x/person/1', 'second', status=503, fetched_at=2, attempt=2)
+    archive.flush()
+
+    fetches = archive.lookup('https://x/person/1')
+    assert [(archive.read(record), record.status, record.meta) for record in fetches] == \
+        [('first', 200, {}), ('second', 503, {'attempt': 2})]
+    assert archive.lookup('https://x/person/2') == []
+
+
+def test_reopened_archive_keeps_deduplicating(archive):
+    archive.put('https://x/person/1', 'page', fetched_at=1)
+    archive.close()
+
+    reopened = PageArchive(archive.archive_dir, codec=archive.codec)
+    try:
+        assert len(reopened.lookup('https://x/person/1')) == 1
+        reopened.put('https://x/person/1', 'page', fetched_at=2)
+        reopened.flush()
+        assert reopened.deduplicated == 1 and reopened.stored_bytes == 0
+        assert len(reopened.lookup('https://x/person/1')) == 2
+    finally:
+        reopened.close()
+
+
+def test_latest_successful_records_and_offline_read(archive):
+    archive.put('https://x/person/1', 'old', fetched_at=1, kind='person')
+    archive.put('https://x/person/1', 'new', fetched_at=2, kind='person')
+    archive.put('https://x/person/1', 'blocked', status=403, fetched_at=3, kind='person')
+    archive.put('https://x/search', '{}', fetched_at=4, kind='search')
+    archive.flush()
+
+    latest = latest_records(archive.archive_dir, kind='person')
+    assert list(latest) == ['https://x/person/1']
+    assert list(read_pages(archive.archive_dir, list(latest.values()))) == [b'new']
+    assert set(latest_records(archive.archive_dir)) == {'https://x/person/1', 'https://x/search'}
+
+
+def test_torn_index_tail_is_skipped(archive):
+    archive.put('https://x/person/1', 'page', fetched_at=1)
+    archive.close()
+    with open(os.path.join(archive.archive_dir, INDEX_FILE), 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://x/pe')
+
+    reopened = PageArchive(archive.archive_dir, codec=archive.codec)
+    try:
+        reopened.put('https://x/person/2', 'other', fetched_at=2)
+        reopened.flush()
+    finally:
+        reopened.close()
+    assert [record.url for record in iter_index(archive.archive_dir)] == ['https://x/person/1', 'https://x/person/2']
+
+
+def test_put_after_close_raises(archive):
+    archive.close()
+    with pytest.raises(ValueError):
+        archive.put('https://x/person/1', 'page')
@@ -0,0 +1,76 @@
+"""
+parse_date and dates_match on the date formats found in the input
+and in search results.
+"""
+import pytest
+
+from parsed_date import TWO_DIGIT_PIVOT, dates_match, parse_date
+
+# text -> (year, month, day, approximate) or None
+PARSE_TABLE = [
+    ('25 Oct 1949', (1949, 10, 25, False)),
+    ('3 Feb 2021', (2021, 2, 3, False)),
+    ('Oct 1949', (1949, 10, 0, False)),
+    ('abt 1946', (1946, 0, 0, True)),
+    ('Abt 1946', (1946, 0, 0, True)),
+    ('circa 1950', (1950, 0, 0, True)),
+    ('1946', (1946, 0, 0, False)),
+    ('10/25/1949', (1949, 10, 25, False)),
+    ('25/10/1949', (1949, 10, 25, False)),
+    ('03/04/1950', (1950, 3, 4, False)),
+    ('3/1946', (1946, 3, 0, False)),
+    ('1949-10-25', (1949, 10, 25, False)),
+    ('1/2/46', (1946, 1, 2, False)),
+    ('10/3/00', (2000, 10, 3, False)),
+    ('1/2/946', None),
+    ('Jan 1946 (Age 78)', (1946, 1, 0, False)),
+    ('9 Feb', None),
+    ('', None),
+    ('unknown', None),
+]
+
+# (date1, date2, match)
+MATCH_TABLE = [
+    ('25 Oct 1949', '25 Oct 1949', True),
+    ('25 Oct 1949', '1949', True),
+    ('25 Oct 1949', '10/25/1949', True),
+    ('25 Oct 1949', 'Mar 1949', True),
+    ('25 Oct 1949', '1950', False),
+    ('abt 1946', '1946', True),
+    ('abt 1946', '1947', True),
+    ('abt 1946', '1945', True),
+    ('abt 1946', '1948', False),
+    ('abt 1946', 'abt 1948', True),
+    ('abt 1946', 'abt 1949', False),
+    ('1/2/1946', '3/4/1946', True),
+    ('1/2/1946', '1/2/1947', False),
+    ('1/2/46', '2 Jan 1946', True),
+    ('1/2/46', '1/2/2046', False),
+    ('9 Feb', '9 Feb', True),
+    ('9 Feb', '9 Feb 1950', False),
+    ('', '1946', False),
+    ('1946', '', False),
+    ('', '', False),
+]
+
+
+@pytest.mark.parametrize('text, expected', PARSE_TABLE)
+def test_parse_date(text, expected):
+    parsed = parse_date(text)
+    assert (parsed[:4] if parsed else None) == expected
+
+
+@pytest.mark.parametrize('date1, date2, expected', MATCH_TABLE)
+def test_dates_match(date1, date2, expected):
+    assert dates_match(date1, date2) == expected
+
+
+def test_two_digit_year_pivot():
+    # Up to the pivot is this century, anything later the previous one
+    assert parse_date(f'1/2/{TWO_DIGIT_PIVOT:02d}').year == 2000 + TWO_DIGIT_PIVOT
+    assert parse_date(f'1/2/{TWO_DIGIT_PIVOT + 1:02d}').year == 1901 + TWO_DIGIT_PIVOT
+
+
+def test_approximate_range():
+    parsed = parse_date('abt 1946')
+    assert (parsed.lo, parsed.hi) == (1945, 1947)
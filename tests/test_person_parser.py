@@ -0,0 +1,24 @@
+"""
+Every installed person_parser backend must extract the same details as the
+full html.parser tree from the recorded ClustrMaps person pages.
+"""
+import pytest
+
+import person_parser
+from harness import read_fixture
+
+PAGES = [f'clustrmaps_person_{i}.html' for i in (1, 2, 3)]
+
+
+@pytest.mark.parametrize('backend', person_parser.available_backends())
+@pytest.mark.parametrize('page', PAGES)
+def test_backend_matches_html_parser(backend, page):
+    html = read_fixture(page)
+    assert person_parser.parse_person_page(html, backend) == person_parser.parse_person_page(html, 'html.parser')
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_reference_extracts_details(page):
+    # Agreement alone would also pass if every backend came back empty
+    details = person_parser.parse_person_page(read_fixture(page), 'html.parser')
+    assert details['full_name'] and details['phone_number'] and details['associated_persons']
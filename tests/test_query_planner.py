@@ -0,0 +1,80 @@
+"""
+Query ranking and per-round coalescing of the ClustrMaps searches.
+"""
+from query_planner import (PendingRecord, PlannerStats, build_query, candidate_queries, coalesce_queries,
+                           query_key)
+
+
+def pending(index, name, relatives=(), birth_date=''):
+    person = {'Name': name, 'Relatives': list(relatives), 'Birth Date': birth_date}
+    return PendingRecord(index, f'id{index}', person)
+
+
+def test_relatives_first_then_own_name():
+    person = {'Name': 'Edward John Pollace', 'Relatives': ['John', 'Eleanor Marie', 'K.', 'john']}
+    assert candidate_queries(person) == [('john', 'pollace'), ('eleanor', 'pollace'), ('edward', 'pollace')]
+    assert candidate_queries(person, max_queries=1) == [('john', 'pollace')]
+    assert build_query(person) == ('john', 'pollace')
+
+
+def test_suffix_is_not_the_last_name():
+    assert candidate_queries({'Name': 'Robert Smith Jr.'}) == [('robert', 'smith')]
+    assert candidate_queries({'Name': 'Jr'}) == [('jr', 'jr')]
+
+
+def test_no_name_no_queries():
+    assert candidate_queries({'Name': '', 'Relatives': ['Mary']}) == []
+    assert build_query({'Name': None}) is None
+
+
+def test_query_key_is_normalized():
+    assert query_key('José', 'Treviño') == query_key(' jose', 'TREVINO ')
+
+
+def test_duplicate_queries_run_once():
+    batch = [
+        pending(0, 'John Smith', birth_date='1946'),
+        pending(1, 'JOHN  SMITH', birth_date='abt 1946'),
+        pending(2, 'Mary Jones'),
+    ]
+    planned, unplannable = coalesce_queries(batch)
+    assert [(query.first_name, query.last_name) for query in planned] == [('john', 'smith'), ('mary', 'jones')]
+    assert [record.index for record in planned[0].records] == [0, 1]
+    assert planned[0].birth_year == 1946
+    assert planned[1].birth_year == 0
+    assert unplannable == []
+
+
+def test_birth_year_dropped_when_records_disagree():
+    planned, _ = coalesce_queries([pending(0, 'John Smith', birth_date='1946'),
+                                   pending(1, 'John Smith', birth_date='1950')])
+    assert planned[0].birth_year == 0
+
+
+def test_birth_year_only_for_own_name():
+    planned, _ = coalesce_queries([pending(0, 'John Smith', ['Mary'], birth_date='1946')])
+    assert (planned[0].first_name, planned[0].birth_year) == ('mary', 0)
+
+
+def test_rounds_move_to_the_next_query():
+    batch = [pending(0, 'John Smith', ['Mary', 'Linda']), pending(1, 'Ann Smith')]
+    rounds = [coalesce_queries(batch, round_number) for round_number in range(4)]
+    assert [[query.first_name for query in planned] for planned, _ in rounds] == \
+        [['mary', 'ann'], ['linda'], ['john'], []]
+    assert [[record.index for record in unplannable] for _, unplannable in rounds] == [[], [1], [1], [0, 1]]
+
+    planned, unplannable = coalesce_queries(batch, 1, max_queries=1)
+    assert planned == [] and len(unplannable) == 2
+
+
+def test_precomputed_columns_are_used():
+    record = PendingRecord(0, 'id0', {'Name': 'ignored'}, ('john', 'smith'), 1946)
+    planned, _ = coalesce_queries([record])
+    assert (planned[0].first_name, planned[0].last_name, planned[0].birth_year) == ('john', 'smith', 1946)
+
+
+def test_stats_report():
+    stats = PlannerStats()
+    assert 'n/a' in stats.report()
+    stats.lookups, stats.matched, stats.unmatched = 5, 2, 1
+    assert stats.report() == 'Lookups: 5 for 2 matched and 1 unmatched obituaries (2.50 lookups per match)'
@@ -0,0 +1,75 @@
+"""
+ResultStore's append log: reload, torn-tail recovery and compaction.
+"""
+import json
+
+from result_store import ResultStore, open_log_for_append
+
+
+def make_store(tmp_path, **kwargs):
+    return ResultStore(str(tmp_path / 'processed_obituaries.json'), **kwargs)
+
+
+def test_log_file_next_to_snapshot(tmp_path):
+    store = make_store(tmp_path)
+    assert store.log_file == str(tmp_path / 'processed_obituaries.jsonl')
+
+
+def test_reload_from_log(tmp_path):
+    store = make_store(tmp_path)
+    store.put('John Smith', {'age': '70'}, deceased_id='a1')
+    store.put('Mary Jones', None)
+    store.put('John Smith', {'age': '71'}, deceased_id='a1')
+    store._log.close()
+
+    reloaded = make_store(tmp_path)
+    assert reloaded.load() == {'John Smith': {'age': '71'}, 'Mary Jones': None}
+    assert reloaded.stored_ids() == ({'a1'}, {'Mary Jones'})
+
+
+def test_torn_tail_is_skipped_and_not_glued(tmp_path):
+    store = make_store(tmp_path)
+    store.put('John Smith', {'age': '70'})
+    store._log.close()
+    with open(store.log_file, 'a', encoding='utf-8') as f:
+        f.write('{"key": "Mary Jo')
+
+    reopened = make_store(tmp_path)
+    assert reopened.load() == {'John Smith': {'age': '70'}}
+    reopened.put('Linda Roberts', {'age': '60'})
+    reopened._log.close()
+
+    assert make_store(tmp_path).load() == {'John Smith': {'age': '70'}, 'Linda Roberts': {'age': '60'}}
+
+
+def test_compaction_folds_log_into_snapshot(tmp_path):
+    store = make_store(tmp_path, compact_every=3)
+    for i in range(4):
+        store.put(f'Person {i}', i)
+
+    with open(store.output_file, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {'Person 0': 0, 'Person 1': 1, 'Person 2': 2}
+    with open(store.log_file, 'r', encoding='utf-8') as f:
+        assert [json.loads(line)['key'] for line in f] == ['Person 3']
+
+    store.close()
+    with open(store.output_file, 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == 4
+    assert make_store(tmp_path).load() == {f'Person {i}': i for i in range(4)}
+
+
+def test_put_never_compacts_a_partial_view(tmp_path):
+    store = make_store(tmp_path)
+    store.write_all({'John Smith': 1})
+
+    store = make_store(tmp_path, compact_every=1)
+    store.put('Mary Jones', 2)
+    assert make_store(tmp_path).load() == {'John Smith': 1, 'Mary Jones': 2}
+
+
+def test_open_log_for_append_terminates_torn_line(tmp_path):
+    path = tmp_path / 'log.jsonl'
+    path.write_bytes(b'{"a": 1}\n{"b"')
+    with open_log_for_append(str(path)) as f:
+        f.write('{"c": 3}\n')
+    assert path.read_bytes() == b'{"a": 1}\n{"b"\n{"c": 3}\n'
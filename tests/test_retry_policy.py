@@ -0,0 +1,145 @@
+"""
+RetryPolicy and CircuitBreaker with a fake clock and no real sleeping.
+"""
+import random
+
+import pytest
+import requests
+
+from retry_policy import CircuitBreaker, HostUnavailable, RetryPolicy, parse_retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {'Retry-After': retry_after} if retry_after is not None else {}
+
+
+def replies(*outcomes):
+    """
+    A send() returning (or raising) the given outcomes in turn.
+    """
+    outcomes = list(outcomes)
+    calls = []
+
+    def send():
+        calls.append(1)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    send.calls = calls
+    return send
+
+
+def make_policy(clock, **kwargs):
+    breaker = CircuitBreaker(failure_threshold=kwargs.pop('failure_threshold', 5), reset_timeout=30,
+                             max_timeout=100, clock=clock)
+    return RetryPolicy(breaker=breaker, rng=random.Random(1), sleep=clock.sleep, **kwargs)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('120', 120.0),
+    (' 5 ', 5.0),
+    ('Thu, 01 Jan 1970 00:01:40 GMT', 40.0),
+    ('Thu, 01 Jan 1970 00:00:00 GMT', 0.0),
+    ('soon', None),
+    ('', None),
+    (None, None),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value, now=60.0) == expected
+
+
+def test_retries_temporary_failures_until_success():
+    clock = FakeClock()
+    policy = make_policy(clock)
+    send = replies(requests.ConnectionError(), FakeResponse(503), FakeResponse(200))
+    assert policy.call('x', send).status_code == 200
+    assert len(send.calls) == 3 and policy.retries == 2
+    assert policy.breaker.state('x') == 'closed'
+
+
+def test_other_statuses_are_not_retried():
+    policy = make_policy(FakeClock())
+    send = replies(FakeResponse(404))
+    assert policy.call('x', send).status_code == 404
+    assert len(send.calls) == 1
+
+
+def test_gives_up_after_max_attempts():
+    policy = make_policy(FakeClock(), max_attempts=3)
+    assert policy.call('x', replies(*[FakeResponse(500)] * 3)).status_code == 500
+    with pytest.raises(requests.Timeout):
+        policy.call('y', replies(*[requests.Timeout()] * 3))
+
+
+def test_retry_after_sets_the_wait():
+    clock = FakeClock()
+    policy = make_policy(clock)
+    policy.call('x', replies(FakeResponse(429, retry_after='7'), FakeResponse(200)))
+    assert clock.now == 7
+
+
+def test_backoff_is_capped_and_jittered():
+    policy = make_policy(FakeClock(), base_delay=1, max_delay=4)
+    waits = [policy.backoff(attempt) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= wait <= 4 for wait in waits)
+    assert len(set(waits)) > 1
+
+
+def test_long_retry_after_trips_the_circuit():
+    clock = FakeClock()
+    policy = make_policy(clock, max_retry_after=60)
+    with pytest.raises(HostUnavailable) as error:
+        policy.call('x', replies(FakeResponse(429, retry_after='300')))
+    assert error.value.retry_in == 300
+    assert clock.now == 0
+
+    send = replies(FakeResponse(200))
+    with pytest.raises(HostUnavailable):
+        policy.call('x', send)
+    assert not send.calls
+    assert policy.call('y', replies(FakeResponse(200))).status_code == 200
+
+
+def test_breaker_opens_half_opens_and_doubles():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, max_timeout=100, clock=clock)
+    breaker.record_failure('x')
+    assert breaker.state('x') == 'closed'
+    breaker.record_failure('x')
+    assert breaker.state('x') == 'open' and breaker.retry_in('x') == 30
+
+    clock.now = 30
+    assert breaker.state('x') == 'half-open'
+    # A failed trial reopens the circuit for twice as long, up to max_timeout
+    breaker.record_failure('x')
+    assert breaker.retry_in('x') == 60
+    clock.now = 90
+    breaker.record_failure('x')
+    assert breaker.retry_in('x') == 100
+
+    clock.now = 190
+    breaker.record_success('x')
+    assert breaker.state('x') == 'closed' and breaker.retry_in('x') == 0
+
+
+def test_open_circuit_parks_work_instead_of_sleeping():
+    clock = FakeClock()
+    policy = make_policy(clock, failure_threshold=2, max_attempts=5)
+    send = replies(FakeResponse(503), FakeResponse(503), FakeResponse(200))
+    with pytest.raises(HostUnavailable):
+        policy.call('x', send)
+    assert len(send.calls) == 2
@@ -0,0 +1,57 @@
+"""
+Calibration of the similarity backends against difflib.
+
+Every backend must reproduce difflib's decision on hand-picked pairs around
+the 0.8 compare_names threshold (0.8 itself does not match) and agree with
+difflib on at least 99.9% of a generated corpus of misspelled names.
+"""
+import pytest
+
+import similarity
+from name_corpus import name_pairs
+
+THRESHOLD = 0.8
+MIN_AGREEMENT = 0.999
+
+# (name1, name2, difflib ratio rounded to 4 places)
+CALIBRATION = [
+    ('john smith', 'jon smith', 0.9474),
+    ('john smith', 'john smyth', 0.9),
+    ('mary jones', 'marie jones', 0.8571),
+    ('carl dovalina', 'karl dovalina', 0.9231),
+    ('linda roberts', 'lynda robertson', 0.8571),
+    ('robert pollace', 'roberto polace', 0.9286),
+    ('susan williams', 'suzanne williamson', 0.8125),
+    ('edith gariepy', 'edith garipey', 0.9231),
+    ('anita iglesias', 'annette iglesias', 0.8),
+    ('patricia smith', 'patrick smith', 0.8889),
+    ('john smith', 'jane smith', 0.8),
+    ('jo li', 'jo le', 0.8),
+    ('mary smith', 'mary smith jr', 0.8696),
+    ('al roberts', 'albert roberts', 0.8333),
+    ('jose trevino', 'jose trevino', 1.0),
+    ('john smith', '', 0.0),
+    ('', '', 1.0),
+]
+
+
+@pytest.fixture(scope='module')
+def corpus():
+    return name_pairs(50000, seed=14)
+
+
+@pytest.mark.parametrize('backend', similarity.available_backends())
+@pytest.mark.parametrize('name1, name2, expected', CALIBRATION)
+def test_calibration_pairs(backend, name1, name2, expected):
+    assert round(similarity.ratio(name1, name2, backend), 4) == expected
+    assert similarity.is_similar(name1, name2, THRESHOLD, backend) == (expected > THRESHOLD)
+
+
+@pytest.mark.parametrize('backend', similarity.available_backends())
+def test_agreement_with_difflib(backend, corpus):
+    agreeing = sum(
+        similarity.is_similar(name1, name2, THRESHOLD, backend) ==
+        (similarity.difflib_ratio(name1, name2) > THRESHOLD)
+        for name1, name2 in corpus
+    )
+    assert agreeing / len(corpus) >= MIN_AGREEMENT, f"{backend} agrees on only {agreeing}/{len(corpus)} pairs"
@@ -2,81 +2,37 @@ import requests
 import re
 import json
 import cloudscraper
+from http_client import get_client
+from page_archive import get_archive, close_archives
 from twocaptcha import TwoCaptcha
 from urllib.parse import quote
 from bs4 import BeautifulSoup
-import difflib
-
-def normalize_name(name):
-    """
-    Normalize name for comparison by removing extra whitespaces, 
-    converting to lowercase, and handling middle initials.
-    """
-    # Remove extra whitespaces and convert to lowercase
-    name = ' '.join(name.split()).lower()
-    
-    # Remove middle initial if present
-    name_parts = name.split()
-    if len(name_parts) > 2:
-        # Keep first and last name, remove middle initial
-        name = f"{name_parts[0]} {name_parts[-1]}"
-    
-    return name
+import similarity
+from name_normalization import normalize_name
+from parsed_date import dates_match
 
 def compare_names(name1, name2):
     """
-    Advanced name comparison using difflib for similarity
+    Advanced name comparison using the similarity backend (bit-parallel LCS
+    by default, difflib as the reference)
     """
     # Normalize names first
     norm_name1 = normalize_name(name1)
     norm_name2 = normalize_name(name2)
     
-    # Use SequenceMatcher to get a similarity ratio
-    similarity = difflib.SequenceMatcher(None, norm_name1, norm_name2).ratio()
-    
     # If names are very similar (above 0.8 threshold)
-    return similarity > 0.8
+    return similarity.is_similar(norm_name1, norm_name2, 0.8)
 
 def compare_birthdates(date1, date2):
     """
     Compare birthdates with some flexibility
     
-    :param date1: First date in format MM/DD/YYYY or DD/MM/YYYY or YYYY
+    :param date1: First date, e.g. "25 Oct 1949", "abt 1946", "10/25/1949" or "1949"
     :param date2: Second date for comparison
-    :return: Boolean indicating if dates match
+    :return: Boolean indicating if the dates can fall in the same year
     """
-    if not date1 or not date2:
-        return False
-    
-    # Remove any leading zeros and split
-    def clean_date(date_str):
-        # Split by / and remove leading zeros
-        parts = [part.lstrip('0') for part in date_str.split('/')]
-        return parts
-    
-    try:
-        # First try exact match
-        if date1 == date2:
-            return True
-        
-        # If dates have different formats
-        clean1 = clean_date(date1)
-        clean2 = clean_date(date2)
-        
-        # Check if years match
-        if clean1[-1] == clean2[-1]:
-            return True
-        
-        # Check partial matches (for cases with incomplete info)
-        if len(clean1) > 1 and len(clean2) > 1:
-            # Check if month and year match
-            if clean1[-1] == clean2[-1] and clean1[0] == clean2[0]:
-                return True
-        
-        return False
-    
-    except Exception:
-        return False
+    # Dates are parsed once into cached year ranges, approximate dates widened
+    return dates_match(date1, date2)
 
 def compare_relatives(relatives1, relatives2):
     """
@@ -201,8 +157,8 @@ def search_family_tree(deceased_info):
     :param deceased_info: Dictionary containing deceased person details
     :return: Detailed page HTML or None
     """
-    # Use cloudscraper to handle Cloudflare protection
-    scraper = cloudscraper.create_scraper()
+    # Use cloudscraper to handle Cloudflare protection, through the shared pooled client
+    scraper = get_client('cloudscraper', session_factory=cloudscraper.create_scraper)
     
     # Captcha parameters
     captcha_url = 'https://www.familytreenow.com/internalcaptcha/captchasubmit'
@@ -246,9 +202,10 @@ def search_family_tree(deceased_info):
         if response.status_code == 200:
             print("Successfully accessed the search results URL!")
             
-            # Save search results
-            with open('search_results.html', 'w', encoding='utf-8') as f:
-                f.write(response.text)
+            # Archive search results (written in the background)
+            archive = get_archive()
+            archive.put(search_url, response.text, response.status_code, kind='search',
+                        deceased_name=deceased_info.get('deceased_name'))
             
             # Find matching person's detail link
             matching_detail_link = find_matching_person(deceased_info, response.text)
@@ -262,9 +219,9 @@ def search_family_tree(deceased_info):
                 details_response = scraper.get(full_url, headers=headers)
                 
                 if details_response.status_code == 200:
-                    # Save user details
-                    with open('users_details.html', 'w', encoding='utf-8') as f:
-                        f.write(details_response.text)
+                    # Archive user details
+                    archive.put(full_url, details_response.text, details_response.status_code,
+                                kind='details', deceased_name=deceased_info.get('deceased_name'))
                     
                     return details_response.text
                 else:
@@ -294,6 +251,8 @@ def main():
         print(f"Searching for: {person['deceased_name']}")
         search_family_tree(person)
         break  # Process only the first person in this example
+    
+    close_archives()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file